@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import date, datetime, timedelta
 import calendar
 import os
+import time
+import uuid
 from pathlib import Path
+from urllib.parse import quote
 
 import pandas as pd
 import streamlit as st
@@ -16,6 +21,7 @@ from epias_client import (
     fetch_gfm_trade_volume,
     fetch_gfm_transaction_history,
     fetch_natural_gas_market_participants,
+    fetch_period_range,
     fetch_sgp_additional_notifications,
     fetch_sgp_bast,
     EpiasClientError,
@@ -53,7 +59,30 @@ from epias_client import (
     fetch_transmission_transfer,
     fetch_sgp_virtual_realization,
     fetch_sgp_weekly_ref_price,
+    request_scope,
 )
+from archive_export import DEFAULT_EXPORT_DIR, start_export_server, write_archive
+from correlation import DEFAULT_MAX_LAG, CorrelationCache
+from epias_cache import (
+    attach_stale_reads,
+    carry_context,
+    make_cache_key,
+    replay_stale_reads,
+    track_stale_reads,
+)
+from epias_metrics import APP_FETCH_DURATION, APP_RENDER_DURATION, APP_ROWS, registry, start_metrics_server
+from epias_scheduler import BACKFILL, request_priority
+from fetch_jobs import DEFAULT_CHUNK_DAYS, JOB_CANCELLED, JOB_DONE, FetchJob, JobRunner, date_chunks
+from forward_curve import build_forward_curve, load_forward_curves, save_forward_curve
+from local_store import LocalStore
+from participants import ParticipantDirectory, is_bool_like, normalize_bool_like
+from profiling import PROFILE_MODES, ProfileReport, ProfileSession, profile_mode_from_env
+from render_prep import chart_frame, csv_bytes, detect_axes, display_frame, is_numeric_column
+from rolling_analytics import DEFAULT_WINDOW, RollingAnalyticsCache
+from rollups import ROLLUP_FREQUENCIES, RollupStore
+from sql_workspace import DEFAULT_ROW_LIMIT, SqlQueryError, SqlWorkspace
+from tracing import tracer
+from transaction_analytics import TransactionBarCache
 
 
 st.set_page_config(page_title="EXIST Natural Gas Data", layout="wide")
@@ -63,8 +92,22 @@ st.caption("Natural Gas Market and Natural Gas Transmission datasets from EXIST
 if "tgt" not in st.session_state:
     st.session_state["tgt"] = os.getenv("EPIAS_TGT", "")
 
+# A rerun interrupted by a widget change never reaches the end of the script; drop its profiler.
+_stale_profile = st.session_state.pop("_rerun_profile", None)
+if _stale_profile is not None and _stale_profile.active:
+    _stale_profile.stop()
+# Same for an interrupted rerun's root span; its trace is never written.
+st.session_state.pop("_rerun_span", None)
+st.session_state["_rerun_span"] = tracer.begin("rerun", root=True)
+profile_mode = st.session_state.get("profile_mode", profile_mode_from_env())
+if profile_mode == "rerun":
+    st.session_state["_rerun_profile"] = ProfileSession("Script rerun").start()
+
 with st.sidebar:
     st.header("Connection")
+    transport_mode = os.getenv("EPIAS_TRANSPORT", "http").strip().lower()
+    if transport_mode != "http":
+        st.caption(f"Transport: `{transport_mode}` ({os.getenv('EPIAS_CASSETTE_DIR', 'cassettes')})")
     base_url = st.text_input(
         "Base URL",
         value=os.getenv("EPIAS_BASE_URL", "https://seffaflik.epias.com.tr/natural-gas-service"),
@@ -108,7 +151,18 @@ with st.sidebar:
         help="Automatically filled if you click Get TGT.",
     )
 
-market_tab, transmission_tab = st.tabs(["Natural Gas Market", "Natural Gas Transmission"])
+    if profile_mode != "off" or st.query_params.get("profile"):
+        st.selectbox(
+            "Profiling",
+            PROFILE_MODES,
+            index=PROFILE_MODES.index(profile_mode),
+            key="profile_mode",
+            help="Profile the whole script rerun or only the EPIAS fetch of each panel.",
+        )
+
+market_tab, transmission_tab, summary_tab, analysis_tab, sql_tab = st.tabs(
+    ["Natural Gas Market", "Natural Gas Transmission", "Summary", "Analysis", "SQL"]
+)
 CONCEPTS_DIR = Path("Gas Trade Concepts")
 ABOUT_SPOT_GAS_MARKET_PATH = CONCEPTS_DIR / "spot_gas_market.md"
 SPOT_GAS_PRICE_PATH = CONCEPTS_DIR / "spot_gas_price.md"
@@ -132,20 +186,160 @@ STOCK_FALLBACK_PATH = Path("stock.md")
 STORAGE_PATH = CONCEPTS_DIR / "storage.md"
 LOGO_PATH = Path("logo_copy.png")
 LOGO_FALLBACK_PATH = Path("logo copy.png")
-PERIOD_DATASETS = {"Virtual Realization", "System Balance", "Retroactive Adjustment Item Amount"}
+PERIOD_FETCHERS = {
+    "Virtual Realization": fetch_sgp_virtual_realization,
+    "System Balance": fetch_sgp_system_direction,
+    "SGP Imbalance Amount": fetch_sgp_imbalance_amount,
+    "Shipper's Imbalance Quantity": fetch_sgp_shippers_imbalance_quantity,
+    "Neutralization Item": fetch_sgp_bast,
+    "Retroactive Adjustment Item Amount": fetch_sgp_gddk_amount,
+}
+PERIOD_DATASETS = set(PERIOD_FETCHERS)
+PERIOD_CACHE_TTL_SECONDS = 15 * 60
 NO_DATE_DATASETS = {"Natural Gas Market Participants"}
+COMPACT_FRAMES = os.getenv("EPIAS_COMPACT_FRAMES", "").lower() in {"1", "true", "yes"}
+DOWNCAST_NUMERIC = os.getenv("EPIAS_DOWNCAST_NUMERIC", "").lower() in {"1", "true", "yes"}
+PROCESS_POOL = os.getenv("EPIAS_PROCESS_POOL", "").lower() in {"1", "true", "yes"}
+EXPORT_PORT = int(os.getenv("EPIAS_EXPORT_PORT") or 0)
+EXPORT_HOST = os.getenv("EPIAS_EXPORT_HOST", "127.0.0.1")
+EXPORT_URL = os.getenv("EPIAS_EXPORT_URL") or f"http://{EXPORT_HOST}:{EXPORT_PORT}"
+TRANSACTION_HISTORY_DATASETS = {"SGP Transaction History", "GFM Transaction History Natural Gas"}
+ROLLING_VOLATILITY_DATASETS = {"SGP Daily Reference Price"}
+ROLLING_ZSCORE_DATASETS = {"SGP Match Quantity", "SGP Daily Matched Quantity"}
+SPREAD_COUNTERPARTS = {"SGP Price": "SGP Balancing Gas Price", "SGP Balancing Gas Price": "SGP Price"}
+ROLLING_DATASETS = ROLLING_VOLATILITY_DATASETS | ROLLING_ZSCORE_DATASETS | set(SPREAD_COUNTERPARTS)
+CORRELATION_DATASETS = (
+    "SGP Daily Reference Price",
+    "SGP Price",
+    "SGP Balancing Gas Price",
+    "SGP Total Trade Volume",
+    "SGP Daily Trade Volume",
+    "SGP Match Quantity",
+    "SGP Daily Matched Quantity",
+    "Matched Quantity for DRP",
+    "GRP Trade Volume",
+    "Physical Realization",
+    "Imbalance System",
+    "GFM Daily Index Price",
+    "GFM Trade Volume Natural Gas",
+    "GFM Open Position (1000.Sm³/day)",
+    "Entry Nomination",
+    "Exit Nomination",
+    "Transfer",
+    "Day Ahead (UDN)",
+    "Day End (UDN)",
+    "Max Entry Amount",
+    "Max Exit Amount",
+    "Entry Amount",
+    "Exit Amount",
+    "Actualization Entry Amount",
+    "Actualization Exit Amount",
+    "Stock Amount",
+    "Daily Actualization Amount",
+)
+FETCH_MAX_WORKERS = 6
+EXPORT_DATASETS = CORRELATION_DATASETS + tuple(PERIOD_FETCHERS) + (
+    "1 Coded Transaction",
+    "Announcement for TSO Transactions",
+    "SGP Transaction History",
+    "GFM Transaction History Natural Gas",
+    "GFM Contract Price Summary",
+    "GFM Order Prices",
+)
+SUMMARY_DATASETS = (
+    "SGP Daily Reference Price",
+    "SGP Total Trade Volume",
+    "Imbalance System",
+    "Entry Amount",
+    "Exit Amount",
+)
+SUMMARY_AGGREGATES = ("sum", "mean", "min", "max")
+# How long past the cache TTL a dataset may be shown from cache while EPIAS is slow or down.
+# Intraday trade data goes stale quickly; settled and reference data barely changes once published.
+DEFAULT_STALENESS_BUDGET_SECONDS = float(os.getenv("EPIAS_STALENESS_BUDGET_SECONDS", "3600"))
+STALENESS_BUDGETS = {
+    "SGP Transaction History": 15 * 60,
+    "GFM Transaction History Natural Gas": 15 * 60,
+    "GFM Order Prices": 15 * 60,
+    "GFM Contract Price Summary": 15 * 60,
+    "GFM Forward Curve": 15 * 60,
+    "SGP Daily Reference Price": 6 * 3600,
+    "SGP Weekly Ref Price": 24 * 3600,
+    "Natural Gas Market Participants": 7 * 24 * 3600,
+    **{dataset: 24 * 3600 for dataset in PERIOD_FETCHERS},
+}
+FOREGROUND_DATASETS = PERIOD_DATASETS | NO_DATE_DATASETS | {"GFM Forward Curve"}
+
+
+@st.cache_resource
+def _local_store() -> LocalStore:
+    return LocalStore()
+
+
+def _fetch_forward_curve(config: EpiasConfig, start_date: date, end_date: date):
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        summary_future = executor.submit(
+            carry_context(fetch_gfm_contract_price_summary), config=config, start_date=start_date, end_date=end_date
+        )
+        orders_future = executor.submit(
+            carry_context(fetch_gfm_order_prices), config=config, start_date=start_date, end_date=end_date
+        )
+        summary, orders = summary_future.result(), orders_future.result()
+    curve = build_forward_curve(summary, orders, fallback_date=end_date)
+    save_forward_curve(_local_store(), curve)
+    return curve
 
 
-def _detect_axes(dataframe):
-    x_col = "gasDay" if "gasDay" in dataframe.columns else ("date" if "date" in dataframe.columns else None)
-    numeric_candidates = [
-        col
-        for col in dataframe.columns
-        if str(dataframe[col].dtype) in {"float64", "int64", "Float64", "Int64"}
-    ]
-    y_col = numeric_candidates[0] if numeric_candidates else None
-    y_title = y_col or "Value"
-    return x_col, y_col, y_title
+@st.cache_resource
+def _participant_directory() -> ParticipantDirectory:
+    return ParticipantDirectory()
+
+
+@st.cache_data(ttl=PERIOD_CACHE_TTL_SECONDS, show_spinner=False)
+def _fetch_period_month(
+    config: EpiasConfig,
+    dataset: str,
+    start_date: date,
+    end_date: date,
+    period: str | None = None,
+    timeout_seconds: int = 30,
+):
+    # Cached per month so overlapping period ranges only request the months not seen yet.
+    with track_stale_reads() as reads:
+        frame = PERIOD_FETCHERS[dataset](
+            config=config,
+            start_date=start_date,
+            end_date=end_date,
+            period=period,
+            timeout_seconds=timeout_seconds,
+        )
+    # The stale label survives in the cached copy; replaying it re-reports the age on every rerun.
+    return attach_stale_reads(frame, reads)
+
+
+def _fetch_period_month_labelled(dataset: str, **kwargs):
+    frame = _fetch_period_month(dataset=dataset, **kwargs)
+    if frame.attrs.get("epias_stale_reads"):
+        # Stale months are dropped from the page cache so the next rerun picks up the refreshed response.
+        _fetch_period_month.clear(dataset=dataset, **kwargs)
+    return replay_stale_reads(frame)
+
+
+def _staleness_budget(dataset: str) -> float:
+    if DEFAULT_STALENESS_BUDGET_SECONDS <= 0:
+        return 0.0
+    return float(STALENESS_BUDGETS.get(dataset, DEFAULT_STALENESS_BUDGET_SECONDS))
+
+
+def _format_age(seconds: float) -> str:
+    minutes = int(seconds // 60)
+    if minutes < 1:
+        return "under 1 min"
+    if minutes < 60:
+        return f"{minutes} min"
+    if minutes < 48 * 60:
+        return f"{minutes // 60} h {minutes % 60} min"
+    return f"{minutes // (24 * 60)} days"
 
 
 def _fetch_dataset(
@@ -155,6 +349,22 @@ def _fetch_dataset(
     end_date: date,
     period: str | None = None,
 ):
+    config = replace(config, max_stale_seconds=_staleness_budget(dataset))
+    if dataset in PERIOD_DATASETS:
+        # Uncached reads skip the per-month page cache as well.
+        month_fetcher = (
+            (lambda **kwargs: _fetch_period_month_labelled(dataset, **kwargs))
+            if config.use_cache
+            else PERIOD_FETCHERS[dataset]
+        )
+        data = fetch_period_range(
+            month_fetcher,
+            config=config,
+            start_period=start_date,
+            end_period=end_date,
+        )
+        x_col, y_col, y_title = detect_axes(data)
+        return data, x_col, y_col, y_title
     if dataset == "SGP Total Trade Volume":
         data = fetch_sgp_total_trade_volume(config=config, start_date=start_date, end_date=end_date)
         return data, "gasDay", "tradeVolume", "Trade Volume (TL)"
@@ -180,35 +390,8 @@ def _fetch_dataset(
         data = fetch_sgp_additional_notifications(config=config, start_date=start_date, end_date=end_date)
     elif dataset == "Physical Realization":
         data = fetch_sgp_physical_realization(config=config, start_date=start_date, end_date=end_date)
-    elif dataset == "Virtual Realization":
-        data = fetch_sgp_virtual_realization(
-            config=config,
-            start_date=start_date,
-            end_date=end_date,
-            period=period,
-        )
-    elif dataset == "System Balance":
-        data = fetch_sgp_system_direction(
-            config=config,
-            start_date=start_date,
-            end_date=end_date,
-            period=period,
-        )
     elif dataset == "Imbalance System":
         data = fetch_sgp_imbalance_system(config=config, start_date=start_date, end_date=end_date)
-    elif dataset == "SGP Imbalance Amount":
-        data = fetch_sgp_imbalance_amount(config=config, start_date=start_date, end_date=end_date)
-    elif dataset == "Shipper's Imbalance Quantity":
-        data = fetch_sgp_shippers_imbalance_quantity(config=config, start_date=start_date, end_date=end_date)
-    elif dataset == "Neutralization Item":
-        data = fetch_sgp_bast(config=config, start_date=start_date, end_date=end_date)
-    elif dataset == "Retroactive Adjustment Item Amount":
-        data = fetch_sgp_gddk_amount(
-            config=config,
-            start_date=start_date,
-            end_date=end_date,
-            period=period,
-        )
     elif dataset == "SGP Transaction History":
         data = fetch_sgp_transaction_history(config=config, start_date=start_date, end_date=end_date)
     elif dataset == "GFM Daily Index Price":
@@ -223,8 +406,13 @@ def _fetch_dataset(
         data = fetch_gfm_open_position(config=config, start_date=start_date, end_date=end_date)
     elif dataset == "GFM Order Prices":
         data = fetch_gfm_order_prices(config=config, start_date=start_date, end_date=end_date)
+    elif dataset == "GFM Forward Curve":
+        data = _fetch_forward_curve(config=config, start_date=start_date, end_date=end_date)
+        return data, "deliveryMonth", "price", "Forward Price (TL/1000Sm³)"
     elif dataset == "Natural Gas Market Participants":
-        data = fetch_natural_gas_market_participants(config=config)
+        directory = _participant_directory()
+        directory.sync(fetch_natural_gas_market_participants(config=config))
+        data = directory.frame
     elif dataset == "Entry Nomination":
         data = fetch_transmission_entry_nomination(config=config, start_date=start_date, end_date=end_date)
     elif dataset == "Exit Nomination":
@@ -265,7 +453,7 @@ def _fetch_dataset(
         )
     else:
         data = fetch_sgp_weekly_ref_price(config=config, start_date=start_date, end_date=end_date)
-    x_col, y_col, y_title = _detect_axes(data)
+    x_col, y_col, y_title = detect_axes(data)
     return data, x_col, y_col, y_title
 
 
@@ -293,17 +481,23 @@ def _render_query_panel(
         default_index = month_options.index(default_period) if default_period in month_options else 0
         with col1:
             selected_period = st.selectbox(
-                "Period",
+                "Start Period",
                 options=month_options,
                 index=default_index,
                 key=f"{panel_key}_period",
             )
+        with col2:
+            selected_end_period = st.selectbox(
+                "End Period",
+                options=month_options,
+                index=default_index,
+                key=f"{panel_key}_end_period",
+            )
         parsed = datetime.strptime(selected_period, "%B %Y")
         start_date = date(parsed.year, parsed.month, 1)
-        end_day = calendar.monthrange(parsed.year, parsed.month)[1]
-        end_date = date(parsed.year, parsed.month, end_day)
-        with col2:
-            st.text_input("Start Date", value=start_date.isoformat(), disabled=True, key=f"{panel_key}_start_date_readonly")
+        parsed_end = datetime.strptime(selected_end_period, "%B %Y")
+        end_day = calendar.monthrange(parsed_end.year, parsed_end.month)[1]
+        end_date = date(parsed_end.year, parsed_end.month, end_day)
     elif dataset in NO_DATE_DATASETS:
         start_date = date.today()
         end_date = date.today()
@@ -328,31 +522,91 @@ def _render_query_panel(
     if start_date > end_date:
         st.error("Start date cannot be after end date.")
         return
-    if not run_query:
-        st.info("Select date range and click Fetch.")
-        return
-    if not tgt.strip():
+    job_state_key = f"{panel_key}_job"
+    finished_state_key = f"{panel_key}_finished_job"
+    previous_job_key = st.session_state.pop(job_state_key, None) if run_query else None
+    if run_query:
+        st.session_state.pop(finished_state_key, None)
+    if run_query and not tgt.strip():
         st.error("TGT token is required.")
         return
 
-    with st.spinner("Fetching data from EPIAS..."):
-        try:
-            config = EpiasConfig(base_url=base_url, tgt=tgt)
-            data, x_col, y_col, y_title = _fetch_dataset(
-                config=config,
-                dataset=dataset,
-                start_date=start_date,
-                end_date=end_date,
-                period=selected_period,
-            )
-        except EpiasClientError as exc:
-            st.error(str(exc))
+    config = EpiasConfig(
+        base_url=base_url,
+        tgt=tgt,
+        compact=COMPACT_FRAMES,
+        downcast_numeric=DOWNCAST_NUMERIC,
+        process_pool=PROCESS_POOL,
+    )
+    if run_query and _runs_in_background(dataset, start_date, end_date):
+        job = _submit_fetch_job(config, dataset, start_date, end_date, watcher=_job_watcher(panel_key))
+        st.session_state[job_state_key] = job.key
+    if previous_job_key is not None and previous_job_key != st.session_state.get(job_state_key):
+        _job_runner().detach(previous_job_key, _job_watcher(panel_key))
+    # A background job stays attached to the panel across reruns until Fetch is clicked again, but is
+    # only shown while the panel still selects the dataset and range it was started for.
+    job_key = st.session_state.get(job_state_key)
+    job = _job_runner().get(job_key)
+    if job is not None and job.finished:
+        # The panel keeps the finished job, so the runner lets go of its frames once every watcher has them.
+        st.session_state[finished_state_key] = _job_runner().collect(job.key, _job_watcher(panel_key)) or job
+    finished = st.session_state.get(finished_state_key)
+    if job is None and finished is not None and finished.key == job_key:
+        job = finished
+    if job is not None and (job.metadata["dataset"], job.metadata["start_date"], job.metadata["end_date"]) != (
+        dataset,
+        start_date,
+        end_date,
+    ):
+        job = None
+    if job is None and not run_query:
+        st.info("Select date range and click Fetch.")
+        return
+
+    if job is not None:
+        if job.status != JOB_DONE:
+            _render_job_status(panel_key, job)
             return
+        data, x_col, y_col, y_title = job.result
+        st.caption(f"Background fetch: {job.label} ({job.total_chunks} chunks)")
+    else:
+        with st.spinner("Fetching data from EPIAS..."):
+            fetch_started = time.perf_counter()
+            fetch_profile = ProfileSession(f"Fetch {dataset}").start() if profile_mode == "fetch" else None
+            try:
+                with track_stale_reads() as stale_reads, tracer.span("fetch", dataset=dataset) as fetch_span:
+                    data, x_col, y_col, y_title = _fetch_dataset(
+                        config=config,
+                        dataset=dataset,
+                        start_date=start_date,
+                        end_date=end_date,
+                        period=selected_period,
+                    )
+                    fetch_span.set(rows=len(data), stale=bool(stale_reads))
+            except EpiasClientError as exc:
+                st.error(str(exc))
+                return
+            finally:
+                APP_FETCH_DURATION.observe(time.perf_counter() - fetch_started, dataset=dataset)
+                _export_metrics()
+                if fetch_profile is not None:
+                    _render_profile_report(fetch_profile.stop(), key=f"{panel_key}_fetch_profile")
+        _publish_fetch(_sql_workspace(), _rollup_store(), dataset, data)
+        if stale_reads:
+            st.warning(
+                f"Showing cached data fetched {_format_age(time.time() - min(stale_reads))} ago. A fresh copy is "
+                "being requested from EPIAS in the background; Fetch again to update."
+            )
 
     if data.empty:
         st.warning("No data returned for this date range.")
         return
 
+    render_started = time.perf_counter()
+    # begin/end rather than blocks, so the rendering code keeps its indentation.
+    render_span = tracer.begin("render", dataset=dataset, rows=len(data))
+    chart_span = tracer.begin("chart")
+    APP_ROWS.observe(len(data), dataset=dataset)
     st.metric("Rows", f"{len(data):,}")
 
     if dataset == "Daily Actualization Amount":
@@ -378,15 +632,14 @@ def _render_query_panel(
         else:
             st.info("Chart skipped: could not detect both injection/reproduction columns from API response.")
     elif x_col and y_col:
-        chart_data = data.rename(columns={x_col: "Date", y_col: y_title})
-        st.line_chart(chart_data, x="Date", y=y_title, height=350)
+        st.line_chart(chart_frame(data, x_col, y_col, y_title), x="Date", y=y_title, height=350)
     else:
         st.info("Chart skipped: could not detect date/numeric columns from API response.")
+    tracer.end(chart_span)
 
-    display_data = data.copy()
+    display_span = tracer.begin("display prep")
+    display_data = display_frame(data, y_col)
     table_for_display = display_data
-    if y_col:
-        display_data[y_col] = display_data[y_col].map(lambda x: f"{x:,.2f}")
     if dataset == "SGP Match Quantity":
         rename_map = {}
         if "gasDay" in display_data.columns:
@@ -414,7 +667,7 @@ def _render_query_panel(
         numeric_cols = [
             col
             for col in source_columns
-            if col not in rename_map and str(data[col].dtype) in {"float64", "int64", "Float64", "Int64"}
+            if col not in rename_map and is_numeric_column(data[col])
         ]
         target_names = [
             "Day Ahead Matched Quantity (x1000 Sm³)",
@@ -445,7 +698,7 @@ def _render_query_panel(
         numeric_cols = [
             col
             for col in source_columns
-            if col not in rename_map and str(data[col].dtype) in {"float64", "int64", "Float64", "Int64"}
+            if col not in rename_map and is_numeric_column(data[col])
         ]
         target_names = [
             "Day Ahead Transaction Volume (TL)",
@@ -791,6 +1044,19 @@ def _render_query_panel(
             rename_map[position_col] = "Open Position Amount (1000.Sm³/day)"
         if rename_map:
             display_data = display_data.rename(columns=rename_map)
+    elif dataset == "GFM Forward Curve":
+        display_data = display_data.rename(
+            columns={
+                "curveDate": "Curve Date",
+                "deliveryMonth": "Delivery Month",
+                "contract": "Contract",
+                "lastPrice": "Last Matching Price (TL/1000Sm³)",
+                "bestBid": "Best Bid Price (TL/1000Sm³)",
+                "bestOffer": "Best Offer Price (TL/1000Sm³)",
+                "mid": "Mid Price (TL/1000Sm³)",
+                "price": "Forward Price (TL/1000Sm³)",
+            }
+        )
     elif dataset == "GFM Order Prices":
         rename_map = {}
         source_columns = list(data.columns)
@@ -859,30 +1125,10 @@ def _render_query_panel(
                 if col in display_data.columns
             ]
 
-            ref_non_null = reference.dropna()
-            is_bool_like = False
-            if not ref_non_null.empty:
-                normalized = {str(v).strip().lower() for v in ref_non_null.unique()}
-                bool_tokens = {"true", "false", "1", "0", "yes", "no", "evet", "hayir"}
-                is_bool_like = normalized.issubset(bool_tokens)
-
-            if str(reference.dtype) == "bool" or is_bool_like:
-                true_tokens = {"true", "1", "yes", "evet"}
-                false_tokens = {"false", "0", "no", "hayir"}
-
-                def _to_bool_like(value):
-                    if pd.isna(value):
-                        return value
-                    token = str(value).strip().lower()
-                    if token in true_tokens:
-                        return True
-                    if token in false_tokens:
-                        return False
-                    return value
-
+            if is_bool_like(reference):
                 for col in target_cols:
-                    display_data[col] = display_data[col].map(_to_bool_like)
-            elif str(reference.dtype) in {"int64", "float64", "Int64", "Float64"}:
+                    display_data[col] = normalize_bool_like(display_data[col])
+            elif is_numeric_column(reference):
                 for col in target_cols:
                     display_data[col] = pd.to_numeric(display_data[col], errors="coerce")
             else:
@@ -1154,10 +1400,13 @@ def _render_query_panel(
             display_data = display_data[available_cols]
     else:
         table_for_display = display_data
+    tracer.end(display_span)
 
-    st.dataframe(table_for_display, use_container_width=True)
+    with tracer.span("st.dataframe", columns=len(table_for_display.columns)):
+        st.dataframe(table_for_display, use_container_width=True)
 
-    csv_data = data.to_csv(index=False).encode("utf-8")
+    with tracer.span("csv export"):
+        csv_data = csv_bytes(data)
     st.download_button(
         label="Download CSV",
         data=csv_data,
@@ -1166,6 +1415,715 @@ def _render_query_panel(
         key=f"{panel_key}_download",
     )
 
+    if dataset in TRANSACTION_HISTORY_DATASETS:
+        _render_transaction_bars(panel_key, dataset, data, start_date, end_date)
+    elif dataset == "GFM Forward Curve":
+        _render_forward_curve_history(start_date, end_date)
+    elif dataset in ROLLING_DATASETS:
+        _render_rolling_analytics(config, dataset, data, y_col, start_date, end_date)
+
+    tracer.end(render_span)
+    APP_RENDER_DURATION.observe(time.perf_counter() - render_started, dataset=dataset)
+    _export_metrics()
+
+
+@st.cache_resource
+def _export_server(port: int):
+    return start_export_server(port, host=EXPORT_HOST)
+
+
+@st.cache_resource
+def _metrics_server(port: int):
+    return start_metrics_server(port, host=os.getenv("EPIAS_METRICS_HOST", "127.0.0.1"))
+
+
+@st.cache_resource
+def _job_runner() -> JobRunner:
+    return JobRunner()
+
+
+@st.cache_resource
+def _sql_workspace() -> SqlWorkspace:
+    return SqlWorkspace(_local_store())
+
+
+@st.cache_resource
+def _rollup_store() -> RollupStore:
+    return RollupStore(_local_store())
+
+
+def _publish_fetch(workspace: SqlWorkspace, rollups: RollupStore, dataset: str, data: pd.DataFrame, *axes):
+    # Every fetched frame becomes an SQL table and folds its gas days into the weekly/monthly rollups.
+    if not data.empty:
+        with tracer.span("publish", dataset=dataset):
+            workspace.register(dataset, data)
+            rollups.update(dataset, data)
+    return (data, *axes)
+
+
+def _runs_in_background(dataset: str, start_date: date, end_date: date) -> bool:
+    return dataset not in FOREGROUND_DATASETS and (end_date - start_date).days >= DEFAULT_CHUNK_DAYS
+
+
+def _combine_fetch_chunks(chunks):
+    frames = [chunk[0] for chunk in chunks]
+    # Empty chunks detect no axes, so take them from the first chunk that returned rows.
+    axes = next((chunk[1:] for chunk in chunks if not chunk[0].empty), (None, None, "Value"))
+    non_empty = [frame for frame in frames if not frame.empty]
+    data = pd.concat(non_empty, ignore_index=True) if non_empty else pd.DataFrame()
+    return (data, *axes)
+
+
+def _job_watcher(panel_key: str) -> str:
+    if "_session_token" not in st.session_state:
+        st.session_state["_session_token"] = uuid.uuid4().hex
+    return f"{st.session_state['_session_token']}:{panel_key}"
+
+
+def _submit_fetch_job(
+    config: EpiasConfig,
+    dataset: str,
+    start_date: date,
+    end_date: date,
+    watcher: str | None = None,
+) -> FetchJob:
+    key = make_cache_key(
+        config.base_url,
+        {"dataset": dataset, "startDate": start_date, "endDate": end_date},
+        scope=request_scope(config),
+    )
+    workspace, rollups = _sql_workspace(), _rollup_store()
+    chunks = [
+        lambda chunk_start=chunk_start, chunk_end=chunk_end: _fetch_dataset(
+            config=config,
+            dataset=dataset,
+            start_date=chunk_start,
+            end_date=chunk_end,
+        )
+        for chunk_start, chunk_end in date_chunks(start_date, end_date)
+    ]
+    return _job_runner().submit(
+        key,
+        label=f"{dataset} {start_date.isoformat()} to {end_date.isoformat()}",
+        chunks=chunks,
+        combine=lambda results: _publish_fetch(workspace, rollups, dataset, *_combine_fetch_chunks(results)),
+        metadata={"dataset": dataset, "start_date": start_date, "end_date": end_date},
+        watcher=watcher,
+    )
+
+
+def _render_job_status(panel_key: str, job: FetchJob):
+    if job.status == JOB_CANCELLED:
+        st.info(f"Fetch cancelled: {job.label}. Click Fetch to start again.")
+        return
+    if job.error is not None:
+        st.error(str(job.error))
+        return
+    _render_job_progress(panel_key, job.key)
+
+
+@st.fragment(run_every=1.0)
+def _render_job_progress(panel_key: str, job_key: str):
+    job = _job_runner().get(job_key)
+    if job is None:
+        return
+    if job.finished:
+        st.rerun()
+    st.progress(
+        job.progress,
+        text=f"Fetching {job.label} in the background: {job.completed_chunks}/{job.total_chunks} chunks",
+    )
+    if st.button("Cancel", key=f"{panel_key}_job_cancel"):
+        # Other sessions may be watching the same job; this panel just stops following it.
+        _job_runner().detach(job.key, _job_watcher(panel_key))
+        st.session_state.pop(f"{panel_key}_job", None)
+        st.rerun()
+
+
+def _render_profile_report(report: ProfileReport, key: str):
+    with st.expander(f"Profile: {report.label} ({report.elapsed_seconds:.2f}s)"):
+        st.dataframe(
+            report.top_functions,
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "totalSeconds": st.column_config.NumberColumn("Own (s)", format="%.4f"),
+                "cumulativeSeconds": st.column_config.NumberColumn("Cumulative (s)", format="%.4f"),
+            },
+        )
+        st.download_button(
+            "Download raw profile",
+            data=report.raw,
+            file_name=report.file_name,
+            mime="application/octet-stream",
+            key=f"{key}_download",
+        )
+
+
+def _export_metrics():
+    metrics_file = os.getenv("EPIAS_METRICS_FILE")
+    if metrics_file:
+        registry.write_textfile(metrics_file)
+
+
+def _render_forward_curve_history(start_date: date, end_date: date):
+    history = load_forward_curves(_local_store(), start_date, end_date)
+    if history["curveDate"].nunique() < 2:
+        return
+    st.markdown("**Stored Forward Curves**")
+    curves = history.pivot_table(index="deliveryMonth", columns="curveDate", values="price", aggfunc="last")
+    curves.columns = [pd.Timestamp(column).date().isoformat() for column in curves.columns]
+    st.line_chart(curves, height=350)
+
+
+@st.cache_resource
+def _transaction_bar_cache() -> TransactionBarCache:
+    return TransactionBarCache()
+
+
+def _render_transaction_bars(panel_key: str, dataset: str, data, start_date: date, end_date: date):
+    st.markdown("**OHLC / VWAP by Contract**")
+    day_tab, hour_tab = st.tabs(["Gas Day", "Hourly"])
+    for tab, granularity in ((day_tab, "day"), (hour_tab, "hour")):
+        with tab:
+            try:
+                bars = _transaction_bar_cache().aggregate(data, source=dataset, granularity=granularity)
+            except EpiasClientError as exc:
+                st.info(f"Aggregation skipped: {exc}")
+                continue
+            if bars.empty:
+                st.info("No trades to aggregate.")
+                continue
+            if granularity == "day":
+                bars = bars.drop(columns=["hour"])
+            bars["gasDay"] = bars["gasDay"].dt.date
+            st.dataframe(bars, use_container_width=True)
+            st.download_button(
+                label="Download Bars CSV",
+                data=bars.to_csv(index=False).encode("utf-8"),
+                file_name=f"{dataset.lower().replace(' ', '_')}_{granularity}_bars_{start_date}_{end_date}.csv",
+                mime="text/csv",
+                key=f"{panel_key}_{granularity}_bars_download",
+            )
+
+
+@st.cache_resource
+def _rolling_analytics() -> RollingAnalyticsCache:
+    return RollingAnalyticsCache()
+
+
+def _value_column(frame, fallback: str | None) -> str | None:
+    numeric = [c for c in frame.columns if is_numeric_column(frame[c])]
+    price_col = next((c for c in numeric if "price" in c.lower()), None)
+    return price_col or (fallback if fallback in numeric else next(iter(numeric), None))
+
+
+def _render_rolling_analytics(
+    config: EpiasConfig,
+    dataset: str,
+    data,
+    y_col: str | None,
+    start_date: date,
+    end_date: date,
+):
+    value_col = _value_column(data, y_col)
+    if value_col is None:
+        return
+    st.markdown(f"**Rolling Analytics ({DEFAULT_WINDOW} gas days)**")
+    analytics = _rolling_analytics()
+    if dataset in ROLLING_VOLATILITY_DATASETS:
+        result = analytics.volatility(data, source=dataset, value_column=value_col)
+        st.line_chart(result.set_index("gasDay")[["volatility"]], height=250)
+        st.caption("Annualised volatility of daily log returns.")
+    elif dataset in ROLLING_ZSCORE_DATASETS:
+        result = analytics.zscore(data, source=dataset, value_column=value_col)
+        st.line_chart(result.set_index("gasDay")[["zscore"]], height=250)
+        st.caption(f"Z-score of {value_col} against its rolling mean and standard deviation.")
+    else:
+        counterpart = SPREAD_COUNTERPARTS[dataset]
+        try:
+            other, _, other_y_col, _ = _fetch_dataset(
+                config=config,
+                dataset=counterpart,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        except EpiasClientError as exc:
+            st.info(f"Spread skipped: {exc}")
+            return
+        other_col = _value_column(other, other_y_col)
+        if other_col is None:
+            st.info(f"Spread skipped: no numeric column in {counterpart}.")
+            return
+        result = analytics.spread(
+            data,
+            other,
+            source=f"{dataset} - {counterpart}",
+            left_column=value_col,
+            right_column=other_col,
+        )
+        if result.empty:
+            st.info(f"Spread skipped: no overlapping gas days with {counterpart}.")
+            return
+        chart = result.set_index("gasDay").rename(columns={"left": dataset, "right": counterpart})
+        st.line_chart(chart[[dataset, counterpart, "spread"]], height=300)
+        st.line_chart(chart[["zscore"]], height=200)
+        st.caption(f"Spread = {dataset} - {counterpart}; z-score over the rolling window.")
+
+
+@st.cache_resource
+def _correlation_cache() -> CorrelationCache:
+    return CorrelationCache()
+
+
+def _fetch_frames(config: EpiasConfig, datasets: list[str], start_date: date, end_date: date):
+    frames, errors = {}, {}
+    workspace, rollups = _sql_workspace(), _rollup_store()
+
+    def fetch(dataset: str):
+        return _fetch_dataset(config=config, dataset=dataset, start_date=start_date, end_date=end_date)[0]
+
+    with ThreadPoolExecutor(max_workers=FETCH_MAX_WORKERS) as executor:
+        futures = {dataset: executor.submit(carry_context(fetch), dataset) for dataset in datasets}
+        for dataset, future in futures.items():
+            try:
+                frames[dataset] = future.result()
+            except EpiasClientError as exc:
+                errors[dataset] = str(exc)
+            else:
+                _publish_fetch(workspace, rollups, dataset, frames[dataset])
+    return frames, errors
+
+
+def _render_summary_page():
+    st.subheader("Summary")
+    st.caption(
+        "Weekly and monthly rollups are updated whenever a dataset is fetched anywhere in the app, "
+        "so these charts read pre-aggregated gas days instead of raw history."
+    )
+    rollups = _rollup_store()
+    frequency = st.radio(
+        "Period",
+        options=ROLLUP_FREQUENCIES,
+        index=ROLLUP_FREQUENCIES.index("month"),
+        format_func=lambda value: f"{value.title()}ly",
+        horizontal=True,
+        key="summary_frequency",
+    )
+    datasets = st.multiselect(
+        "Datasets",
+        options=EXPORT_DATASETS,
+        default=list(SUMMARY_DATASETS),
+        key="summary_datasets",
+    )
+
+    with st.expander("Sync History"):
+        col1, col2, col3 = st.columns([1, 1, 0.7])
+        with col1:
+            start_date = st.date_input(
+                "Start Date",
+                value=date.today() - timedelta(days=365),
+                key="summary_start_date",
+            )
+        with col2:
+            end_date = st.date_input("End Date", value=date.today(), key="summary_end_date")
+        with col3:
+            st.write("")
+            st.write("")
+            run_sync = st.button("Sync", type="primary", use_container_width=True, key="summary_sync")
+        if run_sync:
+            if start_date > end_date:
+                st.error("Start date cannot be after end date.")
+            elif not tgt.strip():
+                st.error("TGT token is required.")
+            else:
+                config = EpiasConfig(
+                    base_url=base_url,
+                    tgt=tgt,
+                    compact=COMPACT_FRAMES,
+                    downcast_numeric=DOWNCAST_NUMERIC,
+                    process_pool=PROCESS_POOL,
+                )
+                # History syncs yield to interactive fetches from other sessions.
+                with st.spinner(f"Fetching {len(datasets)} datasets from EPIAS..."), request_priority(BACKFILL):
+                    _, errors = _fetch_frames(config, datasets, start_date, end_date)
+                for dataset, message in errors.items():
+                    st.warning(f"{dataset}: {message}")
+
+    missing = []
+    for dataset in datasets:
+        rollup = rollups.rollup(dataset, frequency)
+        if rollup.empty:
+            missing.append(dataset)
+            continue
+        st.markdown(f"**{dataset}**")
+        columns = list(dict.fromkeys(rollup["column"]))
+        default_column = next((column for column in columns if "price" in column.lower()), columns[0])
+        col1, col2 = st.columns(2)
+        with col1:
+            column = st.selectbox(
+                "Column",
+                options=columns,
+                index=columns.index(default_column),
+                key=f"summary_{dataset}_column",
+            )
+        with col2:
+            aggregate = st.selectbox(
+                "Aggregate",
+                options=SUMMARY_AGGREGATES,
+                # Prices are averaged over the period, quantities and amounts are totalled.
+                index=SUMMARY_AGGREGATES.index("mean" if "price" in column.lower() else "sum"),
+                key=f"summary_{dataset}_aggregate",
+            )
+        series = rollup[rollup["column"] == column].set_index("period")
+        st.bar_chart(series[aggregate].rename(column), y_label=f"{aggregate.title()} of {column}", height=250)
+        st.caption(f"{len(series):,} periods from {int(series['days'].sum()):,} gas days")
+    if missing:
+        st.info(f"No rollups yet for {', '.join(missing)}. Fetch them in any panel or use Sync History.")
+
+
+def _render_correlation_page():
+    st.subheader("Cross-Dataset Correlation")
+    st.caption(
+        "Every daily numeric series is aligned on gas day. Lead-lag pairs show where one series "
+        "correlates best with another series a number of days later."
+    )
+    col1, col2, col3, col4 = st.columns([1, 1, 0.7, 0.7])
+    with col1:
+        start_date = st.date_input(
+            "Start Date",
+            value=date.today() - timedelta(days=180),
+            key="correlation_start_date",
+        )
+    with col2:
+        end_date = st.date_input("End Date", value=date.today(), key="correlation_end_date")
+    with col3:
+        max_lag = st.number_input(
+            "Max Lag (days)",
+            min_value=1,
+            max_value=60,
+            value=DEFAULT_MAX_LAG,
+            key="correlation_max_lag",
+        )
+    with col4:
+        st.write("")
+        st.write("")
+        run_query = st.button("Compute", type="primary", use_container_width=True, key="correlation_compute")
+    datasets = st.multiselect(
+        "Datasets",
+        options=CORRELATION_DATASETS,
+        default=list(CORRELATION_DATASETS),
+        key="correlation_datasets",
+    )
+
+    if start_date > end_date:
+        st.error("Start date cannot be after end date.")
+        return
+    if run_query:
+        if not tgt.strip():
+            st.error("TGT token is required.")
+            return
+        config = EpiasConfig(
+            base_url=base_url,
+            tgt=tgt,
+            compact=COMPACT_FRAMES,
+            downcast_numeric=DOWNCAST_NUMERIC,
+            process_pool=PROCESS_POOL,
+        )
+        with st.spinner(f"Fetching {len(datasets)} datasets from EPIAS..."):
+            frames, errors = _fetch_frames(config, datasets, start_date, end_date)
+        result = _correlation_cache().update(frames, start_date, end_date, max_lag=int(max_lag))
+        st.session_state["correlation_result"] = (result, errors)
+
+    stored = st.session_state.get("correlation_result")
+    if stored is None:
+        st.info("Select date range and click Compute.")
+        return
+    result, errors = stored
+    for dataset, message in errors.items():
+        st.warning(f"{dataset}: {message}")
+    skipped = [dataset for dataset in result.skipped if dataset not in errors]
+    if skipped:
+        st.warning(f"Not correlated (no varying daily numeric series): {', '.join(skipped)}")
+    if not result.columns:
+        st.warning("No daily numeric series returned for this date range.")
+        return
+
+    st.metric("Series", len(result.columns))
+    st.markdown("**Same-Day Correlation**")
+    st.dataframe(result.correlation.round(2), use_container_width=True)
+    st.markdown("**Lead-Lag Pairs**")
+    lead_lag = result.lead_lag()
+    st.dataframe(
+        lead_lag,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "correlation": st.column_config.NumberColumn(format="%.3f"),
+            "sameDayCorrelation": st.column_config.NumberColumn(format="%.3f"),
+        },
+    )
+    st.download_button(
+        label="Download Lead-Lag CSV",
+        data=lead_lag.to_csv(index=False).encode("utf-8"),
+        file_name=f"lead_lag_{start_date}_{end_date}.csv",
+        mime="text/csv",
+        key="correlation_lead_lag_download",
+    )
+
+
+def _render_month_end_export():
+    st.subheader("Month-End Export")
+    st.caption(
+        "Fetches each dataset for the month and streams it into a zip on disk as soon as it arrives, "
+        "so only one dataset is held in memory at a time."
+    )
+    today = date.today()
+    month_options = []
+    for offset in range(0, 25):
+        month_index = today.year * 12 + today.month - 1 - offset
+        month_options.append(date(month_index // 12, month_index % 12 + 1, 1))
+    col1, col2, col3 = st.columns([1, 1, 0.7])
+    with col1:
+        month_start = st.selectbox(
+            "Month",
+            options=month_options,
+            index=1,
+            format_func=lambda value: f"{calendar.month_name[value.month]} {value.year}",
+            key="export_month",
+        )
+    with col2:
+        export_format = st.selectbox("Format", options=("csv", "parquet"), key="export_format")
+    with col3:
+        st.write("")
+        st.write("")
+        run_export = st.button("Export", type="primary", use_container_width=True, key="export_run")
+    datasets = st.multiselect(
+        "Datasets",
+        options=EXPORT_DATASETS,
+        default=list(EXPORT_DATASETS),
+        key="export_datasets",
+    )
+
+    if run_export:
+        if not tgt.strip():
+            st.error("TGT token is required.")
+            return
+        # Uncached, so each dataset's frame is released once it is in the archive.
+        config = EpiasConfig(
+            base_url=base_url,
+            tgt=tgt,
+            compact=COMPACT_FRAMES,
+            downcast_numeric=DOWNCAST_NUMERIC,
+            process_pool=PROCESS_POOL,
+            use_cache=False,
+        )
+        last_day = calendar.monthrange(month_start.year, month_start.month)[1]
+        month_end = date(month_start.year, month_start.month, last_day)
+        progress = st.progress(0.0, text="Starting export...")
+        finished = []
+
+        def on_progress(dataset: str, rows: int | None):
+            finished.append(dataset)
+            status = f"{rows:,} rows" if rows is not None else "failed"
+            progress.progress(len(finished) / len(datasets), text=f"{dataset}: {status}")
+
+        loaders = [
+            (
+                dataset,
+                lambda dataset=dataset: _fetch_dataset(
+                    config=config,
+                    dataset=dataset,
+                    start_date=month_start,
+                    end_date=month_end,
+                )[0],
+            )
+            for dataset in datasets
+        ]
+        path = DEFAULT_EXPORT_DIR / f"epias_{month_start:%Y_%m}_{export_format}.zip"
+        with request_priority(BACKFILL):
+            st.session_state["export_path"] = str(
+                write_archive(path, loaders, fmt=export_format, on_progress=on_progress)
+            )
+        progress.empty()
+
+    export_path = st.session_state.get("export_path")
+    if export_path and Path(export_path).exists():
+        st.success(f"Archive written to `{export_path}`.")
+        if EXPORT_PORT:
+            _export_server(EXPORT_PORT)
+            # Served from disk in chunks, so the archive never has to fit in the app's memory.
+            st.link_button("Download Archive", f"{EXPORT_URL.rstrip('/')}/{quote(Path(export_path).name)}")
+        else:
+            # Deferred: the archive is only read when the button is clicked, not on every rerun.
+            st.download_button(
+                label="Download Archive",
+                data=lambda: Path(export_path).read_bytes(),
+                file_name=Path(export_path).name,
+                mime="application/zip",
+                key="export_download",
+            )
+
+
+def _render_sql_page():
+    st.subheader("SQL")
+    st.caption(
+        "Every dataset fetched on this server is a table (named after the dataset in snake_case) holding "
+        "every gas day fetched so far, and forward curves saved to the local store are available as `store_*` tables."
+    )
+    workspace = _sql_workspace()
+
+    with st.expander("Load Datasets", expanded=not workspace.tables()):
+        col1, col2, col3 = st.columns([1, 1, 0.7])
+        with col1:
+            start_date = st.date_input(
+                "Start Date",
+                value=date.today() - timedelta(days=365),
+                key="sql_start_date",
+            )
+        with col2:
+            end_date = st.date_input("End Date", value=date.today(), key="sql_end_date")
+        with col3:
+            st.write("")
+            st.write("")
+            run_load = st.button("Load", type="primary", use_container_width=True, key="sql_load")
+        datasets = st.multiselect(
+            "Datasets",
+            options=EXPORT_DATASETS,
+            default=["SGP Daily Reference Price", "Stock Amount"],
+            key="sql_datasets",
+        )
+        if run_load:
+            if start_date > end_date:
+                st.error("Start date cannot be after end date.")
+            elif not tgt.strip():
+                st.error("TGT token is required.")
+            else:
+                config = EpiasConfig(
+                    base_url=base_url,
+                    tgt=tgt,
+                    compact=COMPACT_FRAMES,
+                    downcast_numeric=DOWNCAST_NUMERIC,
+                    process_pool=PROCESS_POOL,
+                )
+                with st.spinner(f"Fetching {len(datasets)} datasets from EPIAS..."):
+                    _, errors = _fetch_frames(config, datasets, start_date, end_date)
+                for dataset, message in errors.items():
+                    st.warning(f"{dataset}: {message}")
+
+    tables = workspace.tables()
+    if tables:
+        st.dataframe(
+            pd.DataFrame(
+                [
+                    {
+                        "table": table.name,
+                        "dataset": table.dataset,
+                        "source": table.source,
+                        "rows": table.rows,
+                        "columns": ", ".join(table.columns),
+                    }
+                    for table in tables
+                ]
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+    else:
+        st.info("Fetch a dataset in any panel or load datasets above to query it here.")
+
+    sql = st.text_area(
+        "Query",
+        value="SELECT *\nFROM sgp_daily_reference_price\nORDER BY gasDay DESC",
+        height=160,
+        key="sql_query",
+    )
+    col1, col2 = st.columns([1, 0.7])
+    with col1:
+        limit = st.number_input(
+            "Row Limit",
+            min_value=1,
+            max_value=1_000_000,
+            value=DEFAULT_ROW_LIMIT,
+            step=1000,
+            key="sql_limit",
+        )
+    with col2:
+        st.write("")
+        st.write("")
+        run_query = st.button("Run Query", type="primary", use_container_width=True, key="sql_run")
+
+    if run_query:
+        try:
+            st.session_state["sql_result"] = workspace.query(sql, limit=int(limit))
+        except SqlQueryError as exc:
+            st.session_state.pop("sql_result", None)
+            st.error(str(exc))
+            return
+
+    result = st.session_state.get("sql_result")
+    if result is None:
+        return
+    caption = f"{len(result.frame):,} rows in {result.elapsed_seconds * 1000:.1f} ms"
+    if result.truncated:
+        caption += f" (limited to {result.limit:,})"
+    st.caption(caption)
+    st.dataframe(result.frame, use_container_width=True, hide_index=True)
+    st.download_button(
+        label="Download CSV",
+        data=result.frame.to_csv(index=False).encode("utf-8"),
+        file_name="query_result.csv",
+        mime="text/csv",
+        key="sql_result_download",
+    )
+
+
+def _render_participant_directory():
+    directory = _participant_directory()
+    frame = directory.frame
+    if frame.empty:
+        return
+    st.markdown("**Participant Search**")
+    source_columns = list(frame.columns)
+    sgm_col = next((c for c in source_columns if "sgm" in c.lower() or "sgp" in c.lower()), None)
+    fgm_col = next((c for c in source_columns if "fgm" in c.lower() or "vgp" in c.lower()), None)
+    flag_options = {"Any": None, "Yes": True, "No": False}
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        query = st.text_input("Organization Name", key="participants_search")
+    flags = {}
+    with col2:
+        if sgm_col:
+            flags[sgm_col] = flag_options[
+                st.selectbox("SGM Participation", options=tuple(flag_options), key="participants_sgm")
+            ]
+    with col3:
+        if fgm_col:
+            flags[fgm_col] = flag_options[
+                st.selectbox("FGM Participation", options=tuple(flag_options), key="participants_fgm")
+            ]
+    results = directory.search(query, **flags)
+    st.caption(
+        f"{len(results):,} of {len(frame):,} participants · last synced "
+        f"{directory.synced_at:%Y-%m-%d %H:%M}"
+    )
+    st.dataframe(results, use_container_width=True, hide_index=True)
+
+    changes = directory.changes
+    if changes:
+        with st.expander("Participant Changes"):
+            st.dataframe(
+                pd.DataFrame(
+                    {
+                        "Synced At": [change.synced_at for change in changes],
+                        "Added": [", ".join(change.added) for change in changes],
+                        "Removed": [", ".join(change.removed) for change in changes],
+                    }
+                ),
+                use_container_width=True,
+                hide_index=True,
+            )
+
 
 def _render_about_spot_gas_market():
     if not ABOUT_SPOT_GAS_MARKET_PATH.exists():
@@ -1328,6 +2286,9 @@ def _render_footer():
     st.caption("This project is driven by RePath Analytics.")
 
 
+if os.getenv("EPIAS_METRICS_PORT"):
+    _metrics_server(int(os.environ["EPIAS_METRICS_PORT"]))
+
 with market_tab:
     spot_tab, futures_tab, general_tab = st.tabs(
         ["Spot Gas Market", "Gas Future Market", "General Data"]
@@ -1460,6 +2421,7 @@ with market_tab:
                 "GFM Contract Price Summary",
                 "GFM Open Position (1000.Sm³/day)",
                 "GFM Order Prices",
+                "GFM Forward Curve",
             ),
         )
 
@@ -1470,6 +2432,7 @@ with market_tab:
             panel_key="general_data",
             dataset_options=("Natural Gas Market Participants",),
         )
+        _render_participant_directory()
 
 with transmission_tab:
     st.subheader("Natural Gas Transmission")
@@ -1632,4 +2595,19 @@ with transmission_tab:
             dataset_options=("Daily Actualization Amount",),
         )
 
+with summary_tab:
+    _render_summary_page()
+
+with analysis_tab:
+    _render_correlation_page()
+    st.divider()
+    _render_month_end_export()
+
+with sql_tab:
+    _render_sql_page()
+
+if "_rerun_profile" in st.session_state:
+    _render_profile_report(st.session_state.pop("_rerun_profile").stop(), key="rerun_profile")
+
 _render_footer()
+tracer.end(st.session_state.pop("_rerun_span"))
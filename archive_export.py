@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from urllib.parse import unquote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from epias_arrow import to_arrow_or_none
+from epias_client import EpiasClientError
+
+DEFAULT_EXPORT_DIR = Path(os.getenv("EPIAS_EXPORT_DIR", ".epias_exports"))
+EXPORT_FORMATS = {"csv", "parquet"}
+CSV_CHUNK_ROWS = 50_000
+FILE_CHUNK_BYTES = 1 << 20
+
+
+class _ChunkSink(io.RawIOBase):
+    # Unseekable target for ZipFile: every write is buffered until the caller drains it, so
+    # only the bytes produced since the last drain are ever held in memory.
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def entry_name(dataset: str, fmt: str) -> str:
+    slug = re.sub(r"[^0-9A-Za-z]+", "_", dataset).strip("_").lower()
+    return f"{slug or 'dataset'}.{fmt}"
+
+
+def _write_csv(archive: zipfile.ZipFile, name: str, frame: pd.DataFrame, sink: _ChunkSink) -> Iterator[bytes]:
+    with archive.open(name, "w", force_zip64=True) as raw:
+        text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        if frame.empty:
+            frame.to_csv(text, index=False)
+        for start in range(0, len(frame), CSV_CHUNK_ROWS):
+            frame.iloc[start:start + CSV_CHUNK_ROWS].to_csv(text, header=start == 0, index=False)
+            text.flush()
+            yield sink.drain()
+        text.flush()
+        text.detach()
+
+
+def _write_parquet(archive: zipfile.ZipFile, name: str, table: pa.Table, sink: _ChunkSink) -> Iterator[bytes]:
+    buffer = pa.BufferOutputStream()
+    pq.write_table(table, buffer)
+    # Parquet pages are already compressed; deflating them again only costs CPU.
+    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+    with archive.open(info, "w", force_zip64=True) as raw:
+        raw.write(buffer.getvalue().to_pybytes())
+    yield sink.drain()
+
+
+def iter_archive(
+    datasets: Iterable[tuple[str, Callable[[], pd.DataFrame]]],
+    fmt: str = "csv",
+    on_progress: Callable[[str, int | None], None] | None = None,
+) -> Iterator[bytes]:
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"fmt must be one of {sorted(EXPORT_FORMATS)}, got {fmt!r}")
+    sink = _ChunkSink()
+    manifest: dict = {"format": fmt, "datasets": []}
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for dataset, load in datasets:
+            entry: dict = {"dataset": dataset}
+            try:
+                frame = load()
+            except EpiasClientError as exc:
+                entry["error"] = str(exc)
+            else:
+                table = to_arrow_or_none(frame) if fmt == "parquet" else None
+                if table is not None:
+                    name = entry_name(dataset, "parquet")
+                    yield from _write_parquet(archive, name, table, sink)
+                    del table
+                else:
+                    # CSV was asked for, or the frame has no Arrow table.
+                    name = entry_name(dataset, "csv")
+                    yield from _write_csv(archive, name, frame, sink)
+                entry.update(file=name, rows=len(frame))
+                # Only one dataset's frame is alive at a time.
+                del frame
+            manifest["datasets"].append(entry)
+            if on_progress is not None:
+                on_progress(dataset, entry.get("rows"))
+            yield sink.drain()
+        archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+    yield sink.drain()
+
+
+def write_archive(
+    path: Path | str,
+    datasets: Iterable[tuple[str, Callable[[], pd.DataFrame]]],
+    fmt: str = "csv",
+    on_progress: Callable[[str, int | None], None] | None = None,
+) -> Path:
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # A private temp file per export, so concurrent exports of the same month never share one.
+    handle = tempfile.NamedTemporaryFile(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp", delete=False)
+    try:
+        with handle:
+            for chunk in iter_archive(datasets, fmt=fmt, on_progress=on_progress):
+                if chunk:
+                    handle.write(chunk)
+        os.replace(handle.name, target)
+    finally:
+        # Gone after a successful replace; left behind only if the export failed.
+        Path(handle.name).unlink(missing_ok=True)
+    return target
+
+
+def iter_file(path: Path | str, chunk_size: int = FILE_CHUNK_BYTES) -> Iterator[bytes]:
+    with open(path, "rb") as handle:
+        while chunk := handle.read(chunk_size):
+            yield chunk
+
+
+class _ExportHandler(BaseHTTPRequestHandler):
+    directory: Path = DEFAULT_EXPORT_DIR
+
+    def do_GET(self) -> None:
+        name = unquote(self.path.split("?", 1)[0]).lstrip("/")
+        path = self.directory / name
+        # Only finished archives directly inside the export directory are served.
+        if "/" in name or name.startswith(".") or not name.endswith(".zip") or not path.is_file():
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(path.stat().st_size))
+        self.send_header("Content-Disposition", f'attachment; filename="{name}"')
+        self.end_headers()
+        for chunk in iter_file(path):
+            self.wfile.write(chunk)
+
+    def log_message(self, format: str, *args) -> None:
+        return
+
+
+def start_export_server(
+    port: int,
+    host: str = "127.0.0.1",
+    directory: Path | str = DEFAULT_EXPORT_DIR,
+) -> ThreadingHTTPServer:
+    handler = type("ExportHandler", (_ExportHandler,), {"directory": Path(directory)})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, name="epias-exports", daemon=True).start()
+    return server
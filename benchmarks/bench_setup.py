@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def uncached() -> None:
+    # Every run must request and parse the full payload, so no cache tier may answer it. The app
+    # modules read these settings on import, so call this before importing them.
+    sys.path.insert(0, str(ROOT))
+    os.environ["EPIAS_CACHE_TTL_SECONDS"] = "0"
+    os.environ["EPIAS_CACHE_DB"] = ""
+    os.environ["EPIAS_SNAPSHOT_DIR"] = ""
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from collections import Counter
+from datetime import date, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Rows per gas day for listing endpoints that are not daily in the real service.
+HOURLY_ENDPOINTS = ("physical-realization", "virtual-realization", "imbalance-system", "system-direction")
+TRADES_PER_HOUR = 12
+
+
+def _days(body: dict) -> list[date]:
+    start = body.get("startDate") or body.get("period")
+    if not start:
+        return [date.today()]
+    start_day = datetime.fromisoformat(start).date()
+    end = body.get("endDate")
+    if end:
+        end_day = datetime.fromisoformat(end).date()
+    else:
+        # Period endpoints send a single month.
+        end_day = (start_day.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return [start_day + timedelta(days=offset) for offset in range((end_day - start_day).days + 1)]
+
+
+def _stamp(day: date, hour: int = 0, minute: int = 0) -> str:
+    return f"{day.isoformat()}T{hour:02d}:{minute:02d}:00+03:00"
+
+
+def _monthly_contract(day: date, ahead: int) -> str:
+    index = day.year * 12 + day.month - 1 + ahead
+    return f"VGP_M_{index % 12 + 1:02d}_{index // 12}"
+
+
+def _items(path: str, body: dict, rng: random.Random) -> list[dict]:
+    days = _days(body)
+    if path.endswith("market-participant"):
+        return [
+            {
+                "organizationName": f"Participant {index:03d}",
+                "organizationShortName": f"P{index:03d}",
+                "eic": f"40X{index:013d}",
+                "sgmParticipation": rng.choice(["true", "false"]),
+                "vgpParticipation": rng.choice(["true", "false"]),
+                "legalEntityStatus": "true",
+            }
+            for index in range(250)
+        ]
+    if path.endswith("transaction-history"):
+        contract = "VGP_M_{month:02d}_{year}" if "vgp" in path else "GG{day:%Y%m%d}"
+        return [
+            {
+                "date": _stamp(day, hour, minute),
+                "transactionDate": _stamp(day, hour, minute),
+                "contractName": contract.format(month=day.month, year=day.year, day=day),
+                "price": round(1000 + rng.gauss(0, 25), 2),
+                "quantity": rng.randint(1, 500),
+                "matchingPrice": round(1000 + rng.gauss(0, 25), 2),
+                "matchingQuantity": rng.randint(1, 500),
+            }
+            for day in days
+            for hour in range(24)
+            for minute in range(0, 60, 60 // TRADES_PER_HOUR)
+        ]
+    if path.endswith("contract-price-summary") or path.endswith("vgp-offer-price"):
+        last = days[-1]
+        return [
+            {
+                "transactionDate": _stamp(last),
+                "contractCode": _monthly_contract(last, ahead),
+                "contractName": _monthly_contract(last, ahead),
+                "lastMatchingPrice": round(1000 + 15 * ahead + rng.gauss(0, 5), 2),
+                "bestBidPrice": round(990 + 15 * ahead, 2),
+                "bestOfferPrice": round(1010 + 15 * ahead, 2),
+                "weightedAverage": round(1000 + 15 * ahead, 2),
+            }
+            for ahead in range(1, 13)
+        ]
+    if path.endswith("total-trade-volume"):
+        return [{"gasDay": _stamp(day), "tradeVolume": round(rng.uniform(2e8, 6e8), 2)} for day in days]
+    if any(path.endswith(name) for name in HOURLY_ENDPOINTS):
+        return [
+            {"date": _stamp(day, hour), "gasDay": _stamp(day), "value": round(rng.uniform(-5e5, 5e5), 2)}
+            for day in days
+            for hour in range(24)
+        ]
+    if "/transmission/" in path:
+        return [
+            {"gasDay": _stamp(day), "pointName": f"Point {point}", "amount": round(rng.uniform(1e6, 5e7), 2)}
+            for day in days
+            for point in range(8)
+        ]
+    return [
+        {"gasDay": _stamp(day), "price": round(1000 + rng.gauss(0, 40), 2), "amount": round(rng.uniform(1e5, 1e7), 2)}
+        for day in days
+    ]
+
+
+class StandInEpias:
+    # Answers every EPIAS listing endpoint and the CAS ticket endpoint with synthetic but
+    # well-formed payloads, after an optional per-request latency. cache_payloads keeps each
+    # generated payload, so repeated requests only cost the HTTP exchange.
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_seconds: float = 0.0,
+        seed: int = 0,
+        cache_payloads: bool = False,
+    ) -> None:
+        self.latency_seconds = latency_seconds
+        self.calls: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._seed = seed
+        self._payloads: dict[tuple[str, bytes], bytes] | None = {} if cache_payloads else None
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                path = self.path.split("?", 1)[0]
+                with stand_in._lock:
+                    stand_in.calls[path] += 1
+                if stand_in.latency_seconds:
+                    time.sleep(stand_in.latency_seconds)
+                if "/cas/" in path:
+                    self._send(201, b"TGT-stand-in", "text/plain")
+                    return
+                payload = stand_in._payloads.get((path, raw)) if stand_in._payloads is not None else None
+                if payload is None:
+                    payload = stand_in._payload(path, raw)
+                self._send(200, payload, "application/json")
+
+            def do_GET(self) -> None:
+                # Call counts, and the readiness probe for start_stand_in.
+                if self.path.split("?", 1)[0] != "/calls":
+                    self._send(404, b"", "text/plain")
+                    return
+                with stand_in._lock:
+                    content = json.dumps(dict(stand_in.calls)).encode("utf-8")
+                self._send(200, content, "application/json")
+
+            def _send(self, status: int, content: bytes, content_type: str) -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+
+        return Handler
+
+    def _payload(self, path: str, raw: bytes) -> bytes:
+        try:
+            body = json.loads(raw or b"{}")
+        except ValueError:
+            body = {}
+        rng = random.Random(f"{self._seed}:{path}:{sorted(body.items())}")
+        payload = json.dumps({"body": {"items": _items(path, body, rng)}}).encode("utf-8")
+        if self._payloads is not None:
+            with self._lock:
+                self._payloads[(path, raw)] = payload
+        return payload
+
+    def total_calls(self) -> int:
+        with self._lock:
+            return sum(self.calls.values())
+
+    def start(self) -> StandInEpias:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def wait_for(url: str, process: subprocess.Popen, timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(url, timeout=2).close()
+            return
+        except OSError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                raise RuntimeError(f"{url} did not come up")
+            time.sleep(0.2)
+
+
+def start_stand_in(latency_ms: float = 0.0, cache_payloads: bool = False) -> tuple[subprocess.Popen, str]:
+    # Every benchmark runs the stand-in in its own process, so serving responses never shares the
+    # GIL or the traced heap with the code being measured.
+    port = free_port()
+    command = [sys.executable, str(Path(__file__).resolve()), "--port", str(port), "--latency-ms", str(latency_ms)]
+    if cache_payloads:
+        command.append("--cache-payloads")
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    wait_for(f"{base_url}/calls", process)
+    return process, base_url
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic EPIAS responses for local runs of the app.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--cache-payloads", action="store_true", help="generate each distinct payload only once")
+    args = parser.parse_args()
+
+    server = StandInEpias(
+        args.host,
+        args.port,
+        latency_seconds=args.latency_ms / 1000,
+        cache_payloads=args.cache_payloads,
+    ).start()
+    print(f"Serving stand-in EPIAS on {server.base_url} (EPIAS_BASE_URL={server.base_url} EPIAS_TGT=stand-in)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+from streamlit.proto.Alert_pb2 import Alert
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from websockets.sync.client import connect
+
+from epias_stand_in import free_port, start_stand_in, wait_for
+
+ROOT = Path(__file__).resolve().parents[1]
+PERCENTILES = (50, 90, 95, 99)
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+# Panels whose datasets are fetched on a trading floor all day; other panels are visited less.
+HOT_DATASETS = {
+    "SGP Daily Reference Price",
+    "SGP Price",
+    "SGP Balancing Gas Price",
+    "SGP Transaction History",
+    "GFM Daily Index Price",
+    "Entry Nomination",
+    "Exit Nomination",
+    "Stock Amount",
+}
+
+
+def _api_calls(base_url: str) -> dict[str, int]:
+    with urllib.request.urlopen(f"{base_url}/calls", timeout=5) as response:
+        return json.loads(response.read())
+
+
+def start_app(epias_url: str, store_dir: str) -> tuple[subprocess.Popen, int]:
+    port = free_port()
+    env = dict(
+        os.environ,
+        EPIAS_BASE_URL=epias_url,
+        EPIAS_CAS_URL=f"{epias_url}/cas/v1/tickets",
+        EPIAS_TGT="stand-in",
+        # Forward curves and rollups written during the run must not land in the real store, and
+        # every level starts cold instead of warm from the previous level's cache snapshot.
+        EPIAS_STORE_DIR=store_dir,
+        EPIAS_SNAPSHOT_DIR=os.path.join(store_dir, "snapshot"),
+    )
+    command = [
+        sys.executable, "-m", "streamlit", "run", str(ROOT / "app.py"),
+        "--server.headless", "true",
+        "--server.port", str(port),
+        "--browser.gatherUsageStats", "false",
+    ]  # fmt: skip
+    process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for(f"http://127.0.0.1:{port}/_stcore/health", process)
+    return process, port
+
+
+class ProcessMonitor:
+    # Samples CPU time and RSS of the Streamlit server process from /proc.
+    def __init__(self, pid: int, interval: float = 0.5) -> None:
+        self.pid = pid
+        self.interval = interval
+        self.samples: list[tuple[float, float, int]] = []
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _sample(self) -> tuple[float, float, int]:
+        with open(f"/proc/{self.pid}/stat") as stat:
+            # Fields after the parenthesised command name; utime and stime are the 12th and 13th.
+            fields = stat.read().rsplit(")", 1)[1].split()
+        with open(f"/proc/{self.pid}/statm") as statm:
+            rss = int(statm.read().split()[1]) * PAGE_SIZE
+        return time.perf_counter(), (int(fields[11]) + int(fields[12])) / CLOCK_TICKS, rss
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.samples.append(self._sample())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> ProcessMonitor:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.samples.append(self._sample())
+
+    def summary(self) -> dict:
+        wall, cpu, rss = (np.array(column) for column in zip(*self.samples))
+        elapsed = wall[-1] - wall[0]
+        interval_cpu = np.diff(cpu) / np.maximum(np.diff(wall), 1e-9) if len(wall) > 1 else np.zeros(1)
+        return {
+            "cpu_seconds": float(cpu[-1] - cpu[0]),
+            "cpu_mean_percent": float(100 * (cpu[-1] - cpu[0]) / elapsed) if elapsed else 0.0,
+            "cpu_peak_percent": float(100 * interval_cpu.max()),
+            "rss_start_mb": float(rss[0] / 2**20),
+            "rss_peak_mb": float(rss.max() / 2**20),
+            "rss_end_mb": float(rss[-1] / 2**20),
+        }
+
+
+class BrowserSession:
+    # The part of the Streamlit frontend protocol a user needs: send widget states with a rerun
+    # request over the websocket and read deltas until the script finishes.
+    def __init__(self, websocket, timeout: float) -> None:
+        self.timeout = timeout
+        self._socket = websocket
+        self.widgets: dict[str, tuple[str, object]] = {}
+        self._states: dict[str, WidgetState] = {}
+
+    def widget_id(self, key: str) -> str:
+        # Keyed widget ids end with the user key.
+        return next(widget_id for widget_id in self.widgets if widget_id.endswith(f"-{key}"))
+
+    def set_value(self, key: str, field: str, value) -> None:
+        state = WidgetState(id=self.widget_id(key))
+        if isinstance(value, list):
+            getattr(state, field).data.extend(value)
+        else:
+            setattr(state, field, value)
+        self._states[state.id] = state
+
+    def rerun(self, trigger: str | None = None) -> tuple[float, list[str]]:
+        message = BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        states = message.rerun_script.widget_states.widgets
+        states.extend(self._states.values())
+        if trigger is not None:
+            states.append(WidgetState(id=self.widget_id(trigger), trigger_value=True))
+        started = time.perf_counter()
+        self._socket.send(message.SerializeToString())
+        widgets, errors = {}, []
+        while True:
+            forward = ForwardMsg.FromString(self._socket.recv(timeout=self.timeout))
+            kind = forward.WhichOneof("type")
+            if kind == "script_finished":
+                break
+            if kind != "delta" or forward.delta.WhichOneof("type") != "new_element":
+                continue
+            element = forward.delta.new_element
+            element_type = element.WhichOneof("type")
+            if element_type == "exception":
+                errors.append(f"{element.exception.type}: {element.exception.message}")
+            elif element_type == "alert" and element.alert.format == Alert.ERROR:
+                errors.append(element.alert.body)
+            elif element_type is not None:
+                inner = getattr(element, element_type)
+                if getattr(inner, "id", ""):
+                    widgets[inner.id] = (element_type, inner)
+        elapsed = time.perf_counter() - started
+        self.widgets = widgets
+        return elapsed, errors
+
+
+class SimulatedUser:
+    # One browser tab. Streamlit tabs switch client-side without a rerun, so a user "visits" a tab
+    # by interacting with a panel in it: picking a dataset and pressing Fetch each rerun the script.
+    def __init__(self, index: int, args: argparse.Namespace) -> None:
+        self.index = index
+        self.args = args
+        self.random = random.Random(args.seed * 1000 + index)
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.errors: list[str] = []
+
+    def _timed(self, action: str, session: BrowserSession, trigger: str | None = None) -> None:
+        elapsed, errors = session.rerun(trigger)
+        self.latencies[action].append(elapsed)
+        self.errors.extend(error[:200] for error in errors)
+
+    def _pick_panel(self, session: BrowserSession) -> tuple[str, str]:
+        panels = [
+            (widget_id.rsplit("-", 1)[1][: -len("_dataset")], list(widget.options))
+            for widget_id, (kind, widget) in session.widgets.items()
+            if kind == "selectbox" and widget_id.endswith("_dataset")
+        ]
+        weights = [1 + 4 * any(option in HOT_DATASETS for option in options) for _, options in panels]
+        panel_key, options = self.random.choices(panels, weights=weights)[0]
+        hot = [option for option in options if option in HOT_DATASETS]
+        return panel_key, self.random.choice(hot if hot and self.random.random() < 0.8 else options)
+
+    def _set_dates(self, session: BrowserSession, panel_key: str) -> None:
+        if not any(widget_id.endswith(f"-{panel_key}_start_date") for widget_id in session.widgets):
+            return
+        end_date = date.today() - timedelta(days=self.random.randint(0, self.args.date_spread_days))
+        start_date = end_date - timedelta(days=30)
+        session.set_value(f"{panel_key}_start_date", "string_array_value", [start_date.isoformat()])
+        session.set_value(f"{panel_key}_end_date", "string_array_value", [end_date.isoformat()])
+
+    def run(self, port: int) -> None:
+        url = f"ws://127.0.0.1:{port}/_stcore/stream"
+        try:
+            with connect(url, subprotocols=["streamlit"], max_size=None) as websocket:
+                self._run(BrowserSession(websocket, self.args.timeout))
+        except Exception as exc:
+            self.errors.append(f"user {self.index} stopped: {exc!r}"[:200])
+
+    def _run(self, session: BrowserSession) -> None:
+        self._timed("load", session)
+        for _ in range(self.args.actions):
+            time.sleep(self.random.uniform(0, 2 * self.args.think_ms / 1000))
+            panel_key, dataset = self._pick_panel(session)
+            session.set_value(f"{panel_key}_dataset", "string_value", dataset)
+            self._timed("select", session)
+            if self.args.date_spread_days:
+                self._set_dates(session, panel_key)
+            self._timed("fetch", session, trigger=f"{panel_key}_fetch")
+
+
+def _percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"count": 0}
+    data = np.array(values) * 1000
+    summary = {"count": len(values), "mean_ms": float(data.mean())}
+    summary.update({f"p{p}_ms": float(np.percentile(data, p)) for p in PERCENTILES})
+    summary["max_ms"] = float(data.max())
+    return summary
+
+
+def run_level(args: argparse.Namespace, users: int) -> dict:
+    # Fresh stand-in and app server per level, so caches from the previous level don't carry over.
+    stand_in, epias_url = start_stand_in(args.api_latency_ms)
+    app = None
+    try:
+        app, port = start_app(epias_url, tempfile.mkdtemp(prefix="epias_load_store_"))
+        sessions = [SimulatedUser(index, args) for index in range(users)]
+        threads = [threading.Thread(target=session.run, args=(port,)) for session in sessions]
+        started = time.perf_counter()
+        with ProcessMonitor(app.pid) as monitor:
+            for thread in threads:
+                thread.start()
+                # Users arrive over the ramp-up window instead of all in the same instant.
+                time.sleep(args.ramp_up_seconds / users)
+            for thread in threads:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        calls = _api_calls(epias_url)
+    finally:
+        for process in (app, stand_in):
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    latencies: dict[str, list[float]] = defaultdict(list)
+    for session in sessions:
+        for action, values in session.latencies.items():
+            latencies[action].extend(values)
+    fetches = len(latencies["fetch"])
+    errors = [error for session in sessions for error in session.errors]
+    return {
+        "users": users,
+        "actions_per_user": args.actions,
+        "elapsed_seconds": elapsed,
+        "reruns_per_second": sum(map(len, latencies.values())) / elapsed,
+        "latency": {
+            "all": _percentiles([value for values in latencies.values() for value in values]),
+            **{action: _percentiles(values) for action, values in sorted(latencies.items())},
+        },
+        "server": monitor.summary(),
+        "api": {
+            "calls": sum(calls.values()),
+            "calls_per_fetch": sum(calls.values()) / fetches if fetches else 0.0,
+            "by_endpoint": dict(sorted(calls.items(), key=lambda item: -item[1])),
+        },
+        "errors": len(errors),
+        "error_samples": sorted(set(errors))[:5],
+    }
+
+
+def _print_level(result: dict) -> None:
+    server = result["server"]
+    api = result["api"]
+    print(
+        f"users={result['users']} actions/user={result['actions_per_user']} "
+        f"elapsed={result['elapsed_seconds']:.1f}s reruns/s={result['reruns_per_second']:.2f}"
+    )
+    for action, stats in result["latency"].items():
+        if not stats["count"]:
+            continue
+        columns = "  ".join(f"p{p} {stats[f'p{p}_ms']:8.1f}" for p in PERCENTILES)
+        print(f"  {action:>6} n={stats['count']:<5} {columns}  max {stats['max_ms']:8.1f} ms")
+    print(
+        f"  server cpu {server['cpu_seconds']:.1f}s (mean {server['cpu_mean_percent']:.0f}%, "
+        f"peak {server['cpu_peak_percent']:.0f}%)  rss {server['rss_start_mb']:.0f} -> "
+        f"{server['rss_end_mb']:.0f} MB (peak {server['rss_peak_mb']:.0f} MB)"
+    )
+    print(f"  api calls {api['calls']} ({api['calls_per_fetch']:.2f} per fetch)  errors {result['errors']}")
+    for sample in result["error_samples"]:
+        print(f"    ! {sample}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Simulate concurrent users of app.py against a stand-in EPIAS.")
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--actions", type=int, default=10, help="dataset selections + fetches per user")
+    parser.add_argument("--think-ms", type=float, default=500, help="mean pause between a user's actions")
+    parser.add_argument("--ramp-up-seconds", type=float, default=5)
+    parser.add_argument("--date-spread-days", type=int, default=30, help="fetch windows end up to this many days ago")
+    parser.add_argument("--api-latency-ms", type=float, default=50)
+    parser.add_argument("--timeout", type=float, default=120, help="seconds a single rerun may take")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", type=Path, help="write the results here")
+    args = parser.parse_args()
+
+    results = []
+    for users in args.users:
+        results.append(run_level(args, users))
+        _print_level(results[-1])
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
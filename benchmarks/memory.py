@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock
+
+from bench_setup import uncached
+
+uncached()
+
+import pandas as pd  # noqa: E402
+
+import epias_client  # noqa: E402
+from epias_client import (  # noqa: E402
+    EpiasConfig,
+    _extract_items,
+    fetch_natural_gas_market_participants,
+    fetch_sgp_daily_reference_price,
+    fetch_sgp_transaction_history,
+)
+from epias_stand_in import start_stand_in  # noqa: E402
+from epias_transport import HttpTransport, set_transport  # noqa: E402
+from render_prep import csv_bytes, detect_axes, display_frame  # noqa: E402
+
+MB = 1024 * 1024
+END_DATE = date(2024, 6, 30)
+STAGES = ("raw bytes", "decoded JSON", "extract items", "frame build", "dtype conversion", "display copy", "csv export")
+# Dataset -> (fetcher, days requested at each size); None for endpoints without a date range.
+CASES = {
+    "SGP Daily Reference Price": (fetch_sgp_daily_reference_price, (31, 365, 1095)),
+    "SGP Transaction History": (fetch_sgp_transaction_history, (1, 7, 31, 92)),
+    "Natural Gas Market Participants": (fetch_natural_gas_market_participants, (None,)),
+}
+
+
+class _CapturingTransport:
+    # Remembers the request a fetcher sends, so the stages below can send exactly the same one.
+    def __init__(self, inner: HttpTransport) -> None:
+        self.inner = inner
+        self.requests: list[tuple] = []
+
+    def post(self, url, headers, timeout, json_body=None, form=None):
+        self.requests.append((url, headers, timeout, json_body))
+        return self.inner.post(url, headers, timeout, json_body=json_body, form=form)
+
+
+def profile(fetcher, kwargs: dict, transport: HttpTransport) -> dict:
+    capture = _CapturingTransport(transport)
+    set_transport(capture)
+    try:
+        # Also warms imports and the HTTP session outside the trace.
+        fetcher(**kwargs)
+    finally:
+        set_transport(transport)
+    url, headers, timeout, body = capture.requests[-1]
+    state: dict = {}
+    info: dict = {}
+
+    # The stages run the client's own code in the order _request_listing and the panel do, and
+    # drop each intermediate where the app's last reference to it goes away.
+    def raw_bytes() -> None:
+        state["content"] = transport.post(url, headers, timeout, json_body=body).content
+        info["payload_bytes"] = len(state["content"])
+
+    def decoded_json() -> None:
+        state["payload"] = json.loads(state["content"])
+
+    def extract_items() -> None:
+        state["items"] = _extract_items(state["payload"])
+
+    def frame_build() -> None:
+        state["frame"] = pd.DataFrame(state["items"])
+        # _request_listing returns here, releasing the response body, the JSON and the item list.
+        del state["content"], state["payload"], state["items"]
+
+    def dtype_conversion() -> None:
+        # The fetcher's own post-processing, fed the frame built above instead of a new request.
+        frames = [state.pop("frame")]
+        with mock.patch.object(epias_client, "_post_listing_endpoint", side_effect=lambda **_: frames.pop()):
+            state["data"] = fetcher(**kwargs)
+        info["rows"] = len(state["data"])
+
+    def display_copy() -> None:
+        _, y_col, _ = detect_axes(state["data"])
+        state["display"] = display_frame(state["data"], y_col)
+
+    def csv_export() -> None:
+        state["csv"] = csv_bytes(state["data"])
+
+    pipeline = (raw_bytes, decoded_json, extract_items, frame_build, dtype_conversion, display_copy, csv_export)
+    stages = []
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        for name, stage in zip(STAGES, pipeline):
+            gc.collect()
+            tracemalloc.reset_peak()
+            stage()
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+            stages.append({"stage": name, "peak_bytes": peak - start, "retained_bytes": current - start})
+    finally:
+        tracemalloc.stop()
+    return {**info, "stages": stages}
+
+
+def _print_case(dataset: str, days: int | None, result: dict) -> None:
+    size = f"{days} days" if days is not None else "full list"
+    print(f"{dataset}  {size}  {result['rows']:,} rows  payload {result['payload_bytes'] / MB:.2f} MB")
+    highest = max(result["stages"], key=lambda stage: stage["peak_bytes"])
+    for stage in result["stages"]:
+        marker = "  <- highest peak" if stage is highest else ""
+        print(
+            f"  {stage['stage']:>16}: peak {stage['peak_bytes'] / MB:8.2f} MB  "
+            f"retained {stage['retained_bytes'] / MB:8.2f} MB{marker}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Trace allocations per pipeline stage for each dataset and size.")
+    parser.add_argument("--datasets", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--days", type=int, nargs="+", help="sizes for date-range datasets (default: per dataset)")
+    parser.add_argument("--compact", action="store_true", help="fetch with EPIAS_COMPACT_FRAMES behaviour")
+    parser.add_argument("--downcast", action="store_true", help="also downcast numeric columns")
+    parser.add_argument("--json", type=Path, help="write the results here")
+    args = parser.parse_args()
+
+    stand_in, base_url = start_stand_in()
+    transport = HttpTransport()
+    config = EpiasConfig(base_url=base_url, tgt="bench", compact=args.compact, downcast_numeric=args.downcast)
+    results = []
+    try:
+        for dataset in args.datasets:
+            fetcher, sizes = CASES[dataset]
+            if args.days and sizes != (None,):
+                sizes = args.days
+            for days in sizes:
+                kwargs = {"config": config}
+                if days is not None:
+                    kwargs.update(start_date=END_DATE - timedelta(days=days - 1), end_date=END_DATE)
+                result = profile(fetcher, kwargs, transport)
+                _print_case(dataset, days, result)
+                results.append({"dataset": dataset, "days": days, **result})
+    finally:
+        set_transport(None)
+        stand_in.terminate()
+        stand_in.wait()
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from bench_setup import uncached
+
+uncached()
+
+from epias_client import EpiasConfig, fetch_sgp_transaction_history  # noqa: E402
+from epias_process import ProcessFetchPool  # noqa: E402
+from epias_transport import TransportResponse, set_transport  # noqa: E402
+
+START_DATE = date(2024, 1, 1)
+
+
+class SyntheticTransport:
+    def __init__(self, rows: int) -> None:
+        started = datetime(2024, 1, 1, 0, 0)
+        items = [
+            {
+                "date": (started + timedelta(minutes=index % 525_600)).strftime("%Y-%m-%dT%H:%M:00+03:00"),
+                "contractName": f"GG{index % 365:03d}",
+                "price": 1000 + (index % 997) / 10,
+                "quantity": index % 100 + 1,
+            }
+            for index in range(rows)
+        ]
+        self.content = json.dumps({"items": items}).encode("utf-8")
+
+    def post(self, url, headers, timeout, json_body=None, form=None) -> TransportResponse:
+        return TransportResponse(status_code=200, content=self.content)
+
+
+def install_transport(rows: int) -> None:
+    set_transport(SyntheticTransport(rows))
+
+
+def fetch_kwargs() -> dict:
+    return {
+        "config": EpiasConfig(base_url="http://synthetic", tgt="bench"),
+        "start_date": START_DATE,
+        "end_date": START_DATE,
+    }
+
+
+def _time(call, repeat: int) -> list[float]:
+    call()  # warm-up: worker start and payload generation are not part of the comparison
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        frame = call()
+        timings.append(time.perf_counter() - started)
+        del frame
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Thread vs process fetch post-processing on a synthetic payload.")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {}
+    install_transport(args.rows)
+    with ThreadPoolExecutor(max_workers=1) as threads:
+        results["thread"] = _time(
+            lambda: threads.submit(fetch_sgp_transaction_history, **fetch_kwargs()).result(), args.repeat
+        )
+    set_transport(None)
+
+    pool = ProcessFetchPool(max_workers=1, initializer=install_transport, initargs=(args.rows,))
+    try:
+        results["process_arrow"] = _time(lambda: pool.run(fetch_sgp_transaction_history, **fetch_kwargs()), args.repeat)
+    finally:
+        pool.shutdown()
+
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=install_transport,
+        initargs=(args.rows,),
+    ) as processes:
+        results["process_pickle"] = _time(
+            lambda: processes.submit(fetch_sgp_transaction_history, **fetch_kwargs()).result(), args.repeat
+        )
+
+    print(f"rows={args.rows:,} repeat={args.repeat} cpus={os.cpu_count()}")
+    for name, timings in results.items():
+        print(f"{name:>15}: median {statistics.median(timings):.3f}s  min {min(timings):.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+from bench_setup import uncached
+
+uncached()
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from epias_client import (  # noqa: E402
+    EpiasConfig,
+    fetch_natural_gas_market_participants,
+    fetch_sgp_daily_reference_price,
+    fetch_sgp_transaction_history,
+)
+from epias_stand_in import start_stand_in  # noqa: E402
+from epias_transport import HttpTransport, set_transport  # noqa: E402
+from render_prep import render_prep  # noqa: E402
+from tracing import tracer  # noqa: E402
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = Path(__file__).resolve().with_name("baseline.json")
+PHASES = ("fetch", "parse", "post_process", "render_prep", "total")
+PARSE_SPANS = ("json decode", "extract items", "build frame")
+END_DATE = date(2024, 6, 30)
+# Dataset -> (fetcher, days requested); None for endpoints without a date range.
+CASES = {
+    "SGP Daily Reference Price": (fetch_sgp_daily_reference_price, 365),
+    "SGP Transaction History": (fetch_sgp_transaction_history, 31),
+    "Natural Gas Market Participants": (fetch_natural_gas_market_participants, None),
+}
+# A phase regresses when its median grows by more than all of: the relative threshold, this many
+# standard errors of either run's median, and the absolute floor.
+NOISE_SIGMAS = 3.0
+
+
+def _environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def _measure(fetcher, kwargs: dict) -> dict[str, float]:
+    # Phases are read off the client's own tracing spans, so they split exactly where the app's traces do.
+    root = tracer.begin("benchmark", root=True)
+    started = time.perf_counter()
+    frame = fetcher(**kwargs)
+    fetched = time.perf_counter()
+    render_prep(frame)
+    finished = time.perf_counter()
+    spans = [span for span in root.trace.spans if span.duration_us is not None]
+    tracer.end(root)
+
+    seconds: dict[str, float] = defaultdict(float)
+    for span in spans:
+        seconds[span.name] += span.duration_us / 1e6
+    return {
+        "fetch": seconds["http post"],
+        "parse": sum(seconds[name] for name in PARSE_SPANS),
+        "post_process": seconds[fetcher.__name__] - seconds["listing"],
+        "render_prep": finished - fetched,
+        "total": finished - started,
+    }
+
+
+def _summary(samples: list[float]) -> dict:
+    median = statistics.median(samples)
+    mad = statistics.median(abs(value - median) for value in samples)
+    # 1.4826 * MAD estimates the standard deviation; 1.253 / sqrt(n) turns it into the median's standard error.
+    return {
+        "median": median,
+        "stderr": 1.4826 * mad * 1.253 / math.sqrt(len(samples)),
+        "min": min(samples),
+        "samples": samples,
+    }
+
+
+def run(base_url: str, datasets: list[str], repeat: int, warmup: int) -> dict[str, dict[str, dict]]:
+    config = EpiasConfig(base_url=base_url, tgt="bench")
+    calls = {}
+    for dataset in datasets:
+        fetcher, days = CASES[dataset]
+        kwargs = {"config": config}
+        if days is not None:
+            kwargs.update(start_date=END_DATE - timedelta(days=days - 1), end_date=END_DATE)
+        calls[dataset] = (fetcher, kwargs)
+
+    samples: dict[str, dict[str, list[float]]] = {dataset: defaultdict(list) for dataset in datasets}
+    for round_index in range(warmup + repeat):
+        # Datasets take turns within each round, so drift on the host spreads over all of them.
+        for dataset, (fetcher, kwargs) in calls.items():
+            gc.collect()
+            timings = _measure(fetcher, kwargs)
+            if round_index >= warmup:
+                for phase in PHASES:
+                    samples[dataset][phase].append(timings[phase])
+    return {
+        dataset: {phase: _summary(values) for phase, values in phases.items()} for dataset, phases in samples.items()
+    }
+
+
+def compare(baseline: dict, results: dict, threshold: float, min_delta: float) -> list[dict]:
+    rows = []
+    for dataset, phases in results.items():
+        for phase in PHASES:
+            current = phases[phase]
+            base = baseline["results"].get(dataset, {}).get(phase)
+            row = {"dataset": dataset, "phase": phase, "current": current["median"], "baseline": None}
+            if base is None:
+                rows.append({**row, "status": "new"})
+                continue
+            delta = current["median"] - base["median"]
+            allowed = max(
+                threshold * base["median"],
+                NOISE_SIGMAS * max(base["stderr"], current["stderr"]),
+                min_delta,
+            )
+            if delta > allowed:
+                status = "REGRESSION"
+            elif -delta > allowed:
+                status = "faster"
+            else:
+                status = "ok"
+            rows.append({**row, "baseline": base["median"], "allowed": allowed, "status": status})
+    return rows
+
+
+def _print_results(results: dict) -> None:
+    for dataset, phases in results.items():
+        print(dataset)
+        for phase in PHASES:
+            stats = phases[phase]
+            print(f"  {phase:>12}: median {stats['median'] * 1000:9.2f} ms  ±{stats['stderr'] * 1000:6.2f} ms")
+
+
+def _print_comparison(rows: list[dict]) -> None:
+    dataset = None
+    for row in rows:
+        if row["dataset"] != dataset:
+            dataset = row["dataset"]
+            print(dataset)
+        current = row["current"] * 1000
+        if row["baseline"] is None:
+            print(f"  {row['phase']:>12}: {current:9.2f} ms  (not in baseline)")
+            continue
+        baseline = row["baseline"] * 1000
+        change = (current - baseline) / baseline * 100 if baseline else 0.0
+        print(
+            f"  {row['phase']:>12}: {baseline:9.2f} -> {current:9.2f} ms  {change:+6.1f}% "
+            f"(allowed +{row['allowed'] * 1000:.2f} ms)  {row['status']}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time fetch, parse, post-processing and render prep per dataset.")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update", action="store_true", help="write this run as the new baseline")
+    parser.add_argument("--datasets", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative slowdown tolerated per phase")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="slowdowns below this are never flagged")
+    parser.add_argument("--json", type=Path, help="write this run and its comparison here")
+    args = parser.parse_args()
+
+    # Spans are recorded but no trace file is ever written.
+    tracer.sample_rate = 0.0
+    tracer.slow_seconds = math.inf
+    set_transport(HttpTransport())
+    stand_in, base_url = start_stand_in(cache_payloads=True)
+    try:
+        results = run(base_url, args.datasets, args.repeat, args.warmup)
+    finally:
+        set_transport(None)
+        stand_in.terminate()
+        stand_in.wait()
+
+    cases = {dataset: CASES[dataset][1] for dataset in args.datasets}
+    document = {
+        "version": BASELINE_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": _environment(),
+        "end_date": END_DATE.isoformat(),
+        "cases": cases,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    print(f"repeat={args.repeat} warmup={args.warmup} cpus={os.cpu_count()}")
+
+    rows: list[dict] = []
+    exit_code = 0
+    if args.update:
+        _print_results(results)
+        args.baseline.write_text(json.dumps(document, indent=2))
+        print(f"baseline written to {args.baseline}")
+    elif not args.baseline.exists():
+        _print_results(results)
+        print(f"no baseline at {args.baseline}; run with --update to record one")
+    else:
+        baseline = json.loads(args.baseline.read_text())
+        if baseline.get("version") != BASELINE_VERSION:
+            sys.exit(f"{args.baseline} is baseline version {baseline.get('version')}, expected {BASELINE_VERSION}")
+        changed = {dataset for dataset, days in cases.items() if baseline["cases"].get(dataset, days) != days}
+        if changed or baseline.get("end_date") != document["end_date"]:
+            differing = ", ".join(sorted(changed)) or "end date"
+            sys.exit(f"workload differs from the baseline ({differing}); re-run with --update")
+        if baseline.get("environment") != document["environment"]:
+            print(f"warning: baseline recorded on {baseline.get('environment')}, this run on {document['environment']}")
+        rows = compare(baseline, results, args.threshold, args.min_delta_ms / 1000)
+        _print_comparison(rows)
+        regressions = [row for row in rows if row["status"] == "REGRESSION"]
+        if regressions:
+            names = ", ".join(f"{row['dataset']}/{row['phase']}" for row in regressions)
+            print(f"{len(regressions)} regression(s): {names}")
+            exit_code = 1
+        else:
+            print("no regressions")
+
+    if args.json:
+        args.json.write_text(json.dumps({**document, "comparison": rows}, indent=2))
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
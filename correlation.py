@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, replace
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from epias_coverage import DAY_COLUMNS
+from participants import payload_digest
+
+DEFAULT_MAX_LAG = 7
+MIN_OVERLAP = 10
+
+
+@dataclass(frozen=True)
+class CorrelationResult:
+    panel: pd.DataFrame
+    lags: np.ndarray
+    # lagged[l, i, j] = corr(series_i(t), series_j(t + lags[l])); the lag-0 slice is the plain correlation.
+    lagged: np.ndarray
+    # Datasets that contributed no varying daily numeric series, so the panel leaves them out.
+    skipped: tuple[str, ...] = ()
+
+    @property
+    def columns(self) -> list[str]:
+        return list(self.panel.columns)
+
+    @property
+    def correlation(self) -> pd.DataFrame:
+        zero = int(np.flatnonzero(self.lags == 0)[0])
+        return pd.DataFrame(self.lagged[zero], index=self.columns, columns=self.columns)
+
+    def lead_lag(self) -> pd.DataFrame:
+        if not self.columns:
+            return pd.DataFrame(columns=["leader", "follower", "lagDays", "correlation", "sameDayCorrelation"])
+        strength = np.where(np.isnan(self.lagged), -np.inf, np.abs(self.lagged))
+        best = strength.argmax(axis=0)
+        best_corr = np.take_along_axis(self.lagged, best[None], axis=0)[0]
+        same_day = self.correlation.to_numpy()
+        rows = []
+        for i, leader in enumerate(self.columns):
+            for j, follower in enumerate(self.columns):
+                lag = int(self.lags[best[i, j]])
+                # Each pair appears twice with mirrored lags; keep the orientation where i leads.
+                if i == j or lag <= 0 or np.isnan(best_corr[i, j]):
+                    continue
+                rows.append((leader, follower, lag, best_corr[i, j], same_day[i, j]))
+        frame = pd.DataFrame(rows, columns=["leader", "follower", "lagDays", "correlation", "sameDayCorrelation"])
+        return frame.reindex(frame["correlation"].abs().sort_values(ascending=False).index).reset_index(drop=True)
+
+
+def daily_numeric_series(frame: pd.DataFrame, name: str, time_column: str | None = None) -> pd.DataFrame:
+    time_column = time_column or next((c for c in DAY_COLUMNS if c in frame.columns), None)
+    if frame.empty or time_column is None:
+        return pd.DataFrame()
+    numeric = [
+        column
+        for column in frame.columns
+        if column != time_column
+        and pd.api.types.is_numeric_dtype(frame[column])
+        and not pd.api.types.is_bool_dtype(frame[column])
+    ]
+    if not numeric:
+        return pd.DataFrame()
+    days = pd.to_datetime(frame[time_column], errors="coerce").dt.normalize()
+    if days.dt.tz is not None:
+        days = days.dt.tz_localize(None)
+    # Several rows per gas day (points, contracts, hours) collapse to the daily mean.
+    daily = frame[numeric].astype(float).groupby(days.rename("gasDay")).mean()
+    daily.columns = [f"{name}: {column}" for column in numeric]
+    return daily
+
+
+def align_daily(series: list[pd.DataFrame], start_date: date, end_date: date) -> pd.DataFrame:
+    index = pd.date_range(start_date, end_date, freq="D", name="gasDay")
+    parts = [part.reindex(index) for part in series if not part.empty]
+    if not parts:
+        return pd.DataFrame(index=index)
+    panel = pd.concat(parts, axis=1)
+    # Constant or empty columns have no defined correlation.
+    return panel.loc[:, panel.std(skipna=True).fillna(0) > 0]
+
+
+def _shifted(values: np.ndarray, lags: np.ndarray) -> np.ndarray:
+    # (lags, T, k) view where slice l holds values[t + lags[l]], zero-padded outside the range.
+    max_lag = int(np.abs(lags).max()) if len(lags) else 0
+    padded = np.pad(values, ((max_lag, max_lag), (0, 0)))
+    windows = np.lib.stride_tricks.sliding_window_view(padded, len(values), axis=0)
+    return windows.transpose(0, 2, 1)[lags + max_lag]
+
+
+def lagged_correlation(
+    left: np.ndarray,
+    right: np.ndarray,
+    lags: np.ndarray,
+    min_overlap: int = MIN_OVERLAP,
+) -> np.ndarray:
+    # Pairwise-complete Pearson correlation for every (lag, left column, right column) at once,
+    # built from masked sums so missing days drop out per pair exactly as in DataFrame.corr().
+    left_mask = ~np.isnan(left)
+    right_mask = ~np.isnan(right)
+    a = np.where(left_mask, left, 0.0)
+    b = np.where(right_mask, right, 0.0)
+    ma = left_mask.astype(float)
+    mb = _shifted(right_mask.astype(float), lags)
+    b = _shifted(b, lags)
+
+    n = ma.T @ mb
+    sum_a = a.T @ mb
+    sum_b = ma.T @ b
+    sum_aa = (a * a).T @ mb
+    sum_bb = ma.T @ (b * b)
+    sum_ab = a.T @ b
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        covariance = n * sum_ab - sum_a * sum_b
+        variance = (n * sum_aa - sum_a * sum_a) * (n * sum_bb - sum_b * sum_b)
+        result = covariance / np.sqrt(variance)
+    result[(n < min_overlap) | ~(variance > 0)] = np.nan
+    return np.clip(result, -1.0, 1.0)
+
+
+def compute_correlations(panel: pd.DataFrame, max_lag: int = DEFAULT_MAX_LAG) -> CorrelationResult:
+    lags = np.arange(-max_lag, max_lag + 1)
+    values = panel.to_numpy(dtype=float)
+    return CorrelationResult(panel=panel, lags=lags, lagged=lagged_correlation(values, values, lags))
+
+
+class CorrelationCache:
+    # One entry per (date range, max lag). When a single dataset changes, only the rows and
+    # columns of its series are recomputed; the rest of the lagged matrices are reused.
+    def __init__(self) -> None:
+        self._entries: dict[tuple, tuple[dict[str, str], dict[str, pd.DataFrame], CorrelationResult]] = {}
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        frames: dict[str, pd.DataFrame],
+        start_date: date,
+        end_date: date,
+        max_lag: int = DEFAULT_MAX_LAG,
+    ) -> CorrelationResult:
+        key = (start_date, end_date, max_lag)
+        digests = {name: payload_digest(frame) for name, frame in frames.items()}
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] == digests:
+            return cached[2]
+
+        previous_digests, previous_series = (cached[0], cached[1]) if cached is not None else ({}, {})
+        series = {
+            name: previous_series[name]
+            if previous_digests.get(name) == digests[name]
+            else daily_numeric_series(frame, name)
+            for name, frame in frames.items()
+        }
+        panel = align_daily(list(series.values()), start_date, end_date)
+
+        if cached is None or list(cached[2].panel.columns) != list(panel.columns):
+            result = compute_correlations(panel, max_lag)
+        else:
+            previous = cached[2]
+            changed = [name for name, digest in digests.items() if previous_digests.get(name) != digest]
+            columns = [column for name in changed for column in series[name].columns if column in panel.columns]
+            positions = [panel.columns.get_loc(column) for column in columns]
+            lagged = previous.lagged.copy()
+            if positions:
+                values = panel.to_numpy(dtype=float)
+                rows = lagged_correlation(values[:, positions], values, previous.lags)
+                lagged[:, positions, :] = rows
+                # corr(x_j(t), x_c(t + lag)) == corr(x_c(t), x_j(t - lag)): columns are the mirrored rows.
+                lagged[:, :, positions] = rows[::-1].transpose(0, 2, 1)
+            result = CorrelationResult(panel=panel, lags=previous.lags, lagged=lagged)
+        skipped = tuple(name for name in frames if not any(column in panel.columns for column in series[name].columns))
+        result = replace(result, skipped=skipped)
+
+        with self._lock:
+            self._entries[key] = (digests, series, result)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
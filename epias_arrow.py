@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+import pandas as pd
+import pyarrow as pa
+
+
+def to_arrow_or_none(frame: pd.DataFrame) -> pa.Table | None:
+    # Mixed-type object columns have no Arrow type; callers fall back to keeping the pandas frame.
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return None
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import atexit
+import contextvars
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, TypeVar
+
+import pandas as pd
+
+from epias_metrics import CACHE_REQUESTS
+from epias_scheduler import PREFETCH, request_priority
+from epias_sqlite_cache import DEFAULT_CACHE_DB, SqliteCache
+from epias_snapshot import DEFAULT_SNAPSHOT_DIR, DEFAULT_SNAPSHOT_INTERVAL_SECONDS, CacheSnapshot
+from tracing import tracer
+
+DEFAULT_TTL_SECONDS = float(os.getenv("EPIAS_CACHE_TTL_SECONDS", "300"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("EPIAS_CACHE_MAX_ENTRIES", "256"))
+DEFAULT_STALE_RETENTION_SECONDS = float(os.getenv("EPIAS_STALE_RETENTION_SECONDS", "86400"))
+# A failed background refresh is not retried for this long, so an outage is not hammered on every rerun.
+REVALIDATE_RETRY_SECONDS = 30.0
+# Frames handed out by the cache carry the time their response was fetched.
+STORED_AT_ATTR = "epias_stored_at"
+STALE_READS_ATTR = "epias_stale_reads"
+SHARED_SCOPE = "shared"
+CREDENTIAL_SCOPE = "credential"
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    value: pd.DataFrame
+    stored_at: float
+    expires_at: float
+
+
+def make_cache_key(url: str, body: dict[str, Any], scope: str = SHARED_SCOPE) -> str:
+    canonical = json.dumps({"url": url, "body": body, "scope": scope}, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def credential_scope(tgt: str) -> str:
+    return "tgt:" + hashlib.sha256(tgt.strip().encode("utf-8")).hexdigest()[:16]
+
+
+T = TypeVar("T")
+_stale_reads: contextvars.ContextVar[list[float] | None] = contextvars.ContextVar("epias_stale_reads", default=None)
+
+
+@contextmanager
+def track_stale_reads() -> Iterator[list[float]]:
+    # Collects the fetch time of every stale response served while the block runs.
+    reads: list[float] = []
+    token = _stale_reads.set(reads)
+    try:
+        yield reads
+    finally:
+        _stale_reads.reset(token)
+
+
+def record_stale_read(stored_at: float) -> None:
+    reads = _stale_reads.get()
+    if reads is not None:
+        reads.append(stored_at)
+
+
+def carry_context(function: Callable[..., T]) -> Callable[..., T]:
+    # Pool threads start with an empty context; this runs them in a copy of the caller's, so the
+    # stale-read tracker and the request priority follow the work.
+    context = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        return context.copy().run(function, *args, **kwargs)
+
+    return run
+
+
+def attach_stale_reads(frame: pd.DataFrame, reads: list[float]) -> pd.DataFrame:
+    # For results that cross a process or a cache boundary, where the tracker cannot follow.
+    if reads:
+        frame.attrs[STALE_READS_ATTR] = list(reads)
+    return frame
+
+
+def replay_stale_reads(frame: pd.DataFrame) -> pd.DataFrame:
+    for stored_at in frame.attrs.pop(STALE_READS_ATTR, ()):
+        record_stale_read(stored_at)
+    return frame
+
+
+class ResponseCache:
+    # Shared by every Streamlit session in the process. Concurrent misses for the same key
+    # wait on the first caller's request instead of issuing their own. Expired entries are kept
+    # for stale_retention_seconds so callers with a staleness budget can still be answered.
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        name: str = "response",
+        snapshot: CacheSnapshot | None = None,
+        snapshot_interval_seconds: float = DEFAULT_SNAPSHOT_INTERVAL_SECONDS,
+        shared: SqliteCache | None = None,
+        stale_retention_seconds: float = DEFAULT_STALE_RETENTION_SECONDS,
+    ) -> None:
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.snapshot = snapshot
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self.shared = shared
+        self.stale_retention_seconds = stale_retention_seconds
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._inflight: dict[str, Future] = {}
+        self._refresh_failed_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._snapshot_thread: threading.Thread | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        entry = self._memory_entry(key, 0.0)
+        return _copy(entry) if entry is not None else None
+
+    def put(self, key: str, value: pd.DataFrame) -> None:
+        now = time.time()
+        self._insert(key, CacheEntry(value=value, stored_at=now, expires_at=now + self.ttl_seconds))
+        self._start_snapshots()
+
+    def _memory_entry(self, key: str, max_stale_seconds: float) -> CacheEntry | None:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at + self.stale_retention_seconds <= now:
+                del self._entries[key]
+                return None
+            if entry.expires_at + min(max_stale_seconds, self.stale_retention_seconds) <= now:
+                return None
+            self._entries.move_to_end(key)
+        return entry
+
+    def _lookup(self, key: str, max_stale_seconds: float) -> tuple[CacheEntry | None, str]:
+        entry = self._memory_entry(key, max_stale_seconds)
+        if entry is not None and entry.expires_at > time.time():
+            return entry, "hit"
+        restored = self.snapshot.load(key) if self.snapshot is not None else None
+        if restored is not None:
+            # Restored entries keep their original expiry; a snapshot never extends freshness.
+            value, stored_at, expires_at = restored
+            entry = CacheEntry(value=value, stored_at=stored_at, expires_at=expires_at)
+            self._insert(key, entry)
+            return entry, "snapshot"
+        if self.shared is not None:
+            # Another process may hold a fresher copy than our stale one.
+            found = self.shared.get(key, min(max_stale_seconds, self.stale_retention_seconds))
+            if found is not None and (entry is None or found[2] > entry.expires_at):
+                value, stored_at, expires_at = found
+                entry = CacheEntry(value=value, stored_at=stored_at, expires_at=expires_at)
+                self._insert(key, entry)
+                return entry, "shared"
+        return entry, "hit"
+
+    def _load(self, key: str, loader: Callable[[], pd.DataFrame]) -> CacheEntry:
+        value = loader()
+        now = time.time()
+        entry = CacheEntry(value=value, stored_at=now, expires_at=now + self.ttl_seconds)
+        self._insert(key, entry)
+        self._start_snapshots()
+        if self.shared is not None:
+            self.shared.put(key, value, entry.stored_at, entry.expires_at)
+        return entry
+
+    def _insert(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def save_snapshot(self) -> int:
+        if self.snapshot is None or not self.enabled:
+            return 0
+        with self._lock:
+            entries = [(key, entry.value, entry.stored_at, entry.expires_at) for key, entry in self._entries.items()]
+        # Processes that never cached anything, such as fetch workers, leave the snapshot alone.
+        return self.snapshot.write(entries) if entries else 0
+
+    def _start_snapshots(self) -> None:
+        if self.snapshot is None or self.snapshot_interval_seconds <= 0 or self._snapshot_thread is not None:
+            return
+        with self._lock:
+            if self._snapshot_thread is not None:
+                return
+            self._snapshot_thread = threading.Thread(target=self._snapshot_loop, name="epias-snapshot", daemon=True)
+        self._snapshot_thread.start()
+
+    def _snapshot_loop(self) -> None:
+        while True:
+            time.sleep(self.snapshot_interval_seconds)
+            self.save_snapshot()
+
+    def _revalidate(self, key: str, loader: Callable[[], pd.DataFrame]) -> None:
+        with self._lock:
+            if key in self._inflight or time.time() - self._refresh_failed_at.get(key, 0.0) < REVALIDATE_RETRY_SECONDS:
+                return
+            future = Future()
+            self._inflight[key] = future
+        threading.Thread(
+            target=self._refresh, args=(key, loader, future), name="epias-revalidate", daemon=True
+        ).start()
+
+    def _refresh(self, key: str, loader: Callable[[], pd.DataFrame], future: Future) -> None:
+        try:
+            # Refreshes queue behind interactive fetches.
+            with request_priority(PREFETCH):
+                entry = self._load(key, loader)
+        except Exception as exc:
+            with self._lock:
+                self._refresh_failed_at[key] = time.time()
+            future.set_exception(exc)
+        else:
+            with self._lock:
+                self._refresh_failed_at.pop(key, None)
+            future.set_result(entry)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], pd.DataFrame],
+        max_stale_seconds: float = 0.0,
+    ) -> pd.DataFrame:
+        if not self.enabled:
+            return loader()
+        with tracer.span("cache lookup", cache=self.name) as span:
+            entry, source = self._lookup(key, max_stale_seconds)
+            span.set(result=source if entry is not None else "miss")
+        if entry is not None:
+            if entry.expires_at > time.time():
+                CACHE_REQUESTS.inc(cache=self.name, result=source)
+            else:
+                # Within the caller's staleness budget: answer now and refresh behind its back.
+                CACHE_REQUESTS.inc(cache=self.name, result="stale")
+                record_stale_read(entry.stored_at)
+                self._revalidate(key, loader)
+            return _copy(entry)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        CACHE_REQUESTS.inc(cache=self.name, result="miss" if leader else "coalesced")
+        if not leader:
+            return _copy(future.result())
+
+        try:
+            entry = self._load(key, loader)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(entry)
+            return _copy(entry)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _copy(entry: CacheEntry) -> pd.DataFrame:
+    # Callers mutate the frames they get back, so every caller receives its own copy.
+    value = entry.value.copy()
+    value.attrs[STORED_AT_ATTR] = entry.stored_at
+    return value
+
+
+response_cache = ResponseCache(
+    snapshot=CacheSnapshot(DEFAULT_SNAPSHOT_DIR) if DEFAULT_SNAPSHOT_DIR else None,
+    shared=SqliteCache(DEFAULT_CACHE_DB, DEFAULT_STALE_RETENTION_SECONDS) if DEFAULT_CACHE_DB else None,
+)
+# Covers a normal shutdown; the periodic snapshot covers everything else.
+atexit.register(response_cache.save_snapshot)
@@ -1,23 +1,94 @@
 from __future__ import annotations
 
+import calendar
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
-from typing import Any
+from typing import Any, Callable
 
+import numpy as np
 import pandas as pd
 import requests
 
+from epias_cache import (
+    CREDENTIAL_SCOPE,
+    SHARED_SCOPE,
+    attach_stale_reads,
+    carry_context,
+    credential_scope,
+    make_cache_key,
+    replay_stale_reads,
+    response_cache,
+    track_stale_reads,
+)
+from epias_coverage import coverage_index
+from epias_metrics import REQUEST_DURATION, REQUEST_ERRORS, RESPONSE_BYTES, RESPONSE_ROWS, TGT_DURATION
+from epias_process import get_process_pool, in_worker
+from epias_scheduler import current_priority, request_priority, request_scheduler
+from epias_transport import get_transport, uses_cassettes
+from tracing import tracer
+
 
 @dataclass(frozen=True)
 class EpiasConfig:
     base_url: str
     tgt: str
+    # "shared" caches responses for every session on the same base URL;
+    # "credential" keeps them separate per TGT.
+    cache_scope: str = SHARED_SCOPE
+    # Compact frames keep gas days as datetime64 and repetitive strings as categoricals;
+    # downcast_numeric additionally stores floats as float32 and integers as nullable Int32.
+    compact: bool = False
+    downcast_numeric: bool = False
+    # Runs each fetch (request, JSON parsing and post-processing) in a worker process and hands
+    # the frame back as a memory-mapped Arrow file instead of a pickle.
+    process_pool: bool = False
+    # Seconds past the cache TTL a response may still be served while it is refreshed in the background.
+    max_stale_seconds: float = 0.0
+    # False sends every request to EPIAS and keeps nothing in the response cache or coverage index,
+    # for bulk reads such as month-end exports that would otherwise fill the caches.
+    use_cache: bool = True
 
 
 class EpiasClientError(RuntimeError):
     pass
 
 
+PERIOD_RANGE_MAX_WORKERS = 6
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+NULLABLE_INT_DTYPES = ("Int32", "Int64")
+# Transaction-history fields holding the time of each trade rather than its gas day.
+TRADE_TIME_COLUMNS = ("transactionDate", "date")
+# Listing endpoints whose rows each belong to one gas day (or a trade timestamp within it). Only
+# these are planned by sub-range; weekly, period and snapshot endpoints are always requested whole.
+GAS_DAY_ENDPOINTS = frozenset(
+    {
+        "/v1/markets/sgp/data/total-trade-volume",
+        "/v1/markets/sgp/data/daily-reference-price",
+        "/v1/markets/sgp/data/sgp-price",
+        "/v1/markets/sgp/data/balancing-gas-price",
+        "/v1/markets/sgp/data/daily-matched-quantity",
+        "/v1/markets/sgp/data/daily-trade-volume",
+        "/v1/markets/sgp/data/physical-realization",
+        "/v1/markets/sgp/data/virtual-realization",
+        "/v1/markets/sgp/data/system-direction",
+        "/v1/markets/sgp/data/imbalance-system",
+        "/v1/markets/sgp/data/transaction-history",
+        "/v1/markets/vgp/data/ggf",
+        "/v1/markets/vgp/data/vgp-volume",
+        "/v1/markets/vgp/data/vgp-transaction-history",
+        "/v1/transmission/data/entry-nomination",
+        "/v1/transmission/data/exit-nomination",
+        "/v1/transmission/data/realization-entry-amount",
+        "/v1/transmission/data/realization-exit-amount",
+        "/v1/transmission/data/stock-amount",
+        "/v1/transmission/data/daily-actualization-amount",
+    }
+)
+
+
 def fetch_tgt_token(
     username: str,
     password: str,
@@ -30,12 +101,18 @@ def fetch_tgt_token(
     }
     body = {"username": username, "password": password}
 
+    started = time.perf_counter()
     try:
-        response = requests.post(cas_url, headers=headers, data=body, timeout=timeout_seconds)
+        with tracer.span("cas tgt"):
+            response = get_transport().post(cas_url, headers=headers, timeout=timeout_seconds, form=body)
     except requests.RequestException as exc:
+        REQUEST_ERRORS.inc(endpoint="cas", status="network")
         raise EpiasClientError(f"Network error while fetching TGT: {exc}") from exc
+    finally:
+        TGT_DURATION.observe(time.perf_counter() - started)
 
     if response.status_code >= 400:
+        REQUEST_ERRORS.inc(endpoint="cas", status=str(response.status_code))
         raise EpiasClientError(
             f"TGT service returned HTTP {response.status_code}: {response.text[:500]}"
         )
@@ -46,10 +123,92 @@ def fetch_tgt_token(
     return token
 
 
+def _offloadable(fetcher: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    @functools.wraps(fetcher)
+    def run(*args: Any, **kwargs: Any) -> pd.DataFrame:
+        config = kwargs["config"] if "config" in kwargs else args[0]
+        if config.process_pool and not in_worker():
+            with tracer.span(fetcher.__name__, process_pool=True):
+                frame = get_process_pool().run(_run_at_priority, current_priority(), run, *args, **kwargs)
+            return replay_stale_reads(frame)
+        if in_worker():
+            # The caller's stale-read tracker lives in the parent process; the reads ride back on the frame.
+            with track_stale_reads() as reads:
+                frame = fetcher(*args, **kwargs)
+            return attach_stale_reads(frame, reads)
+        # Time in this span outside its listing children is the fetcher's own post-processing.
+        with tracer.span(fetcher.__name__) as span:
+            frame = fetcher(*args, **kwargs)
+            span.set(rows=len(frame))
+        return frame
+
+    return run
+
+
+def _run_at_priority(priority: str, function: Callable[..., pd.DataFrame], *args: Any, **kwargs: Any) -> pd.DataFrame:
+    # Worker processes have their own scheduler; the caller's priority class travels with the call.
+    with request_priority(priority):
+        return function(*args, **kwargs)
+
+
 def _to_epias_datetime(value: date) -> str:
     return f"{value.isoformat()}T00:00:00+03:00"
 
 
+def _as_local_time(parsed: pd.Series) -> pd.Series:
+    if parsed.dt.tz is not None:
+        # Keep the Turkish wall-clock time rather than shifting to UTC.
+        return parsed.dt.tz_localize(None)
+    return parsed
+
+
+def _as_gas_day(parsed: pd.Series, config: EpiasConfig) -> pd.Series:
+    if not config.compact:
+        return parsed.dt.date
+    return _as_local_time(parsed)
+
+
+def _downcast_numeric(series: pd.Series) -> pd.Series:
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    if pd.api.types.is_float_dtype(series):
+        return series.astype("float32")
+    if pd.api.types.is_integer_dtype(series):
+        non_null = series.dropna()
+        for dtype in NULLABLE_INT_DTYPES:
+            info = np.iinfo(dtype.lower())
+            if non_null.empty or (non_null.min() >= info.min and non_null.max() <= info.max):
+                return series.astype(dtype)
+    return series
+
+
+def _compact_frame(frame: pd.DataFrame, config: EpiasConfig) -> pd.DataFrame:
+    if not config.compact or frame.empty:
+        return frame
+    with tracer.span("compact frame", columns=len(frame.columns)):
+        for column in frame.columns:
+            series = frame[column]
+            if series.dtype == object:
+                non_null = series.dropna()
+                if non_null.empty or not non_null.map(type).eq(str).all():
+                    continue
+                if series.nunique() <= CATEGORY_MAX_UNIQUE_RATIO * len(series):
+                    frame[column] = series.astype("category")
+            elif config.downcast_numeric and pd.api.types.is_numeric_dtype(series):
+                frame[column] = _downcast_numeric(series)
+    return frame
+
+
+def _month_starts(start_period: date, end_period: date) -> list[date]:
+    months = []
+    current = date(start_period.year, start_period.month, 1)
+    last = date(end_period.year, end_period.month, 1)
+    while current <= last:
+        months.append(current)
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+    return months
+
+
 def _extract_items(payload: Any) -> list[dict[str, Any]]:
     if isinstance(payload, list):
         return [item for item in payload if isinstance(item, dict)]
@@ -71,6 +230,11 @@ def _extract_items(payload: Any) -> list[dict[str, Any]]:
     return []
 
 
+def request_scope(config: EpiasConfig) -> str:
+    # Under the credential scope, cached responses and background jobs are kept apart per TGT.
+    return credential_scope(config.tgt) if config.cache_scope == CREDENTIAL_SCOPE else SHARED_SCOPE
+
+
 def _post_listing_endpoint(
     config: EpiasConfig,
     endpoint_path: str,
@@ -81,39 +245,82 @@ def _post_listing_endpoint(
     timeout_seconds: int = 30,
 ) -> pd.DataFrame:
     url = f"{config.base_url.rstrip('/')}/{endpoint_path.lstrip('/')}"
+    scope = request_scope(config)
+
+    def load(range_start: date, range_end: date) -> pd.DataFrame:
+        body: dict[str, Any] = {}
+        if include_date_range:
+            body["startDate"] = _to_epias_datetime(range_start)
+            body["endDate"] = _to_epias_datetime(range_end)
+        if extra_body:
+            body.update(extra_body)
+        with tracer.span("listing", endpoint=endpoint_path, start=range_start, end=range_end):
+            if not config.use_cache:
+                return _request_listing(url, endpoint_path, body, config.tgt, timeout_seconds)
+            return response_cache.get_or_load(
+                make_cache_key(url, body, scope),
+                lambda: _request_listing(url, endpoint_path, body, config.tgt, timeout_seconds),
+                max_stale_seconds=config.max_stale_seconds,
+            )
+
+    plannable = include_date_range and endpoint_path in GAS_DAY_ENDPOINTS and not uses_cassettes()
+    if not plannable or not config.use_cache or not coverage_index.enabled:
+        return load(start_date, end_date)
+    # Days already held for this endpoint are reused; only the uncovered sub-ranges are requested.
+    return coverage_index.load(
+        make_cache_key(url, extra_body or {}, scope), start_date, end_date, load, config.max_stale_seconds
+    )
+
+
+def _request_listing(
+    url: str,
+    endpoint_path: str,
+    body: dict[str, Any],
+    tgt: str,
+    timeout_seconds: int,
+) -> pd.DataFrame:
     headers = {
         "Accept": "application/json",
         "Content-Type": "application/json",
-        "TGT": config.tgt.strip(),
+        "TGT": tgt.strip(),
     }
-    body: dict[str, Any] = {}
-    if include_date_range:
-        body["startDate"] = _to_epias_datetime(start_date)
-        body["endDate"] = _to_epias_datetime(end_date)
-    if extra_body:
-        body.update(extra_body)
 
-    try:
-        response = requests.post(url, json=body, headers=headers, timeout=timeout_seconds)
-    except requests.RequestException as exc:
-        raise EpiasClientError(f"Network error while calling EPIAS API: {exc}") from exc
+    with request_scheduler.slot(), tracer.span("http post", endpoint=endpoint_path) as span:
+        started = time.perf_counter()
+        try:
+            response = get_transport().post(url, headers=headers, timeout=timeout_seconds, json_body=body)
+        except requests.RequestException as exc:
+            REQUEST_ERRORS.inc(endpoint=endpoint_path, status="network")
+            raise EpiasClientError(f"Network error while calling EPIAS API: {exc}") from exc
+        finally:
+            REQUEST_DURATION.observe(time.perf_counter() - started, endpoint=endpoint_path)
+        span.set(status=response.status_code, bytes=len(response.content))
+    RESPONSE_BYTES.observe(len(response.content), endpoint=endpoint_path)
 
     if response.status_code >= 400:
+        REQUEST_ERRORS.inc(endpoint=endpoint_path, status=str(response.status_code))
         raise EpiasClientError(
             f"EPIAS API returned HTTP {response.status_code}: {response.text[:500]}"
         )
 
     try:
-        response_json = response.json()
+        with tracer.span("json decode"):
+            response_json = response.json()
     except ValueError as exc:
+        REQUEST_ERRORS.inc(endpoint=endpoint_path, status="invalid_json")
         raise EpiasClientError("EPIAS response is not valid JSON.") from exc
 
-    items = _extract_items(response_json)
+    with tracer.span("extract items") as span:
+        items = _extract_items(response_json)
+        span.set(items=len(items))
+    RESPONSE_ROWS.observe(len(items), endpoint=endpoint_path)
     if not items:
         return pd.DataFrame()
-    return pd.DataFrame(items)
+    with tracer.span("build frame"):
+        return pd.DataFrame(items)
 
 
+@_offloadable
 def fetch_sgp_total_trade_volume(
     config: EpiasConfig,
     start_date: date,
@@ -136,12 +343,13 @@ def fetch_sgp_total_trade_volume(
         )
 
     frame = frame[["gasDay", "tradeVolume"]].copy()
-    frame["gasDay"] = pd.to_datetime(frame["gasDay"], errors="coerce").dt.date
+    frame["gasDay"] = _as_gas_day(pd.to_datetime(frame["gasDay"], errors="coerce"), config)
     frame["tradeVolume"] = pd.to_numeric(frame["tradeVolume"], errors="coerce")
     frame = frame.dropna(subset=["gasDay"]).sort_values("gasDay").reset_index(drop=True)
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_daily_reference_price(
     config: EpiasConfig,
     start_date: date,
@@ -161,16 +369,17 @@ def fetch_sgp_daily_reference_price(
     # Try common date field names in EPIAS responses.
     for candidate in ("gasDay", "date", "day"):
         if candidate in frame.columns:
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_price(
     config: EpiasConfig,
     start_date: date,
@@ -189,16 +398,17 @@ def fetch_sgp_price(
 
     for candidate in ("gasDay", "date", "day"):
         if candidate in frame.columns:
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_balancing_gas_price(
     config: EpiasConfig,
     start_date: date,
@@ -217,16 +427,17 @@ def fetch_sgp_balancing_gas_price(
 
     for candidate in ("gasDay", "date", "day"):
         if candidate in frame.columns:
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_weekly_ref_price(
     config: EpiasConfig,
     start_date: date,
@@ -247,16 +458,17 @@ def fetch_sgp_weekly_ref_price(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
                 frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_match_quantity(
     config: EpiasConfig,
     start_date: date,
@@ -275,16 +487,17 @@ def fetch_sgp_match_quantity(
 
     for candidate in ("gasDay", "date", "day"):
         if candidate in frame.columns:
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_grf_match_quantity(
     config: EpiasConfig,
     start_date: date,
@@ -303,16 +516,17 @@ def fetch_sgp_grf_match_quantity(
 
     for candidate in ("gasDay", "date", "day"):
         if candidate in frame.columns:
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_daily_matched_quantity(
     config: EpiasConfig,
     start_date: date,
@@ -331,16 +545,17 @@ def fetch_sgp_daily_matched_quantity(
 
     for candidate in ("gasDay", "date", "day", "contract"):
         if candidate in frame.columns and candidate != "contract":
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_daily_trade_volume(
     config: EpiasConfig,
     start_date: date,
@@ -359,16 +574,17 @@ def fetch_sgp_daily_trade_volume(
 
     for candidate in ("gasDay", "date", "day", "contract"):
         if candidate in frame.columns and candidate != "contract":
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_grf_trade_volume(
     config: EpiasConfig,
     start_date: date,
@@ -387,16 +603,17 @@ def fetch_sgp_grf_trade_volume(
 
     for candidate in ("gasDay", "date", "day"):
         if candidate in frame.columns:
-            frame[candidate] = pd.to_datetime(frame[candidate], errors="coerce").dt.date
+            frame[candidate] = _as_gas_day(pd.to_datetime(frame[candidate], errors="coerce"), config)
             frame = frame.dropna(subset=[candidate]).sort_values(candidate).reset_index(drop=True)
             break
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_green_code_operation(
     config: EpiasConfig,
     start_date: date,
@@ -417,14 +634,15 @@ def fetch_sgp_green_code_operation(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_additional_notifications(
     config: EpiasConfig,
     start_date: date,
@@ -445,11 +663,12 @@ def fetch_sgp_additional_notifications(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_physical_realization(
     config: EpiasConfig,
     start_date: date,
@@ -470,14 +689,15 @@ def fetch_sgp_physical_realization(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_virtual_realization(
     config: EpiasConfig,
     start_date: date,
@@ -500,14 +720,15 @@ def fetch_sgp_virtual_realization(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_system_direction(
     config: EpiasConfig,
     start_date: date,
@@ -530,14 +751,15 @@ def fetch_sgp_system_direction(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_imbalance_system(
     config: EpiasConfig,
     start_date: date,
@@ -558,14 +780,15 @@ def fetch_sgp_imbalance_system(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_imbalance_amount(
     config: EpiasConfig,
     start_date: date,
@@ -590,14 +813,15 @@ def fetch_sgp_imbalance_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_shippers_imbalance_quantity(
     config: EpiasConfig,
     start_date: date,
@@ -622,14 +846,15 @@ def fetch_sgp_shippers_imbalance_quantity(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_bast(
     config: EpiasConfig,
     start_date: date,
@@ -654,14 +879,15 @@ def fetch_sgp_bast(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_gddk_amount(
     config: EpiasConfig,
     start_date: date,
@@ -685,14 +911,15 @@ def fetch_sgp_gddk_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_sgp_transaction_history(
     config: EpiasConfig,
     start_date: date,
@@ -713,14 +940,17 @@ def fetch_sgp_transaction_history(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                # Trade timestamps keep their time of day for hourly bars; gas days are dates.
+                is_trade_time = candidate in TRADE_TIME_COLUMNS
+                frame[candidate] = _as_local_time(parsed) if is_trade_time else _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_gfm_daily_index_price(
     config: EpiasConfig,
     start_date: date,
@@ -741,13 +971,14 @@ def fetch_gfm_daily_index_price(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_gfm_trade_volume(
     config: EpiasConfig,
     start_date: date,
@@ -768,13 +999,14 @@ def fetch_gfm_trade_volume(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_gfm_transaction_history(
     config: EpiasConfig,
     start_date: date,
@@ -795,13 +1027,15 @@ def fetch_gfm_transaction_history(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                is_trade_time = candidate in TRADE_TIME_COLUMNS
+                frame[candidate] = _as_local_time(parsed) if is_trade_time else _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_gfm_contract_price_summary(
     config: EpiasConfig,
     start_date: date,
@@ -822,13 +1056,14 @@ def fetch_gfm_contract_price_summary(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_gfm_open_position(
     config: EpiasConfig,
     start_date: date,
@@ -849,13 +1084,14 @@ def fetch_gfm_open_position(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_gfm_order_prices(
     config: EpiasConfig,
     start_date: date,
@@ -875,13 +1111,14 @@ def fetch_gfm_order_prices(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_natural_gas_market_participants(
     config: EpiasConfig,
     timeout_seconds: int = 30,
@@ -901,9 +1138,10 @@ def fetch_natural_gas_market_participants(
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_entry_nomination(
     config: EpiasConfig,
     start_date: date,
@@ -924,14 +1162,15 @@ def fetch_transmission_entry_nomination(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_exit_nomination(
     config: EpiasConfig,
     start_date: date,
@@ -952,14 +1191,15 @@ def fetch_transmission_exit_nomination(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
 
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_transfer(
     config: EpiasConfig,
     start_date: date,
@@ -979,13 +1219,14 @@ def fetch_transmission_transfer(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_day_ahead(
     config: EpiasConfig,
     start_date: date,
@@ -1005,13 +1246,14 @@ def fetch_transmission_day_ahead(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_day_end(
     config: EpiasConfig,
     start_date: date,
@@ -1031,13 +1273,14 @@ def fetch_transmission_day_end(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_max_entry_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1057,13 +1300,14 @@ def fetch_transmission_max_entry_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_max_exit_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1083,13 +1327,14 @@ def fetch_transmission_max_exit_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_rezerve_entry_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1109,13 +1354,14 @@ def fetch_transmission_rezerve_entry_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_rezerve_exit_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1135,13 +1381,14 @@ def fetch_transmission_rezerve_exit_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_actual_realization_entry_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1161,13 +1408,14 @@ def fetch_transmission_actual_realization_entry_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_actual_realization_exit_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1187,13 +1435,14 @@ def fetch_transmission_actual_realization_exit_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_stock_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1213,13 +1462,14 @@ def fetch_transmission_stock_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
 
 
+@_offloadable
 def fetch_transmission_daily_actualization_amount(
     config: EpiasConfig,
     start_date: date,
@@ -1239,8 +1489,49 @@ def fetch_transmission_daily_actualization_amount(
         if candidate in frame.columns:
             parsed = pd.to_datetime(frame[candidate], errors="coerce")
             if parsed.notna().any():
-                frame[candidate] = parsed.dt.date
+                frame[candidate] = _as_gas_day(parsed, config)
     for column in frame.columns:
         if frame[column].dtype == object:
             frame[column] = pd.to_numeric(frame[column], errors="ignore")
-    return frame
+    return _compact_frame(frame, config)
+
+
+def fetch_period_range(
+    fetcher: Callable[..., pd.DataFrame],
+    config: EpiasConfig,
+    start_period: date,
+    end_period: date,
+    max_workers: int = PERIOD_RANGE_MAX_WORKERS,
+    timeout_seconds: int = 30,
+) -> pd.DataFrame:
+    # Period endpoints only answer one month per request, so fan out one call per month.
+    months = _month_starts(start_period, end_period)
+    if not months:
+        return pd.DataFrame()
+
+    def _fetch_month(month_start: date) -> pd.DataFrame:
+        month_end = date(
+            month_start.year,
+            month_start.month,
+            calendar.monthrange(month_start.year, month_start.month)[1],
+        )
+        frame = fetcher(
+            config=config,
+            start_date=month_start,
+            end_date=month_end,
+            period=_to_epias_datetime(month_start),
+            timeout_seconds=timeout_seconds,
+        )
+        if frame.empty:
+            return frame
+        frame = frame.copy()
+        if "period" not in frame.columns:
+            frame["period"] = month_start
+        return frame
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(months)))) as executor:
+        frames = [frame for frame in executor.map(carry_context(_fetch_month), months) if not frame.empty]
+
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
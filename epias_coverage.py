@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from epias_cache import DEFAULT_MAX_ENTRIES, DEFAULT_TTL_SECONDS, STORED_AT_ATTR, carry_context
+
+COVERAGE_MAX_WORKERS = 4
+# Row fields that carry the (local) gas day a listing row belongs to, in lookup order.
+DAY_COLUMNS = ("gasDay", "date", "transactionDate", "day")
+
+Interval = tuple[date, date]
+
+
+def merge_intervals(intervals: list[Interval]) -> list[Interval]:
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: list[Interval], start_date: date, end_date: date) -> list[Interval]:
+    missing = []
+    cursor = start_date
+    for covered_start, covered_end in merge_intervals(covered):
+        if covered_end < cursor:
+            continue
+        if covered_start > end_date:
+            break
+        if covered_start > cursor:
+            missing.append((cursor, covered_start - timedelta(days=1)))
+        cursor = max(cursor, covered_end + timedelta(days=1))
+        if cursor > end_date:
+            return missing
+    if cursor <= end_date:
+        missing.append((cursor, end_date))
+    return missing
+
+
+def split_ranges(ranges: list[Interval], pieces: list[Interval]) -> list[Interval]:
+    # Cuts each range at the edges of the given pieces.
+    split = []
+    for start, end in ranges:
+        cuts = sorted(
+            {piece_start for piece_start, _ in pieces if start < piece_start <= end}
+            | {piece_end + timedelta(days=1) for _, piece_end in pieces if start <= piece_end < end}
+        )
+        cursor = start
+        for cut in cuts:
+            split.append((cursor, cut - timedelta(days=1)))
+            cursor = cut
+        split.append((cursor, end))
+    return split
+
+
+def row_days(frame: pd.DataFrame) -> np.ndarray | None:
+    # EPIAS timestamps carry a +03:00 offset, so the first ten characters are the local day.
+    if frame.empty:
+        return np.array([], dtype="datetime64[D]")
+    column = next((name for name in DAY_COLUMNS if name in frame.columns), None)
+    if column is None:
+        return None
+    days = pd.to_datetime(frame[column].astype("string").str[:10], format="%Y-%m-%d", errors="coerce")
+    if days.isna().any():
+        return None
+    return days.to_numpy(dtype="datetime64[D]")
+
+
+def _day(value: date) -> np.datetime64:
+    return np.datetime64(value.isoformat(), "D")
+
+
+@dataclass
+class _Series:
+    segments: list[tuple[date, date, float]] = field(default_factory=list)
+    rows: pd.DataFrame = field(default_factory=pd.DataFrame)
+    days: np.ndarray = field(default_factory=lambda: np.array([], dtype="datetime64[D]"))
+    uncoverable: bool = False
+
+    def covered(self) -> list[Interval]:
+        return [(start, end) for start, end, _ in self.segments]
+
+    def drop_expired(self, cutoff: float) -> list[Interval]:
+        expired = [(start, end) for start, end, stored_at in self.segments if stored_at <= cutoff]
+        if not expired:
+            return expired
+        self.segments = [segment for segment in self.segments if segment[2] > cutoff]
+        keep = np.ones(len(self.days), dtype=bool)
+        for start, end in expired:
+            keep &= (self.days < _day(start)) | (self.days > _day(end))
+        self.rows = self.rows[keep].reset_index(drop=True)
+        self.days = self.days[keep]
+        return expired
+
+    def insert(self, start_date: date, end_date: date, frame: pd.DataFrame, days: np.ndarray) -> None:
+        # Segments age from when the response was fetched, so a stale answer expires again at once.
+        stored_at = frame.attrs.get(STORED_AT_ATTR, time.time())
+        pieces = [self.rows] if not self.rows.empty else []
+        piece_days = [self.days]
+        added = False
+        # Only the parts still uncovered are added, so racing loads never duplicate rows.
+        for start, end in missing_ranges(self.covered(), start_date, end_date):
+            mask = (days >= _day(start)) & (days <= _day(end))
+            if mask.any():
+                pieces.append(frame[mask])
+                piece_days.append(days[mask])
+                added = True
+            self.segments.append((start, end, stored_at))
+        if not added:
+            return
+        rows = pd.concat(pieces, ignore_index=True)
+        all_days = np.concatenate(piece_days)
+        order = np.argsort(all_days, kind="stable")
+        self.rows = rows.take(order).reset_index(drop=True)
+        self.days = all_days[order]
+
+    def window(self, start_date: date, end_date: date) -> pd.DataFrame:
+        lower = np.searchsorted(self.days, _day(start_date), side="left")
+        upper = np.searchsorted(self.days, _day(end_date), side="right")
+        return self.rows.iloc[lower:upper].reset_index(drop=True).copy()
+
+
+class CoverageIndex:
+    # Per-series (endpoint + non-date body + cache scope) record of which days are already
+    # held, so a shifted date window only requests the days it has not seen.
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_series: int = DEFAULT_MAX_ENTRIES,
+        max_workers: int = COVERAGE_MAX_WORKERS,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_series = max_series
+        self.max_workers = max_workers
+        self._series: OrderedDict[str, _Series] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_series > 0
+
+    def plan(
+        self,
+        series_key: str,
+        start_date: date,
+        end_date: date,
+        max_stale_seconds: float = 0.0,
+    ) -> list[Interval]:
+        with self._lock:
+            series = self._series.get(series_key)
+            if series is None:
+                return [(start_date, end_date)]
+            expired = series.drop_expired(time.time() - self.ttl_seconds)
+            missing = missing_ranges(series.covered(), start_date, end_date)
+        if max_stale_seconds > 0:
+            # Expired ranges are requested exactly as first loaded, so the response cache can answer
+            # them from its stale copies instead of seeing a merged range it never stored.
+            return split_ranges(missing, expired)
+        return missing
+
+    def load(
+        self,
+        series_key: str,
+        start_date: date,
+        end_date: date,
+        loader: Callable[[date, date], pd.DataFrame],
+        max_stale_seconds: float = 0.0,
+    ) -> pd.DataFrame:
+        with self._lock:
+            series = self._series.get(series_key)
+            if series is not None and series.uncoverable:
+                return loader(start_date, end_date)
+        missing = self.plan(series_key, start_date, end_date, max_stale_seconds)
+
+        if len(missing) == 1:
+            fetched = [(*missing[0], loader(*missing[0]))]
+        elif missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(missing))) as executor:
+                frames = list(executor.map(carry_context(lambda interval: loader(*interval)), missing))
+            fetched = [(start, end, frame) for (start, end), frame in zip(missing, frames)]
+        else:
+            fetched = []
+
+        placed = [(start, end, frame, row_days(frame)) for start, end, frame in fetched]
+        with self._lock:
+            series = self._series.setdefault(series_key, _Series())
+            self._series.move_to_end(series_key)
+            if any(days is None for _, _, _, days in placed):
+                # Rows without a recognisable day can't be split by date; serve this series whole.
+                series.uncoverable = True
+            else:
+                for start, end, frame, days in placed:
+                    series.insert(start, end, frame, days)
+                window = series.window(start_date, end_date)
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        if series.uncoverable:
+            if len(fetched) == 1 and fetched[0][:2] == (start_date, end_date):
+                return fetched[0][2]
+            return loader(start_date, end_date)
+        return window
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+
+coverage_index = CoverageIndex()
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable
+
+import pandas as pd
+import pyarrow as pa
+
+from epias_arrow import to_arrow_or_none
+
+# tmpfs when available, so the Arrow file never leaves memory and both processes map the same pages.
+SHARED_MEMORY_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+DEFAULT_PROCESS_WORKERS = int(os.getenv("EPIAS_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_in_worker = False
+
+
+def in_worker() -> bool:
+    return _in_worker
+
+
+def _worker_init(initializer: Callable[..., None] | None, initargs: tuple) -> None:
+    global _in_worker
+    _in_worker = True
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _run_to_arrow(
+    function: Callable[..., pd.DataFrame],
+    args: tuple,
+    kwargs: dict[str, Any],
+    directory: str,
+) -> tuple[str, Any]:
+    frame = function(*args, **kwargs)
+    table = to_arrow_or_none(frame)
+    if table is None:
+        return "pickle", frame
+    path = os.path.join(directory, f"epias-{os.getpid()}-{uuid.uuid4().hex}.arrow")
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return "arrow", path
+
+
+def read_arrow_table(path: str) -> pa.Table:
+    # Buffers point into the mapping; unlinking only drops the name, the pages live until unmapped.
+    with pa.memory_map(path, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    os.unlink(path)
+    return table
+
+
+def attach_frame(handle: tuple[str, Any]) -> pd.DataFrame:
+    kind, value = handle
+    if kind == "pickle":
+        return value
+    return read_arrow_table(value).to_pandas(split_blocks=True, self_destruct=True)
+
+
+class ProcessFetchPool:
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_PROCESS_WORKERS,
+        directory: str = SHARED_MEMORY_DIR,
+        initializer: Callable[..., None] | None = None,
+        initargs: tuple = (),
+    ) -> None:
+        self.directory = directory
+        # Spawned, not forked: the Streamlit server process is full of threads and locks.
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_worker_init,
+            initargs=(initializer, initargs),
+        )
+
+    def submit(self, function: Callable[..., pd.DataFrame], *args: Any, **kwargs: Any) -> Future:
+        result: Future = Future()
+
+        def attach(done: Future) -> None:
+            try:
+                result.set_result(attach_frame(done.result()))
+            except BaseException as exc:
+                result.set_exception(exc)
+
+        self._executor.submit(_run_to_arrow, function, args, kwargs, self.directory).add_done_callback(attach)
+        return result
+
+    def run(self, function: Callable[..., pd.DataFrame], *args: Any, **kwargs: Any) -> pd.DataFrame:
+        return self.submit(function, *args, **kwargs).result()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: ProcessFetchPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_process_pool() -> ProcessFetchPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessFetchPool()
+        return _pool
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import contextvars
+import itertools
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator
+
+from epias_metrics import REQUEST_QUEUE_WAIT
+from tracing import tracer
+
+INTERACTIVE = "interactive"
+PREFETCH = "prefetch"
+BACKFILL = "backfill"
+# Highest priority first.
+PRIORITY_CLASSES = (INTERACTIVE, PREFETCH, BACKFILL)
+DEFAULT_MAX_CONCURRENT_REQUESTS = int(os.getenv("EPIAS_MAX_CONCURRENT_REQUESTS", "8"))
+DEFAULT_CLASS_LIMITS = {
+    INTERACTIVE: DEFAULT_MAX_CONCURRENT_REQUESTS,
+    PREFETCH: int(os.getenv("EPIAS_PREFETCH_CONCURRENCY", "2")),
+    BACKFILL: int(os.getenv("EPIAS_BACKFILL_CONCURRENCY", "2")),
+}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("epias_request_priority", default=INTERACTIVE)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def request_priority(priority: str) -> Iterator[None]:
+    if priority not in PRIORITY_CLASSES:
+        raise ValueError(f"priority must be one of {PRIORITY_CLASSES}, got {priority!r}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RequestScheduler:
+    # Admits EPIAS requests up to a global limit and a per-class limit. Waiting requests start in
+    # class order, then arrival order, so an interactive fetch overtakes every queued prefetch or
+    # backfill request; requests already on the wire are never interrupted. Keeping the background
+    # limits below the global one leaves slots free for interactive work during a long backfill.
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        class_limits: dict[str, int] | None = None,
+    ) -> None:
+        self.max_concurrent = max_concurrent
+        self.class_limits = {**DEFAULT_CLASS_LIMITS, **(class_limits or {})}
+        self._running: Counter[str] = Counter()
+        self._waiting: list[tuple[int, int, str]] = []
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+    def _admissible(self, priority: str) -> bool:
+        if sum(self._running.values()) >= self.max_concurrent:
+            return False
+        return self._running[priority] < self.class_limits[priority]
+
+    def _next(self) -> tuple[int, int, str] | None:
+        for waiter in sorted(self._waiting):
+            if self._admissible(waiter[2]):
+                return waiter
+        return None
+
+    @contextmanager
+    def slot(self, priority: str | None = None) -> Iterator[None]:
+        priority = priority or current_priority()
+        waiter = (PRIORITY_CLASSES.index(priority), next(self._tickets), priority)
+        started = time.perf_counter()
+        with tracer.span("queue wait", priority=priority), self._condition:
+            self._waiting.append(waiter)
+            while self._next() != waiter:
+                self._condition.wait()
+            self._waiting.remove(waiter)
+            self._running[priority] += 1
+            # More than one slot may be free; let the next waiter check.
+            self._condition.notify_all()
+        REQUEST_QUEUE_WAIT.observe(time.perf_counter() - started, priority=priority)
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._running[priority] -= 1
+                self._condition.notify_all()
+
+    def stats(self) -> dict[str, tuple[int, int]]:
+        # Running and waiting requests per class.
+        with self._condition:
+            waiting = Counter(priority for _, _, priority in self._waiting)
+            return {priority: (self._running[priority], waiting[priority]) for priority in PRIORITY_CLASSES}
+
+
+request_scheduler = RequestScheduler()
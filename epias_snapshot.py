@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+import pandas as pd
+import pyarrow as pa
+# Imported up front: pyarrow loads it on the first conversion, which fails inside an atexit hook.
+import pyarrow.pandas_compat  # noqa: F401
+
+from epias_arrow import to_arrow_or_none
+
+DEFAULT_SNAPSHOT_DIR = os.getenv("EPIAS_SNAPSHOT_DIR", ".epias_snapshot")
+DEFAULT_SNAPSHOT_INTERVAL_SECONDS = float(os.getenv("EPIAS_SNAPSHOT_INTERVAL_SECONDS", "300"))
+MANIFEST_NAME = "manifest.json"
+LOCK_NAME = ".lock"
+
+
+def _file_name(key: str, stored_at: float) -> str:
+    # Named by key and store time, so an unchanged entry is never rewritten.
+    return f"{key}-{int(stored_at * 1000)}.arrow"
+
+
+class CacheSnapshot:
+    # One Arrow IPC file per cache entry plus a manifest. Entries are memory-mapped on first use,
+    # so worker processes on the same host share the pages through the OS page cache.
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory)
+        self._manifest: dict[str, dict] | None = None
+        self._lock = threading.Lock()
+
+    def _read_manifest(self) -> dict[str, dict]:
+        try:
+            return json.loads((self.directory / MANIFEST_NAME).read_text())
+        except (OSError, ValueError):
+            return {}
+
+    def _entries(self) -> dict[str, dict]:
+        with self._lock:
+            if self._manifest is None:
+                self._manifest = self._read_manifest()
+            return self._manifest
+
+    def load(self, key: str) -> tuple[pd.DataFrame, float, float] | None:
+        entry = self._entries().get(key)
+        if entry is None or entry["expires_at"] <= time.time():
+            return None
+        try:
+            with pa.memory_map(str(self.directory / entry["file"]), "r") as source:
+                table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid):
+            # Pruned by another process since our manifest was read.
+            return None
+        with self._lock:
+            self._manifest.pop(key, None)
+        # Numeric columns without nulls stay views into the mapping instead of private copies.
+        return table.to_pandas(split_blocks=True), entry["stored_at"], entry["expires_at"]
+
+    def write(self, entries: Iterable[tuple[str, pd.DataFrame, float, float]]) -> int:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Processes sharing the directory take turns, so one never prunes files another just wrote.
+        with open(self.directory / LOCK_NAME, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            return self._write(entries)
+
+    def _write(self, entries: Iterable[tuple[str, pd.DataFrame, float, float]]) -> int:
+        now = time.time()
+        # Merge with what other processes wrote; the newest copy of a key wins.
+        manifest = {key: entry for key, entry in self._read_manifest().items() if entry["expires_at"] > now}
+        written = 0
+        for key, frame, stored_at, expires_at in entries:
+            if expires_at <= now or manifest.get(key, {}).get("stored_at", 0) > stored_at:
+                continue
+            name = _file_name(key, stored_at)
+            target = self.directory / name
+            if not target.exists():
+                table = to_arrow_or_none(frame)
+                if table is None:
+                    # The entry stays memory-only.
+                    continue
+                temp = target.with_suffix(".tmp")
+                with pa.OSFile(str(temp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                os.replace(temp, target)
+                written += 1
+            manifest[key] = {"file": name, "stored_at": stored_at, "expires_at": expires_at}
+
+        temp_manifest = self.directory / f"{MANIFEST_NAME}.tmp"
+        temp_manifest.write_text(json.dumps(manifest))
+        os.replace(temp_manifest, self.directory / MANIFEST_NAME)
+        # Unlinking a file another process has mapped is safe; its pages live until unmapped.
+        referenced = {entry["file"] for entry in manifest.values()}
+        for path in self.directory.glob("*.arrow"):
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+        return written
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from epias_arrow import to_arrow_or_none
+
+DEFAULT_CACHE_DB = os.getenv("EPIAS_CACHE_DB", "")
+BUSY_TIMEOUT_SECONDS = 5.0
+PAYLOAD_COMPRESSION = "zstd"
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS responses ("
+    "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, expires_at REAL NOT NULL, payload BLOB NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)",
+)
+
+
+def encode_frame(frame: pd.DataFrame) -> bytes | None:
+    table = to_arrow_or_none(frame)
+    if table is None:
+        # The response stays in the process cache.
+        return None
+    sink = pa.BufferOutputStream()
+    options = pa.ipc.IpcWriteOptions(compression=PAYLOAD_COMPRESSION)
+    with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def decode_frame(payload: bytes) -> pd.DataFrame:
+    return pa.ipc.open_stream(pa.py_buffer(payload)).read_all().to_pandas()
+
+
+class SqliteCache:
+    # Second cache tier shared by every app process on the host. WAL mode lets readers in all
+    # processes run alongside the single writer; each thread keeps its own connection. Rows are
+    # kept retention_seconds past their expiry for callers that accept stale responses.
+    def __init__(self, path: Path | str, retention_seconds: float = 0.0) -> None:
+        self.path = Path(path)
+        self.retention_seconds = retention_seconds
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            # A crash can lose the last commits but never corrupts the file, which is fine for a cache.
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                connection.execute(statement)
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str, max_stale_seconds: float = 0.0) -> tuple[pd.DataFrame, float, float] | None:
+        try:
+            row = self._connection().execute(
+                "SELECT stored_at, expires_at, payload FROM responses WHERE key = ? AND expires_at > ?",
+                (key, time.time() - max_stale_seconds),
+            ).fetchone()
+        except sqlite3.Error:
+            # A locked or unreadable database degrades to a miss rather than failing the fetch.
+            return None
+        if row is None:
+            return None
+        stored_at, expires_at, payload = row
+        try:
+            return decode_frame(payload), stored_at, expires_at
+        except (pa.ArrowInvalid, OSError):
+            return None
+
+    def put(self, key: str, frame: pd.DataFrame, stored_at: float, expires_at: float) -> bool:
+        payload = encode_frame(frame)
+        if payload is None:
+            return False
+        try:
+            connection = self._connection()
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses (key, stored_at, expires_at, payload) VALUES (?, ?, ?, ?)",
+                    (key, stored_at, expires_at, payload),
+                )
+                connection.execute(
+                    "DELETE FROM responses WHERE expires_at <= ?", (time.time() - self.retention_seconds,)
+                )
+        except sqlite3.Error:
+            return False
+        return True
+
+    def clear(self) -> None:
+        try:
+            self._connection().execute("DELETE FROM responses")
+        except sqlite3.Error:
+            pass
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+import requests
+
+TRANSPORT_MODES = {"http", "record", "replay"}
+DEFAULT_CASSETTE_DIR = Path(os.getenv("EPIAS_CASSETTE_DIR", "cassettes"))
+SECRET_FORM_FIELDS = {"password"}
+# Stands in for the ticket a CAS login returned; replays hand it back, so offline runs still log in.
+PLACEHOLDER_TICKET = "TGT-cassette-placeholder"
+
+
+class CassetteMissError(requests.ConnectionError):
+    pass
+
+
+@dataclass(frozen=True)
+class TransportResponse:
+    status_code: int
+    content: bytes
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class Transport(Protocol):
+    def post(
+        self,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+        json_body: dict[str, Any] | None = None,
+        form: dict[str, Any] | None = None,
+    ) -> TransportResponse: ...
+
+
+def request_key(url: str, json_body: dict[str, Any] | None = None, form: dict[str, Any] | None = None) -> str:
+    # Keyed by the versioned endpoint path so cassettes replay against any base URL.
+    path = urlsplit(url).path
+    marker = path.find("/v1/")
+    endpoint = path[marker:] if marker >= 0 else path
+    if form is not None:
+        payload = {key: value for key, value in form.items() if key not in SECRET_FORM_FIELDS}
+    else:
+        payload = json_body or {}
+    return f"POST {endpoint} {json.dumps(payload, sort_keys=True, default=str)}"
+
+
+class HttpTransport:
+    def __init__(self, session: requests.Session | None = None) -> None:
+        self.session = session or requests.Session()
+
+    def post(
+        self,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+        json_body: dict[str, Any] | None = None,
+        form: dict[str, Any] | None = None,
+    ) -> TransportResponse:
+        if form is not None:
+            response = self.session.post(url, headers=headers, data=form, timeout=timeout)
+        else:
+            response = self.session.post(url, headers=headers, json=json_body, timeout=timeout)
+        return TransportResponse(status_code=response.status_code, content=response.content)
+
+
+class RecordingTransport:
+    def __init__(self, inner: Transport, cassette_dir: Path | str = DEFAULT_CASSETTE_DIR) -> None:
+        self.inner = inner
+        self.cassette_dir = Path(cassette_dir)
+        self.cassette_dir.mkdir(parents=True, exist_ok=True)
+        self.cassette_path = self.cassette_dir / f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}.jsonl.gz"
+        self._lock = threading.Lock()
+
+    def post(
+        self,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+        json_body: dict[str, Any] | None = None,
+        form: dict[str, Any] | None = None,
+    ) -> TransportResponse:
+        response = self.inner.post(url, headers=headers, timeout=timeout, json_body=json_body, form=form)
+        # Form posts are CAS logins, whose body is a live TGT credential; cassettes are shared, so it is not kept.
+        content = PLACEHOLDER_TICKET if form is not None and response.status_code < 400 else response.text
+        record = {
+            "key": request_key(url, json_body=json_body, form=form),
+            "recorded_at": time.time(),
+            "status_code": response.status_code,
+            "content": content,
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            # Each append is its own gzip member; gzip readers concatenate them transparently.
+            with gzip.open(self.cassette_path, "ab") as handle:
+                handle.write(line)
+        return response
+
+
+class ReplayTransport:
+    def __init__(self, cassette_dir: Path | str = DEFAULT_CASSETTE_DIR) -> None:
+        self.cassette_dir = Path(cassette_dir)
+        self._index: dict[str, TransportResponse] | None = None
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> dict[str, TransportResponse]:
+        with self._lock:
+            if self._index is None:
+                index: dict[str, TransportResponse] = {}
+                for path in sorted(self.cassette_dir.glob("*.jsonl.gz")):
+                    with gzip.open(path, "rt", encoding="utf-8") as handle:
+                        for line in handle:
+                            if not line.strip():
+                                continue
+                            record = json.loads(line)
+                            index[record["key"]] = TransportResponse(
+                                status_code=int(record["status_code"]),
+                                content=record["content"].encode("utf-8"),
+                            )
+                self._index = index
+            return self._index
+
+    def post(
+        self,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+        json_body: dict[str, Any] | None = None,
+        form: dict[str, Any] | None = None,
+    ) -> TransportResponse:
+        key = request_key(url, json_body=json_body, form=form)
+        response = self._load_index().get(key)
+        if response is None:
+            raise CassetteMissError(f"No recorded response for {key} in {self.cassette_dir}")
+        return response
+
+
+def transport_from_env() -> Transport:
+    mode = os.getenv("EPIAS_TRANSPORT", "http").strip().lower()
+    if mode not in TRANSPORT_MODES:
+        raise ValueError(f"EPIAS_TRANSPORT must be one of {sorted(TRANSPORT_MODES)}, got {mode!r}")
+    if mode == "replay":
+        return ReplayTransport()
+    if mode == "record":
+        return RecordingTransport(HttpTransport())
+    return HttpTransport()
+
+
+_transport: Transport | None = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = transport_from_env()
+        return _transport
+
+
+def uses_cassettes() -> bool:
+    # Cassettes are keyed by request body, so recorded requests must not depend on what is cached.
+    return isinstance(get_transport(), (RecordingTransport, ReplayTransport))
+
+
+def set_transport(transport: Transport | None) -> None:
+    global _transport
+    with _transport_lock:
+        _transport = transport
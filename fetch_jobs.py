@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Any, Callable
+
+import pandas as pd
+
+from epias_scheduler import BACKFILL, request_priority
+
+DEFAULT_JOB_WORKERS = int(os.getenv("EPIAS_JOB_WORKERS", "4"))
+DEFAULT_CHUNK_DAYS = int(os.getenv("EPIAS_JOB_CHUNK_DAYS", "31"))
+JOB_RETENTION_SECONDS = 60 * 60
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+FINISHED_STATES = {JOB_DONE, JOB_FAILED, JOB_CANCELLED}
+
+
+class JobCancelledError(Exception):
+    pass
+
+
+def date_chunks(start_date: date, end_date: date, days: int = DEFAULT_CHUNK_DAYS) -> list[tuple[date, date]]:
+    chunks = []
+    chunk_start = start_date
+    while chunk_start <= end_date:
+        chunk_end = min(chunk_start + timedelta(days=days - 1), end_date)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+@dataclass
+class FetchJob:
+    job_id: int
+    key: str
+    label: str
+    total_chunks: int
+    metadata: dict[str, Any] = field(default_factory=dict)
+    priority: str = BACKFILL
+    status: str = JOB_QUEUED
+    completed_chunks: int = 0
+    result: Any = None
+    error: BaseException | None = None
+    created_at: float = field(default_factory=time.time)
+    finished_at: float | None = None
+    # Sessions (or panels) showing this job; identical fetches from several sessions share one job.
+    watchers: set[str] = field(default_factory=set)
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _futures: list[Future] = field(default_factory=list, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    @property
+    def progress(self) -> float:
+        return self.completed_chunks / self.total_chunks if self.total_chunks else 1.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self) -> None:
+        self._cancel.set()
+        for future in self._futures:
+            future.cancel()
+
+
+class JobRunner:
+    # One runner per server process; jobs outlive the Streamlit rerun that submitted them.
+    def __init__(self, max_workers: int = DEFAULT_JOB_WORKERS) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="epias-job")
+        self._jobs: dict[str, FetchJob] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, key: str | None) -> FetchJob | None:
+        with self._lock:
+            self._evict_finished()
+            return self._jobs.get(key) if key else None
+
+    def jobs(self) -> list[FetchJob]:
+        with self._lock:
+            self._evict_finished()
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def submit(
+        self,
+        key: str,
+        label: str,
+        chunks: list[Callable[[], Any]],
+        combine: Callable[[list[Any]], Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+        priority: str = BACKFILL,
+        watcher: str | None = None,
+    ) -> FetchJob:
+        combine = combine or _concat_chunks
+        with self._lock:
+            self._evict_finished()
+            existing = self._jobs.get(key)
+            if existing is not None and not existing.finished and not existing.cancelled:
+                if watcher is not None:
+                    existing.watchers.add(watcher)
+                return existing
+            job = FetchJob(
+                job_id=next(self._ids),
+                key=key,
+                label=label,
+                total_chunks=len(chunks),
+                metadata=dict(metadata or {}),
+                priority=priority,
+                watchers={watcher} if watcher is not None else set(),
+            )
+            self._jobs[key] = job
+
+        results: list[Any] = [None] * len(chunks)
+        remaining = [len(chunks)]
+        state_lock = threading.RLock()
+
+        def run_chunk(index: int, load: Callable[[], Any]) -> None:
+            if job.cancelled:
+                raise JobCancelledError(job.label)
+            if job.status == JOB_QUEUED:
+                job.status = JOB_RUNNING
+            # Chunk requests yield to interactive fetches at the request scheduler.
+            with request_priority(job.priority):
+                results[index] = load()
+
+        def chunk_done(future: Future) -> None:
+            with state_lock:
+                # Cancelling pending chunks re-enters this callback on the same thread.
+                if job.finished:
+                    return
+                error = None if future.cancelled() else future.exception()
+                if job.cancelled or isinstance(error, JobCancelledError):
+                    self._finish(job, JOB_CANCELLED)
+                    return
+                if error is not None:
+                    job.error = error
+                    self._finish(job, JOB_FAILED)
+                    job.cancel()
+                    return
+                job.completed_chunks += 1
+                remaining[0] -= 1
+                if remaining[0]:
+                    return
+            try:
+                job.result = combine([result for result in results if result is not None])
+            except Exception as exc:
+                job.error = exc
+                self._finish(job, JOB_FAILED)
+            else:
+                self._finish(job, JOB_DONE)
+
+        if not chunks:
+            job.result = combine([])
+            self._finish(job, JOB_DONE)
+            return job
+        for index, load in enumerate(chunks):
+            future = self._executor.submit(run_chunk, index, load)
+            job._futures.append(future)
+        for future in list(job._futures):
+            future.add_done_callback(chunk_done)
+        return job
+
+    def cancel(self, key: str) -> bool:
+        job = self.get(key)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def collect(self, key: str, watcher: str) -> FetchJob | None:
+        # Hands a finished job to one of its watchers. Once every watcher has collected it the runner
+        # drops the job, so its frames live only as long as the sessions holding them.
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or not job.finished:
+                return None
+            self._release(job, watcher)
+        return job
+
+    def detach(self, key: str, watcher: str) -> bool:
+        # The job is only cancelled once nobody else is watching it.
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return False
+            if job.finished:
+                self._release(job, watcher)
+                return False
+            job.watchers.discard(watcher)
+            if job.watchers:
+                return False
+        job.cancel()
+        return True
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            job = self._jobs.pop(key, None)
+        if job is not None and not job.finished:
+            job.cancel()
+
+    def _release(self, job: FetchJob, watcher: str) -> None:
+        job.watchers.discard(watcher)
+        if not job.watchers and self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+
+    @staticmethod
+    def _finish(job: FetchJob, status: str) -> None:
+        job.status = status
+        job.finished_at = time.time()
+
+    def _evict_finished(self) -> None:
+        # Covers finished jobs a watcher never came back for.
+        cutoff = time.time() - JOB_RETENTION_SECONDS
+        for key, job in list(self._jobs.items()):
+            if job.finished and (job.finished_at or 0) < cutoff:
+                del self._jobs[key]
+
+
+def _concat_chunks(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Iterable
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from local_store import LocalStore
+
+FORWARD_CURVE_DATASET = "gfm_forward_curve"
+CURVE_COLUMNS = [
+    "curveDate",
+    "deliveryMonth",
+    "contract",
+    "lastPrice",
+    "bestBid",
+    "bestOffer",
+    "mid",
+    "price",
+]
+MONTH_TOKENS = {
+    "JAN": 1, "OCA": 1,
+    "FEB": 2, "SUB": 2, "ŞUB": 2,
+    "MAR": 3,
+    "APR": 4, "NIS": 4, "NİS": 4,
+    "MAY": 5,
+    "JUN": 6, "HAZ": 6,
+    "JUL": 7, "TEM": 7,
+    "AUG": 8, "AGU": 8, "AĞU": 8,
+    "SEP": 9, "EYL": 9,
+    "OCT": 10, "EKI": 10, "EKİ": 10,
+    "NOV": 11, "KAS": 11,
+    "DEC": 12, "ARA": 12,
+}
+_YEAR_MONTH = re.compile(r"(20\d{2})[-_/.\s]?M?(0[1-9]|1[0-2])(?!\d)")
+_MONTH_YEAR = re.compile(r"(?<!\d)(0[1-9]|1[0-2])[-_/.\s](20\d{2})")
+_NAMED_MONTH = re.compile(
+    "(" + "|".join(MONTH_TOKENS) + r")[A-ZÇĞİÖŞÜ]*[-_/.\s]?((?:20)?\d{2})(?!\d)"
+)
+_TRAILING_YYMM = re.compile(r"(\d{2})(0[1-9]|1[0-2])$")
+
+
+@lru_cache(maxsize=None)
+def parse_delivery_month(contract_code: str) -> date | None:
+    # Contract codes repeat across every summary and order row, so each one is parsed once.
+    code = str(contract_code).strip().upper()
+    if not code:
+        return None
+    match = _YEAR_MONTH.search(code)
+    if match:
+        return date(int(match.group(1)), int(match.group(2)), 1)
+    match = _MONTH_YEAR.search(code)
+    if match:
+        return date(int(match.group(2)), int(match.group(1)), 1)
+    match = _NAMED_MONTH.search(code)
+    if match:
+        year = int(match.group(2))
+        return date(year if year > 99 else 2000 + year, MONTH_TOKENS[match.group(1)], 1)
+    match = _TRAILING_YYMM.search(code)
+    if match:
+        return date(2000 + int(match.group(1)), int(match.group(2)), 1)
+    return None
+
+
+def _delivery_months(codes: pd.Series) -> pd.Series:
+    uniques = codes.dropna().unique()
+    mapping = {code: parse_delivery_month(str(code)) for code in uniques}
+    return codes.map(mapping)
+
+
+def _find_column(columns: Iterable[str], *token_sets: tuple[str, ...]) -> str | None:
+    columns = list(columns)
+    for tokens in token_sets:
+        for column in columns:
+            lowered = column.lower()
+            if all(token in lowered for token in tokens):
+                return column
+    return None
+
+
+def _date_column(columns: Iterable[str]) -> str | None:
+    return _find_column(columns, ("transaction", "date"), ("date",))
+
+
+def _trade_days(frame: pd.DataFrame) -> pd.Series:
+    date_col = _date_column(frame.columns)
+    if date_col is None:
+        return pd.Series(pd.NaT, index=frame.index, dtype="datetime64[ns]")
+    # The first ten characters are the local day, whether the column is still text or already parsed.
+    return pd.to_datetime(frame[date_col].astype("string").str[:10], format="%Y-%m-%d", errors="coerce")
+
+
+def _latest_per_contract(frame: pd.DataFrame, contract_col: str) -> pd.DataFrame:
+    date_col = _date_column(frame.columns)
+    if date_col:
+        frame = frame.sort_values(date_col, kind="stable")
+    return frame.drop_duplicates(subset=[contract_col], keep="last")
+
+
+def build_forward_curve(
+    price_summary: pd.DataFrame,
+    order_prices: pd.DataFrame,
+    fallback_date: date | None = None,
+) -> pd.DataFrame:
+    # The curve is dated by the latest trade in the data; fallback_date (default today) only
+    # applies when neither frame carries a transaction date.
+    parts = []
+
+    if not price_summary.empty:
+        contract_col = _find_column(price_summary.columns, ("contract", "code"), ("contract", "name"), ("contract",))
+        last_col = _find_column(price_summary.columns, ("last", "price"))
+        if contract_col and last_col:
+            summary = _latest_per_contract(price_summary, contract_col)
+            parts.append(
+                pd.DataFrame(
+                    {
+                        "contract": summary[contract_col].astype(str),
+                        "deliveryMonth": _delivery_months(summary[contract_col]),
+                        "lastPrice": pd.to_numeric(summary[last_col], errors="coerce"),
+                        "tradeDay": _trade_days(summary),
+                    }
+                )
+            )
+
+    if not order_prices.empty:
+        contract_col = _find_column(order_prices.columns, ("contract", "name"), ("contract",))
+        delivery_col = _find_column(order_prices.columns, ("delivery", "period"))
+        bid_col = _find_column(order_prices.columns, ("best", "bid"), ("bid",))
+        offer_col = _find_column(order_prices.columns, ("best", "offer"), ("offer",))
+        last_col = _find_column(order_prices.columns, ("last", "match"))
+        if contract_col and (bid_col or offer_col):
+            orders = _latest_per_contract(order_prices, contract_col)
+            months = _delivery_months(orders[contract_col])
+            if delivery_col:
+                months = months.fillna(_delivery_months(orders[delivery_col].astype(str)))
+            quotes = pd.DataFrame(
+                {
+                    "contract": orders[contract_col].astype(str),
+                    "deliveryMonth": months,
+                    "bestBid": pd.to_numeric(orders[bid_col], errors="coerce") if bid_col else float("nan"),
+                    "bestOffer": pd.to_numeric(orders[offer_col], errors="coerce") if offer_col else float("nan"),
+                    "quoteDay": _trade_days(orders),
+                }
+            )
+            if last_col:
+                quotes["orderLastPrice"] = pd.to_numeric(orders[last_col], errors="coerce")
+            parts.append(quotes)
+
+    days = [part[column] for part in parts for column in ("tradeDay", "quoteDay") if column in part.columns]
+    latest_trade = pd.concat(days).max() if days else pd.NaT
+    curve_date = latest_trade.date() if pd.notna(latest_trade) else fallback_date or date.today()
+    parts = [part.dropna(subset=["deliveryMonth"]) for part in parts]
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return pd.DataFrame(columns=CURVE_COLUMNS)
+
+    # Each contract's trade and quotes stay on one row, so a month never pairs one contract's
+    # price with another's bid and offer.
+    curve = parts[0]
+    for part in parts[1:]:
+        curve = curve.merge(part, on=["deliveryMonth", "contract"], how="outer")
+    for column in ("lastPrice", "bestBid", "bestOffer"):
+        if column not in curve.columns:
+            curve[column] = float("nan")
+    for column in ("tradeDay", "quoteDay"):
+        if column not in curve.columns:
+            curve[column] = pd.NaT
+    # One row per delivery month: the contract with the most recent activity, then the most recent trade.
+    curve["activeDay"] = curve[["tradeDay", "quoteDay"]].max(axis=1)
+    curve = curve.sort_values(["deliveryMonth", "activeDay", "tradeDay"], kind="stable", na_position="first")
+    curve = curve.drop_duplicates("deliveryMonth", keep="last")
+
+    if "orderLastPrice" in curve.columns:
+        curve["lastPrice"] = curve["lastPrice"].fillna(curve.pop("orderLastPrice"))
+    curve["mid"] = curve[["bestBid", "bestOffer"]].mean(axis=1, skipna=False)
+    # Traded prices mark the curve; quoted mids fill months without a trade.
+    curve["price"] = curve["lastPrice"].fillna(curve["mid"])
+    curve["curveDate"] = pd.Timestamp(curve_date)
+    curve["deliveryMonth"] = pd.to_datetime(curve["deliveryMonth"])
+    return curve[CURVE_COLUMNS].sort_values("deliveryMonth").reset_index(drop=True)
+
+
+def save_forward_curve(store: LocalStore, curve: pd.DataFrame) -> None:
+    if curve.empty:
+        return
+    curve_date = pd.Timestamp(curve["curveDate"].iloc[0]).date()
+    store.write(FORWARD_CURVE_DATASET, curve, partition=curve_date.isoformat())
+
+
+def load_forward_curves(store: LocalStore, start_date: date, end_date: date) -> pd.DataFrame:
+    # Delivery months are persisted with each curve, so history reads never re-parse codes.
+    field = ds.field("curveDate")
+    curves = store.read(
+        FORWARD_CURVE_DATASET,
+        filters=(field >= pd.Timestamp(start_date)) & (field <= pd.Timestamp(end_date)),
+    )
+    if curves.empty:
+        return pd.DataFrame(columns=CURVE_COLUMNS)
+    return curves.sort_values(["curveDate", "deliveryMonth"]).reset_index(drop=True)
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+DEFAULT_STORE_DIR = Path(os.getenv("EPIAS_STORE_DIR", ".epias_store"))
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", value).strip("_") or "default"
+
+
+class LocalStore:
+    # One directory per dataset, one parquet file per partition (e.g. a gas day or curve date).
+    def __init__(self, root: Path | str = DEFAULT_STORE_DIR) -> None:
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def dataset_dir(self, dataset: str) -> Path:
+        return self.root / _safe_name(dataset)
+
+    def write(self, dataset: str, frame: pd.DataFrame, partition: str) -> Path:
+        target_dir = self.dataset_dir(dataset)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / f"{_safe_name(partition)}.parquet"
+        temp = target.with_suffix(".parquet.tmp")
+        with self._lock:
+            frame.to_parquet(temp, index=False)
+            os.replace(temp, target)
+        return target
+
+    def read(
+        self,
+        dataset: str,
+        columns: list[str] | None = None,
+        filters: Any = None,
+    ) -> pd.DataFrame:
+        files = sorted(self.dataset_dir(dataset).glob("*.parquet"))
+        if not files:
+            return pd.DataFrame(columns=columns or [])
+        # Column selection and filters are pushed down to the parquet reader.
+        table = ds.dataset([str(path) for path in files], format="parquet").to_table(
+            columns=columns,
+            filter=filters,
+        )
+        return table.to_pandas()
+
+    def datasets(self) -> list[str]:
+        if not self.root.exists():
+            return []
+        return sorted(path.name for path in self.root.iterdir() if path.is_dir())
+
+    def partitions(self, dataset: str) -> list[str]:
+        return sorted(path.stem for path in self.dataset_dir(dataset).glob("*.parquet"))
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+TRUE_TOKENS = {"true", "1", "yes", "evet"}
+FALSE_TOKENS = {"false", "0", "no", "hayir"}
+BOOL_TOKENS = TRUE_TOKENS | FALSE_TOKENS
+CHANGE_LOG_LIMIT = 50
+
+
+@dataclass(frozen=True)
+class ParticipantChange:
+    synced_at: datetime
+    added: tuple[str, ...]
+    removed: tuple[str, ...]
+
+
+def _tokens(series: pd.Series) -> pd.Series:
+    return series.astype("string").str.strip().str.lower()
+
+
+def is_bool_like(series: pd.Series) -> bool:
+    if pd.api.types.is_bool_dtype(series):
+        return True
+    non_null = series.dropna()
+    if non_null.empty:
+        return False
+    return set(_tokens(pd.Series(non_null.unique()))).issubset(BOOL_TOKENS)
+
+
+def normalize_bool_like(series: pd.Series) -> pd.Series:
+    # Same token rules as the participant table always used, applied column-wide instead of per cell.
+    if pd.api.types.is_bool_dtype(series):
+        return series
+    tokens = _tokens(series)
+    mapped = pd.Series(
+        np.select([tokens.isin(TRUE_TOKENS), tokens.isin(FALSE_TOKENS)], [True, False], default=None),
+        index=series.index,
+        dtype=object,
+    )
+    return mapped.where(tokens.isin(BOOL_TOKENS), series)
+
+
+def normalize_name(value: str) -> str:
+    # Case, accents, dotted and dotless i and spacing are ignored, so "ŞİRKETİ" matches "sirketi".
+    decomposed = unicodedata.normalize("NFKD", value.casefold().replace("ı", "i"))
+    return " ".join("".join(char for char in decomposed if not unicodedata.combining(char)).split())
+
+
+def payload_digest(frame: pd.DataFrame) -> str:
+    digest = hashlib.sha256("\x1f".join(map(str, frame.columns)).encode("utf-8"))
+    if not frame.empty:
+        digest.update(pd.util.hash_pandas_object(frame.astype("string"), index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _organization_column(frame: pd.DataFrame) -> str | None:
+    columns = list(frame.columns)
+    match = next((c for c in columns if "organization" in c.lower() and "name" in c.lower()), None)
+    return match or (columns[0] if columns else None)
+
+
+class ParticipantDirectory:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._digest: str | None = None
+        self._frame = pd.DataFrame()
+        self._name_column: str | None = None
+        # Normalized names joined by newlines (which never survive normalization), and each row's offset.
+        self._search_text = ""
+        self._search_starts = np.zeros(0, dtype=np.int64)
+        self._positions: dict[str, int] = {}
+        self._changes: deque[ParticipantChange] = deque(maxlen=CHANGE_LOG_LIMIT)
+        self.synced_at: datetime | None = None
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._frame.copy()
+
+    @property
+    def name_column(self) -> str | None:
+        return self._name_column
+
+    @property
+    def changes(self) -> list[ParticipantChange]:
+        with self._lock:
+            return list(reversed(self._changes))
+
+    def sync(self, raw: pd.DataFrame) -> bool:
+        digest = payload_digest(raw)
+        with self._lock:
+            self.synced_at = datetime.now()
+            if digest == self._digest:
+                return False
+
+        frame = raw.reset_index(drop=True).copy()
+        for column in frame.columns:
+            is_text = frame[column].dtype == object or isinstance(frame[column].dtype, pd.CategoricalDtype)
+            if is_text and is_bool_like(frame[column]):
+                frame[column] = normalize_bool_like(frame[column]).astype("boolean")
+        name_column = _organization_column(frame)
+        names = frame[name_column].astype("string").str.strip() if name_column else pd.Series(dtype="string")
+        positions = {key: index for index, key in enumerate(names.str.casefold()) if not pd.isna(key)}
+        normalized = [normalize_name(name) if not pd.isna(name) else "" for name in names]
+        search_starts = np.cumsum([0] + [len(key) + 1 for key in normalized], dtype=np.int64)[: len(normalized)]
+        search_text = "\n".join(normalized)
+
+        with self._lock:
+            if self._digest is not None and self._name_column is not None:
+                previous = set(self._positions)
+                current = set(positions)
+                previous_names = self._frame[self._name_column]
+                added = tuple(sorted(names[positions[key]] for key in current - previous))
+                removed = tuple(sorted(previous_names.iloc[self._positions[key]] for key in previous - current))
+                if added or removed:
+                    self._changes.append(ParticipantChange(self.synced_at, added, removed))
+            self._digest = digest
+            self._frame = frame
+            self._name_column = name_column
+            self._search_text = search_text
+            self._search_starts = search_starts
+            self._positions = positions
+        return True
+
+    def lookup(self, organization_name: str) -> pd.Series | None:
+        with self._lock:
+            frame, positions = self._frame, self._positions
+        position = positions.get(organization_name.strip().casefold())
+        return None if position is None else frame.iloc[position].copy()
+
+    @staticmethod
+    def _matching_rows(text: str, starts: np.ndarray, needle: str) -> np.ndarray:
+        # str.find scans the whole index in C; after a hit the scan resumes at the next row.
+        rows = []
+        at = text.find(needle)
+        while at != -1:
+            row = int(np.searchsorted(starts, at, side="right")) - 1
+            rows.append(row)
+            if row + 1 == len(starts):
+                break
+            at = text.find(needle, int(starts[row + 1]))
+        return np.asarray(rows, dtype=np.int64)
+
+    def search(self, query: str = "", **flags: bool | None) -> pd.DataFrame:
+        with self._lock:
+            frame, text, starts = self._frame, self._search_text, self._search_starts
+        if frame.empty:
+            return frame.copy()
+        mask = pd.Series(True, index=frame.index)
+        needle = normalize_name(query)
+        if needle:
+            matched = np.zeros(len(frame), dtype=bool)
+            matched[self._matching_rows(text, starts, needle)] = True
+            mask &= matched
+        for column, expected in flags.items():
+            if expected is not None and column in frame.columns:
+                mask &= frame[column].eq(expected).fillna(False).astype(bool)
+        return frame[mask]
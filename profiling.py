@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import cProfile
+import marshal
+import os
+import pstats
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+PROFILE_MODES = ("off", "rerun", "fetch")
+TOP_FUNCTIONS = 30
+PROFILE_COLUMNS = ["function", "location", "calls", "totalSeconds", "cumulativeSeconds"]
+
+
+@dataclass(frozen=True)
+class ProfileReport:
+    label: str
+    elapsed_seconds: float
+    top_functions: pd.DataFrame
+    raw: bytes
+
+    @property
+    def file_name(self) -> str:
+        slug = "".join(ch if ch.isalnum() else "_" for ch in self.label.lower()).strip("_")
+        return f"{slug or 'profile'}.prof"
+
+
+def profile_mode_from_env() -> str:
+    mode = os.getenv("EPIAS_PROFILE", "off").strip().lower() or "off"
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"EPIAS_PROFILE must be one of {list(PROFILE_MODES)}, got {mode!r}")
+    return mode
+
+
+def _top_functions(stats: pstats.Stats, limit: int) -> pd.DataFrame:
+    rows = []
+    for (filename, line, name), (_, calls, total, cumulative, _) in stats.stats.items():
+        location = name if filename == "~" else f"{os.path.basename(filename)}:{line}"
+        rows.append((name, location, calls, total, cumulative))
+    frame = pd.DataFrame(rows, columns=PROFILE_COLUMNS)
+    return frame.sort_values("cumulativeSeconds", ascending=False).head(limit).reset_index(drop=True)
+
+
+class ProfileSession:
+    # Only constructed when profiling is switched on, so disabled runs never install a profile hook.
+    def __init__(self, label: str, limit: int = TOP_FUNCTIONS) -> None:
+        self.label = label
+        self.limit = limit
+        self.report: ProfileReport | None = None
+        self._profiler = cProfile.Profile()
+        self._started: float | None = None
+
+    @property
+    def active(self) -> bool:
+        return self._started is not None
+
+    def start(self) -> ProfileSession:
+        self._started = time.perf_counter()
+        self._profiler.enable()
+        return self
+
+    def stop(self) -> ProfileReport:
+        if self._started is None:
+            raise RuntimeError("Profile session was not started.")
+        self._profiler.disable()
+        elapsed = time.perf_counter() - self._started
+        self._started = None
+        stats = pstats.Stats(self._profiler)
+        # Same layout as Stats.dump_stats, so the download opens with pstats or snakeviz.
+        self.report = ProfileReport(
+            label=self.label,
+            elapsed_seconds=elapsed,
+            top_functions=_top_functions(stats, self.limit),
+            raw=marshal.dumps(stats.stats),
+        )
+        return self.report
+
+    def __enter__(self) -> ProfileSession:
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pandas as pd
+
+# The dataset-independent frame work of the query panel, kept free of Streamlit so the
+# benchmarks time exactly what the app runs.
+
+
+def is_numeric_column(series: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def detect_axes(frame: pd.DataFrame) -> tuple[str | None, str | None, str]:
+    x_col = "gasDay" if "gasDay" in frame.columns else ("date" if "date" in frame.columns else None)
+    numeric_candidates = [col for col in frame.columns if is_numeric_column(frame[col])]
+    y_col = numeric_candidates[0] if numeric_candidates else None
+    y_title = y_col or "Value"
+    return x_col, y_col, y_title
+
+
+def chart_frame(frame: pd.DataFrame, x_col: str | None, y_col: str | None, y_title: str) -> pd.DataFrame | None:
+    if not (x_col and y_col):
+        return None
+    return frame.rename(columns={x_col: "Date", y_col: y_title})
+
+
+def display_frame(frame: pd.DataFrame, y_col: str | None) -> pd.DataFrame:
+    display_data = frame.copy()
+    if y_col:
+        display_data[y_col] = display_data[y_col].map(lambda x: f"{x:,.2f}")
+    return display_data
+
+
+def csv_bytes(frame: pd.DataFrame) -> bytes:
+    return frame.to_csv(index=False).encode("utf-8")
+
+
+def render_prep(frame: pd.DataFrame) -> tuple[pd.DataFrame | None, pd.DataFrame, bytes]:
+    # What the panel builds for a dataset without its own chart or column names.
+    x_col, y_col, y_title = detect_axes(frame)
+    return chart_frame(frame, x_col, y_col, y_title), display_frame(frame, y_col), csv_bytes(frame)
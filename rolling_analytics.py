@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import math
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+from epias_coverage import DAY_COLUMNS
+
+DEFAULT_WINDOW = 30
+# Gas trades every calendar day, so daily volatility annualises over 365 days.
+PERIODS_PER_YEAR = 365
+VOLATILITY_COLUMNS = ["gasDay", "value", "logReturn", "volatility"]
+ZSCORE_COLUMNS = ["gasDay", "value", "mean", "std", "zscore"]
+SPREAD_COLUMNS = ["gasDay", "left", "right", "spread", "mean", "std", "zscore"]
+
+
+def _check_window(window: int) -> None:
+    if window < 2:
+        raise ValueError("window must be at least 2")
+
+
+def _rolling_zscore(values: pd.Series, window: int) -> tuple[pd.Series, pd.Series, pd.Series]:
+    # rolling(window) needs a full window without missing values, like the previous day-by-day trackers.
+    rolling = values.rolling(window)
+    mean = rolling.mean()
+    std = rolling.std()
+    return mean, std, (values - mean) / std.where(std != 0)
+
+
+def _volatility_frame(series: pd.Series, window: int, periods_per_year: int = PERIODS_PER_YEAR) -> pd.DataFrame:
+    prices = series.astype(float)
+    previous = prices.shift(1)
+    # A log return is only defined between two positive prices.
+    ratio = (prices / previous).where((prices > 0) & (previous > 0))
+    log_return = np.log(ratio)
+    volatility = log_return.rolling(window).std() * math.sqrt(periods_per_year)
+    return pd.DataFrame(
+        {"gasDay": series.index, "value": prices, "logReturn": log_return, "volatility": volatility}
+    ).reset_index(drop=True)
+
+
+def _zscore_frame(series: pd.Series, window: int) -> pd.DataFrame:
+    values = series.astype(float)
+    mean, std, zscore = _rolling_zscore(values, window)
+    return pd.DataFrame(
+        {"gasDay": series.index, "value": values, "mean": mean, "std": std, "zscore": zscore}
+    ).reset_index(drop=True)
+
+
+def _spread_frame(pairs: pd.DataFrame, window: int) -> pd.DataFrame:
+    left = pairs["left"].astype(float)
+    right = pairs["right"].astype(float)
+    spread = left - right
+    mean, std, zscore = _rolling_zscore(spread, window)
+    return pd.DataFrame(
+        {
+            "gasDay": pairs.index,
+            "left": left,
+            "right": right,
+            "spread": spread,
+            "mean": mean,
+            "std": std,
+            "zscore": zscore,
+        }
+    ).reset_index(drop=True)
+
+
+def _find_time_column(frame: pd.DataFrame) -> str | None:
+    return next((name for name in DAY_COLUMNS if name in frame.columns), None)
+
+
+def daily_series(frame: pd.DataFrame, value_column: str, time_column: str | None = None) -> pd.Series:
+    time_column = time_column or _find_time_column(frame)
+    if frame.empty or time_column is None or value_column not in frame.columns:
+        return pd.Series(dtype=float, index=pd.DatetimeIndex([], name="gasDay"))
+    # EPIAS timestamps carry a +03:00 offset, so the first ten characters are the local day; a fixed
+    # format parses them far faster than inferring each value.
+    text = frame[time_column].astype("string").str[:10]
+    days = pd.to_datetime(text, format="%Y-%m-%d", errors="coerce")
+    values = pd.to_numeric(frame[value_column], errors="coerce").astype(float)
+    series = pd.Series(values.to_numpy(), index=pd.DatetimeIndex(days, name="gasDay"))
+    series = series[series.index.notna()]
+    # One value per gas day; a later row for the same day is treated as a revision.
+    return series.groupby(level=0).last().sort_index()
+
+
+def rolling_volatility(
+    frame: pd.DataFrame,
+    value_column: str,
+    time_column: str | None = None,
+    window: int = DEFAULT_WINDOW,
+    periods_per_year: int = PERIODS_PER_YEAR,
+) -> pd.DataFrame:
+    _check_window(window)
+    return _volatility_frame(daily_series(frame, value_column, time_column), window, periods_per_year)
+
+
+def rolling_zscore(
+    frame: pd.DataFrame,
+    value_column: str,
+    time_column: str | None = None,
+    window: int = DEFAULT_WINDOW,
+) -> pd.DataFrame:
+    _check_window(window)
+    return _zscore_frame(daily_series(frame, value_column, time_column), window)
+
+
+def _spread_pairs(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_column: str,
+    right_column: str,
+    time_column: str | None,
+) -> pd.DataFrame:
+    pairs = pd.concat(
+        [daily_series(left, left_column, time_column), daily_series(right, right_column, time_column)],
+        axis=1,
+        join="inner",
+    )
+    pairs.columns = ["left", "right"]
+    return pairs
+
+
+def price_spread(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_column: str,
+    right_column: str,
+    time_column: str | None = None,
+    window: int = DEFAULT_WINDOW,
+) -> pd.DataFrame:
+    _check_window(window)
+    return _spread_frame(_spread_pairs(left, right, left_column, right_column, time_column), window)
+
+
+def _first_change(previous: pd.Series | pd.DataFrame, current: pd.Series | pd.DataFrame) -> int:
+    # Position of the first gas day whose date or value differs from the tracked inputs.
+    length = min(len(previous), len(current))
+    old = previous.to_numpy(dtype=float).reshape(len(previous), -1)[:length]
+    new = current.to_numpy(dtype=float).reshape(len(current), -1)[:length]
+    differs = ((old != new) & ~(np.isnan(old) & np.isnan(new))).any(axis=1)
+    differs |= previous.index[:length] != current.index[:length]
+    changed = np.flatnonzero(differs)
+    return int(changed[0]) if len(changed) else length
+
+
+@dataclass
+class _TrackedSeries:
+    inputs: pd.Series | pd.DataFrame
+    result: pd.DataFrame
+
+
+class RollingAnalyticsCache:
+    # Keeps the inputs and results per series. A rerun compares the inputs against the tracked ones
+    # and recomputes only from the first changed gas day, reading one window of earlier days, so an
+    # appended day or a revised one costs a window's worth of work instead of the whole history.
+    def __init__(self) -> None:
+        self._series: dict[tuple, _TrackedSeries] = {}
+        self._lock = threading.Lock()
+
+    def volatility(
+        self,
+        frame: pd.DataFrame,
+        source: str,
+        value_column: str,
+        time_column: str | None = None,
+        window: int = DEFAULT_WINDOW,
+    ) -> pd.DataFrame:
+        _check_window(window)
+        series = daily_series(frame, value_column, time_column)
+        key = ("volatility", source, value_column, window)
+        return self._update(key, series, lambda part: _volatility_frame(part, window), window)
+
+    def zscore(
+        self,
+        frame: pd.DataFrame,
+        source: str,
+        value_column: str,
+        time_column: str | None = None,
+        window: int = DEFAULT_WINDOW,
+    ) -> pd.DataFrame:
+        _check_window(window)
+        series = daily_series(frame, value_column, time_column)
+        key = ("zscore", source, value_column, window)
+        return self._update(key, series, lambda part: _zscore_frame(part, window), window)
+
+    def spread(
+        self,
+        left: pd.DataFrame,
+        right: pd.DataFrame,
+        source: str,
+        left_column: str,
+        right_column: str,
+        time_column: str | None = None,
+        window: int = DEFAULT_WINDOW,
+    ) -> pd.DataFrame:
+        _check_window(window)
+        pairs = _spread_pairs(left, right, left_column, right_column, time_column)
+        key = ("spread", source, left_column, right_column, window)
+        return self._update(key, pairs, lambda part: _spread_frame(part, window), window)
+
+    def _update(
+        self,
+        key: tuple,
+        inputs: pd.Series | pd.DataFrame,
+        compute: Callable[[pd.Series | pd.DataFrame], pd.DataFrame],
+        lookback: int,
+    ) -> pd.DataFrame:
+        if inputs.empty:
+            return compute(inputs)
+        with self._lock:
+            state = self._series.get(key)
+        start = _first_change(state.inputs, inputs) if state is not None else 0
+        if state is not None and start == len(inputs) == len(state.inputs):
+            return state.result.copy()
+
+        # A row depends on at most `lookback` earlier days (the volatility window plus the previous price).
+        context = max(start - lookback, 0)
+        tail = compute(inputs.iloc[context:]).iloc[start - context :]
+        if start == 0:
+            result = tail.reset_index(drop=True)
+        elif tail.empty:
+            result = state.result.iloc[:start].reset_index(drop=True)
+        else:
+            result = pd.concat([state.result.iloc[:start], tail], ignore_index=True)
+        with self._lock:
+            self._series[key] = _TrackedSeries(inputs=inputs, result=result)
+        return result.copy()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from epias_coverage import DAY_COLUMNS, row_days
+from local_store import LocalStore
+
+ROLLUP_FREQUENCIES = ("week", "month")
+PARTIAL_COLUMNS = ["gasDay", "column", "sum", "count", "min", "max"]
+ROLLUP_COLUMNS = ["period", "column", "sum", "count", "mean", "min", "max", "days"]
+STORE_PREFIX = "rollup_"
+
+
+def daily_partials(frame: pd.DataFrame) -> pd.DataFrame | None:
+    # Per gas day and numeric column: the sums, counts and extremes every coarser rollup is built from.
+    days = row_days(frame)
+    if days is None:
+        return None
+    numeric = [
+        column
+        for column in frame.columns
+        if column not in DAY_COLUMNS
+        and pd.api.types.is_numeric_dtype(frame[column])
+        and not pd.api.types.is_bool_dtype(frame[column])
+    ]
+    if frame.empty or not numeric:
+        return pd.DataFrame(columns=PARTIAL_COLUMNS)
+    values = frame[numeric].astype(float)
+    values.index = pd.DatetimeIndex(days, name="gasDay")
+    grouped = values.groupby(level=0).agg(["sum", "count", "min", "max"])
+    grouped.columns.names = ["column", None]
+    partials = grouped.stack(level="column", future_stack=True).reset_index()
+    partials["count"] = partials["count"].astype("int64")
+    return partials[PARTIAL_COLUMNS]
+
+
+def period_start(days: pd.Series, frequency: str) -> pd.Series:
+    if frequency == "week":
+        # Weeks start on Monday.
+        return days - pd.to_timedelta(days.dt.weekday, unit="D")
+    if frequency == "month":
+        return days.dt.to_period("M").dt.start_time
+    raise ValueError(f"frequency must be one of {ROLLUP_FREQUENCIES}, got {frequency!r}")
+
+
+def aggregate_partials(partials: pd.DataFrame, frequency: str) -> pd.DataFrame:
+    if partials.empty:
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+    periods = period_start(partials["gasDay"], frequency).rename("period")
+    rolled = (
+        partials.groupby([periods, "column"], sort=True)
+        .agg(
+            sum=("sum", "sum"),
+            count=("count", "sum"),
+            min=("min", "min"),
+            max=("max", "max"),
+            days=("gasDay", "nunique"),
+        )
+        .reset_index()
+    )
+    rolled["mean"] = rolled["sum"] / rolled["count"].where(rolled["count"] > 0)
+    return rolled[ROLLUP_COLUMNS]
+
+
+def _concat(frames: list[pd.DataFrame], columns: list[str]) -> pd.DataFrame:
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _changed_days(current: pd.DataFrame, incoming: pd.DataFrame) -> np.ndarray:
+    merged = incoming.merge(current, on=["gasDay", "column"], how="left", suffixes=("", "_current"), indicator=True)
+    changed = merged["_merge"] == "left_only"
+    for name in ("sum", "count", "min", "max"):
+        left, right = merged[name], merged[f"{name}_current"]
+        changed |= ~((left == right) | (left.isna() & right.isna()))
+    # A day whose set of columns shrank is also a change.
+    removed = current[current["gasDay"].isin(incoming["gasDay"])].merge(
+        incoming[["gasDay", "column"]], on=["gasDay", "column"], how="left", indicator=True
+    )
+    days = np.concatenate(
+        [merged.loc[changed, "gasDay"].to_numpy(), removed.loc[removed["_merge"] == "left_only", "gasDay"].to_numpy()]
+    )
+    return pd.unique(days)
+
+
+class RollupStore:
+    # Daily partials per dataset are persisted one parquet partition per month; weekly and monthly
+    # rollups are kept materialized in memory and only the periods touching changed days are rebuilt.
+    def __init__(self, store: LocalStore | None = None) -> None:
+        self.store = store
+        self._partials: dict[str, pd.DataFrame] = {}
+        self._rollups: dict[tuple[str, str], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _store_name(self, dataset: str) -> str:
+        return f"{STORE_PREFIX}{dataset}"
+
+    def _load(self, dataset: str) -> pd.DataFrame:
+        partials = self._partials.get(dataset)
+        if partials is None:
+            partials = pd.DataFrame(columns=PARTIAL_COLUMNS)
+            if self.store is not None and self.store.partitions(self._store_name(dataset)):
+                partials = self.store.read(self._store_name(dataset))[PARTIAL_COLUMNS]
+            self._partials[dataset] = partials
+            for frequency in ROLLUP_FREQUENCIES:
+                self._rollups[(dataset, frequency)] = aggregate_partials(partials, frequency)
+        return partials
+
+    def update(self, dataset: str, frame: pd.DataFrame) -> int:
+        incoming = daily_partials(frame)
+        if incoming is None or incoming.empty:
+            return 0
+        with self._lock:
+            current = self._load(dataset)
+            changed = _changed_days(current, incoming)
+            if not len(changed):
+                return 0
+            partials = _concat(
+                [current[~current["gasDay"].isin(changed)], incoming[incoming["gasDay"].isin(changed)]],
+                PARTIAL_COLUMNS,
+            ).sort_values(["gasDay", "column"], ignore_index=True)
+            self._partials[dataset] = partials
+
+            for frequency in ROLLUP_FREQUENCIES:
+                touched = period_start(pd.Series(changed), frequency).unique()
+                periods = period_start(partials["gasDay"], frequency)
+                rebuilt = aggregate_partials(partials[periods.isin(touched)], frequency)
+                rollup = self._rollups[(dataset, frequency)]
+                self._rollups[(dataset, frequency)] = _concat(
+                    [rollup[~rollup["period"].isin(touched)], rebuilt],
+                    ROLLUP_COLUMNS,
+                ).sort_values(["period", "column"], ignore_index=True)
+
+            if self.store is not None:
+                months = period_start(partials["gasDay"], "month")
+                for month in period_start(pd.Series(changed), "month").unique():
+                    self.store.write(
+                        self._store_name(dataset),
+                        partials[months == month],
+                        partition=month.strftime("%Y-%m"),
+                    )
+        return len(changed)
+
+    def rollup(self, dataset: str, frequency: str) -> pd.DataFrame:
+        if frequency not in ROLLUP_FREQUENCIES:
+            raise ValueError(f"frequency must be one of {ROLLUP_FREQUENCIES}, got {frequency!r}")
+        with self._lock:
+            self._load(dataset)
+            return self._rollups[(dataset, frequency)].copy()
+
+    def has(self, dataset: str) -> bool:
+        with self._lock:
+            if dataset in self._partials:
+                return not self._partials[dataset].empty
+        return self.store is not None and bool(self.store.partitions(self._store_name(dataset)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._partials.clear()
+            self._rollups.clear()
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from epias_arrow import to_arrow_or_none
+from epias_coverage import row_days
+from local_store import LocalStore
+
+DEFAULT_ROW_LIMIT = int(os.getenv("EPIAS_SQL_ROW_LIMIT", "10000"))
+DEFAULT_TIMEOUT_SECONDS = float(os.getenv("EPIAS_SQL_TIMEOUT_SECONDS", "30"))
+DEFAULT_MAX_BYTES = int(os.getenv("EPIAS_SQL_MAX_BYTES", str(512 * 1024 * 1024)))
+
+
+class SqlQueryError(RuntimeError):
+    pass
+
+
+def table_name(dataset: str) -> str:
+    name = re.sub(r"[^0-9A-Za-z]+", "_", dataset).strip("_").lower() or "dataset"
+    return f"t_{name}" if name[0].isdigit() else name
+
+
+@dataclass(frozen=True)
+class SqlTable:
+    name: str
+    dataset: str
+    source: str
+    rows: int | None
+    columns: tuple[str, ...]
+    loaded_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class QueryResult:
+    frame: pd.DataFrame
+    elapsed_seconds: float
+    truncated: bool
+    limit: int
+
+
+def _nbytes(data: Any) -> int:
+    return data.nbytes if isinstance(data, pa.Table) else int(data.memory_usage(index=False).sum())
+
+
+def _column_names(data: Any) -> tuple[str, ...]:
+    return tuple(str(column) for column in (data.column_names if isinstance(data, pa.Table) else data.columns))
+
+
+def _upsert_arrow(
+    current: pa.Table,
+    current_days: np.ndarray,
+    incoming: pa.Table,
+    incoming_days: np.ndarray,
+) -> tuple[pa.Table, np.ndarray]:
+    # Dropping the replaced days and appending the fetch shares the kept column buffers, so a small
+    # fetch into a large held table costs the filter, not a round trip through pandas.
+    keep = ~np.isin(current_days, incoming_days)
+    merged = pa.concat_tables([current.filter(pa.array(keep)), incoming], promote_options="default")
+    days = np.concatenate([current_days[keep], incoming_days])
+    if len(days) > 1 and (days[1:] < days[:-1]).any():
+        order = np.argsort(days, kind="stable")
+        merged, days = merged.take(pa.array(order)), days[order]
+    return merged, days
+
+
+def _upsert(current: pd.DataFrame, incoming: pd.DataFrame) -> pd.DataFrame:
+    # Rows for the gas days in the incoming frame replace the held ones; every other day is kept.
+    current_days, incoming_days = row_days(current), row_days(incoming)
+    if current_days is None or incoming_days is None:
+        return incoming
+    keep = ~np.isin(current_days, incoming_days)
+    merged = pd.concat([current[keep], incoming], ignore_index=True)
+    order = np.argsort(np.concatenate([current_days[keep], incoming_days]), kind="stable")
+    return merged.take(order).reset_index(drop=True)
+
+
+def _merge(current: Any, current_days: np.ndarray, incoming: Any, incoming_days: np.ndarray) -> tuple[Any, Any]:
+    if isinstance(current, pa.Table) and isinstance(incoming, pa.Table):
+        try:
+            return _upsert_arrow(current, current_days, incoming, incoming_days)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # A column changed type between fetches; pandas reconciles it below.
+            pass
+    current = current.to_pandas() if isinstance(current, pa.Table) else current
+    incoming = incoming.to_pandas() if isinstance(incoming, pa.Table) else incoming
+    merged = _upsert(current, incoming)
+    arrow = to_arrow_or_none(merged)
+    return (merged if arrow is None else arrow), row_days(merged)
+
+
+class SqlWorkspace:
+    # Every dataset fetched in this server is kept as an Arrow table and every LocalStore dataset
+    # is exposed as a parquet scan; DuckDB pushes projections and filters into both. Sessions share
+    # the tables, so each fetch is upserted by gas day rather than replacing what others fetched.
+    # Fetched tables past max_bytes are dropped, least recently registered first.
+    def __init__(self, store: LocalStore | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.store = store
+        self.max_bytes = max_bytes
+        self._tables: OrderedDict[str, tuple[SqlTable, Any]] = OrderedDict()
+        self._days: dict[str, np.ndarray | None] = {}
+        self._lock = threading.Lock()
+
+    def register(self, dataset: str, frame: pd.DataFrame) -> SqlTable:
+        name = table_name(dataset)
+        incoming_days = row_days(frame)
+        # DuckDB scans the pandas frame when it has no Arrow table.
+        arrow = to_arrow_or_none(frame)
+        data, days = (frame if arrow is None else arrow), incoming_days
+        with self._lock:
+            held = self._tables.get(name)
+            current_days = self._days.get(name)
+            if held is not None and current_days is not None and incoming_days is not None:
+                data, days = _merge(held[1], current_days, data, incoming_days)
+            table = SqlTable(
+                name=name,
+                dataset=dataset,
+                source="fetched",
+                rows=len(data),
+                columns=_column_names(data),
+                loaded_at=datetime.now(),
+            )
+            self._tables[name] = (table, data)
+            self._tables.move_to_end(name)
+            self._days[name] = days
+            self._evict(keep=name)
+        return table
+
+    def _evict(self, keep: str) -> None:
+        total = sum(_nbytes(data) for _, data in self._tables.values())
+        for name in list(self._tables):
+            if total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            total -= _nbytes(self._tables.pop(name)[1])
+            self._days.pop(name, None)
+
+    def _stored(self) -> dict[str, tuple[SqlTable, Any]]:
+        if self.store is None:
+            return {}
+        stored = {}
+        for directory in self.store.datasets():
+            files = sorted(str(path) for path in (self.store.root / directory).glob("*.parquet"))
+            if not files:
+                continue
+            data = ds.dataset(files, format="parquet")
+            table = SqlTable(
+                name=table_name(f"store_{directory}"),
+                dataset=directory,
+                source="stored",
+                rows=None,
+                columns=tuple(data.schema.names),
+            )
+            stored[table.name] = (table, data)
+        return stored
+
+    def _sources(self) -> dict[str, tuple[SqlTable, Any]]:
+        with self._lock:
+            sources = dict(self._tables)
+        return {**self._stored(), **sources}
+
+    def tables(self) -> list[SqlTable]:
+        return sorted((table for table, _ in self._sources().values()), key=lambda table: table.name)
+
+    def query(
+        self,
+        sql: str,
+        limit: int = DEFAULT_ROW_LIMIT,
+        timeout_seconds: float = DEFAULT_TIMEOUT_SECONDS,
+    ) -> QueryResult:
+        # Imported here so the rest of the app runs without DuckDB installed.
+        try:
+            import duckdb
+        except ImportError as exc:
+            raise SqlQueryError("The SQL tab needs the duckdb package (pip install duckdb).") from exc
+
+        if not sql.strip():
+            raise SqlQueryError("Query is empty.")
+        connection = duckdb.connect(":memory:")
+        timer = threading.Timer(timeout_seconds, connection.interrupt) if timeout_seconds > 0 else None
+        try:
+            for name, (_, data) in self._sources().items():
+                connection.register(name, data)
+            # Tables are registered objects, so queries never need to touch the filesystem.
+            connection.execute("SET enable_external_access = false")
+            connection.execute("SET lock_configuration = true")
+            started = time.perf_counter()
+            if timer is not None:
+                timer.start()
+            relation = connection.sql(sql)
+            if relation is None:
+                frame = pd.DataFrame()
+            else:
+                # One extra row tells whether the limit cut the result.
+                frame = relation.limit(limit + 1).df()
+            elapsed = time.perf_counter() - started
+        except duckdb.InterruptException as exc:
+            raise SqlQueryError(f"Query cancelled after {timeout_seconds:g} seconds.") from exc
+        except duckdb.Error as exc:
+            raise SqlQueryError(str(exc)) from exc
+        finally:
+            if timer is not None:
+                timer.cancel()
+            connection.close()
+        truncated = len(frame) > limit
+        return QueryResult(frame=frame.head(limit), elapsed_seconds=elapsed, truncated=truncated, limit=limit)
+
+    def discard(self, name: str) -> None:
+        with self._lock:
+            self._tables.pop(name, None)
+            self._days.pop(name, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tables.clear()
+            self._days.clear()
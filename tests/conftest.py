@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# The app modules live at the repository root; snapshots and the shared cache stay off under test.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ["EPIAS_SNAPSHOT_DIR"] = ""
+os.environ["EPIAS_CACHE_DB"] = ""
+
+from epias_cache import response_cache  # noqa: E402
+from epias_coverage import coverage_index  # noqa: E402
+from epias_transport import TransportResponse, set_transport  # noqa: E402
+
+
+class FakeTransport:
+    # Answers listing requests with the items returned for each request body.
+    def __init__(self, items) -> None:
+        self.items = items
+        self.bodies: list[dict] = []
+
+    def post(self, url, headers, timeout, json_body=None, form=None) -> TransportResponse:
+        self.bodies.append(json_body)
+        return TransportResponse(status_code=200, content=json.dumps({"items": self.items(json_body)}).encode())
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    response_cache.clear()
+    coverage_index.clear()
+    yield
+    set_transport(None)
+    response_cache.clear()
+    coverage_index.clear()
+
+
+@pytest.fixture
+def fake_epias():
+    def install(items) -> FakeTransport:
+        transport = FakeTransport(items)
+        set_transport(transport)
+        return transport
+
+    return install
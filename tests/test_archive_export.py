@@ -0,0 +1,64 @@
+import threading
+import urllib.error
+import urllib.request
+import zipfile
+
+import pandas as pd
+import pytest
+
+from archive_export import start_export_server, write_archive
+
+FRAME = pd.DataFrame({"gasDay": ["2024-06-01", "2024-06-02"], "price": [1.5, 2.5]})
+
+
+def test_failed_export_leaves_no_files(tmp_path):
+    def broken():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        write_archive(tmp_path / "2024-06.zip", [("Price", lambda: FRAME), ("Broken", broken)])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_concurrent_exports_use_separate_temp_files(tmp_path):
+    target = tmp_path / "2024-06.zip"
+    inside = threading.Barrier(2, timeout=5)
+
+    def load():
+        # Both exports hold their temp file open at the same time.
+        inside.wait()
+        return FRAME
+
+    threads = [threading.Thread(target=write_archive, args=(target, [("Price", load)])) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert [path.name for path in tmp_path.iterdir()] == ["2024-06.zip"]
+    with zipfile.ZipFile(target) as archive:
+        assert sorted(archive.namelist()) == ["manifest.json", "price.csv"]
+
+
+def test_export_server_streams_only_archives(tmp_path):
+    write_archive(tmp_path / "2024-06.zip", [("Price", lambda: FRAME)])
+    (tmp_path / "notes.txt").write_text("private")
+    server = start_export_server(0, directory=tmp_path)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base_url}/2024-06.zip") as response:
+            assert response.read() == (tmp_path / "2024-06.zip").read_bytes()
+        for name in ("notes.txt", "missing.zip", "..%2F2024-06.zip"):
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"{base_url}/{name}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_frames_without_an_arrow_type_fall_back_to_csv(tmp_path):
+    mixed = pd.DataFrame({"gasDay": ["2024-06-01", "2024-06-02"], "note": [1, "a"]})
+    datasets = [("Price", lambda: FRAME), ("Notes", lambda: mixed)]
+    target = write_archive(tmp_path / "2024-06.zip", datasets, fmt="parquet")
+
+    with zipfile.ZipFile(target) as archive:
+        assert sorted(archive.namelist()) == ["manifest.json", "notes.csv", "price.parquet"]
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from correlation import CorrelationCache, align_daily, compute_correlations, daily_numeric_series
+
+START, END = date(2024, 1, 1), date(2024, 3, 31)
+DAYS = pd.date_range(START, END, freq="D")
+
+
+def _frame(values: np.ndarray, column: str = "gasDay") -> pd.DataFrame:
+    return pd.DataFrame({column: DAYS.strftime("%Y-%m-%dT00:00:00+03:00"), "price": values})
+
+
+def _walk(seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=len(DAYS)).cumsum()
+
+
+def test_lagged_correlation_matches_shifted_pandas_corr_and_finds_the_leader():
+    leader = np.random.default_rng(1).normal(size=len(DAYS))
+    # The follower repeats the leader three days later, plus a little noise.
+    follower = np.roll(leader, 3) + np.random.default_rng(2).normal(scale=0.1, size=len(DAYS))
+    follower[:3] = np.nan
+    panel = align_daily(
+        [daily_numeric_series(_frame(leader), "A"), daily_numeric_series(_frame(follower), "B")], START, END
+    )
+    result = compute_correlations(panel, max_lag=5)
+
+    for lag in range(-5, 6):
+        expected = panel["A: price"].corr(panel["B: price"].shift(-lag))
+        assert np.isclose(result.lagged[lag + 5, 0, 1], expected)
+    pairs = result.lead_lag()
+    assert pairs.loc[0, ["leader", "follower", "lagDays"]].tolist() == ["A: price", "B: price", 3]
+    assert pairs.loc[0, "correlation"] > 0.95
+
+
+def test_incremental_update_matches_a_full_recompute():
+    cache = CorrelationCache()
+    frames = {name: _frame(_walk(seed)) for seed, name in enumerate(("A", "B", "C"))}
+    cache.update(frames, START, END, max_lag=4)
+    frames["B"] = _frame(_walk(10))
+    updated = cache.update(frames, START, END, max_lag=4)
+
+    full = compute_correlations(updated.panel, max_lag=4)
+    np.testing.assert_allclose(updated.lagged, full.lagged, equal_nan=True)
+    assert cache.update(frames, START, END, max_lag=4) is updated
+
+
+def test_trade_dated_datasets_are_correlated_and_unusable_ones_are_reported():
+    frames = {
+        "SGP": _frame(_walk(1)),
+        "GFM": _frame(_walk(2), column="transactionDate"),
+        "Flat": _frame(np.ones(len(DAYS))),
+        "Text": pd.DataFrame({"gasDay": ["2024-01-01"], "note": ["x"]}),
+    }
+    result = CorrelationCache().update(frames, START, END)
+
+    assert result.columns == ["SGP: price", "GFM: price"]
+    assert result.skipped == ("Flat", "Text")
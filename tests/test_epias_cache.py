@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from epias_cache import STORED_AT_ATTR, CacheEntry, ResponseCache, track_stale_reads
+from epias_metrics import CACHE_REQUESTS
+
+FRAME = pd.DataFrame({"gasDay": ["2024-01-01"], "price": [1.0]})
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def test_concurrent_misses_share_one_load():
+    cache = ResponseCache(name="test-single-flight")
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return FRAME
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.get_or_load("key", load)))
+    leader.start()
+    wait_until(lambda: "key" in cache._inflight)
+    followers = [threading.Thread(target=lambda: results.append(cache.get_or_load("key", load))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    wait_until(lambda: CACHE_REQUESTS.value(cache="test-single-flight", result="coalesced") == 4)
+    release.set()
+    for thread in (leader, *followers):
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    for frame in results:
+        pd.testing.assert_frame_equal(frame, FRAME)
+    # Every caller gets its own copy, and later callers are answered from the cache.
+    assert len({id(frame) for frame in results}) == 5
+    cache.get_or_load("key", load)
+    assert len(calls) == 1
+
+
+def test_a_failed_load_reaches_every_waiter_and_is_not_cached():
+    cache = ResponseCache(name="test-single-flight-error")
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise RuntimeError("EPIAS down")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_load("key", fail)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call)]
+    threads[0].start()
+    wait_until(lambda: "key" in cache._inflight)
+    threads.append(threading.Thread(target=call))
+    threads[1].start()
+    wait_until(lambda: CACHE_REQUESTS.value(cache="test-single-flight-error", result="coalesced") == 1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert [str(error) for error in errors] == ["EPIAS down", "EPIAS down"]
+    assert cache.get("key") is None
+    assert "key" not in cache._inflight
+
+
+def test_entries_expire_and_the_least_recently_used_is_evicted():
+    cache = ResponseCache(ttl_seconds=60, max_entries=2, name="test-lru")
+    for key in ("a", "b"):
+        cache.put(key, FRAME)
+    cache.get("a")
+    cache.put("c", FRAME)
+
+    assert list(cache._entries) == ["a", "c"]
+    assert cache.get("a").attrs[STORED_AT_ATTR] == pytest.approx(time.time(), abs=5)
+
+    # Past the TTL and with no staleness budget, the entry no longer answers.
+    cache._insert("a", CacheEntry(FRAME, stored_at=time.time() - 120, expires_at=time.time() - 60))
+    calls = []
+    cache.get_or_load("a", lambda: calls.append(1) or FRAME)
+    assert calls == [1]
+
+
+def expired_cache(name: str) -> ResponseCache:
+    cache = ResponseCache(ttl_seconds=60, name=name)
+    cache._insert("key", CacheEntry(FRAME, stored_at=time.time() - 120, expires_at=time.time() - 60))
+    return cache
+
+
+def test_a_stale_entry_within_budget_answers_now_and_refreshes_in_the_background():
+    cache = expired_cache("test-stale")
+    release = threading.Event()
+    fresh = FRAME.assign(price=[2.0])
+
+    def load():
+        release.wait(5)
+        return fresh
+
+    with track_stale_reads() as reads:
+        frame = cache.get_or_load("key", load, max_stale_seconds=300)
+    pd.testing.assert_frame_equal(frame, FRAME)
+    assert len(reads) == 1
+    assert "key" in cache._inflight
+
+    release.set()
+    wait_until(lambda: "key" not in cache._inflight)
+    pd.testing.assert_frame_equal(cache.get_or_load("key", load), fresh)
+
+
+def test_a_stale_entry_past_the_budget_is_loaded_in_the_foreground():
+    cache = expired_cache("test-stale-budget")
+    fresh = FRAME.assign(price=[2.0])
+
+    with track_stale_reads() as reads:
+        frame = cache.get_or_load("key", lambda: fresh, max_stale_seconds=30)
+    pd.testing.assert_frame_equal(frame, fresh)
+    assert reads == []
+
+
+def test_a_failed_refresh_is_not_retried_on_every_read():
+    cache = expired_cache("test-stale-retry")
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise RuntimeError("EPIAS down")
+
+    cache.get_or_load("key", fail, max_stale_seconds=300)
+    wait_until(lambda: calls and "key" not in cache._inflight)
+    frame = cache.get_or_load("key", fail, max_stale_seconds=300)
+
+    pd.testing.assert_frame_equal(frame, FRAME)
+    assert len(calls) == 1
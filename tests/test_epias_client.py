@@ -0,0 +1,40 @@
+from dataclasses import replace
+from datetime import date
+
+import pandas as pd
+
+from epias_cache import response_cache
+from epias_client import EpiasConfig, fetch_sgp_daily_reference_price
+
+CONFIG = EpiasConfig(base_url="http://epias.test", tgt="tgt")
+ROWS = [
+    {"gasDay": f"2024-01-{day:02d}T00:00:00+03:00", "price": 1000.5 + day, "volume": day * 10, "region": "TR"}
+    for day in range(1, 11)
+]
+
+
+def test_compact_frames_keep_values_with_smaller_dtypes(fake_epias):
+    fake_epias(lambda body: ROWS)
+    plain = fetch_sgp_daily_reference_price(CONFIG, date(2024, 1, 1), date(2024, 1, 10))
+    response_cache.clear()
+    compact = fetch_sgp_daily_reference_price(
+        replace(CONFIG, compact=True, downcast_numeric=True), date(2024, 1, 1), date(2024, 1, 10)
+    )
+
+    assert plain["gasDay"].tolist() == [date(2024, 1, day) for day in range(1, 11)]
+    assert compact["gasDay"].dtype == "datetime64[ns]"
+    assert compact["gasDay"].tolist() == [pd.Timestamp(2024, 1, day) for day in range(1, 11)]
+    assert isinstance(compact["region"].dtype, pd.CategoricalDtype)
+    assert compact["price"].dtype == "float32"
+    assert compact["volume"].dtype == "Int32"
+    assert compact["price"].astype(float).round(1).tolist() == plain["price"].tolist()
+    assert compact["volume"].astype(int).tolist() == plain["volume"].tolist()
+    assert compact.memory_usage(deep=True).sum() < plain.memory_usage(deep=True).sum()
+
+
+def test_compact_mode_leaves_mostly_unique_strings_alone(fake_epias):
+    fake_epias(lambda body: [{**row, "region": f"R{index}"} for index, row in enumerate(ROWS)])
+    compact = fetch_sgp_daily_reference_price(replace(CONFIG, compact=True), date(2024, 1, 1), date(2024, 1, 10))
+
+    assert compact["region"].dtype == object
+    assert compact["price"].dtype == "float64"
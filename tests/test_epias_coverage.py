@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from epias_cache import response_cache
+from epias_client import EpiasConfig, fetch_sgp_daily_reference_price, fetch_sgp_weekly_ref_price
+from epias_coverage import CoverageIndex, merge_intervals, missing_ranges, split_ranges
+from epias_transport import RecordingTransport, get_transport, set_transport
+
+
+def day(value: int) -> date:
+    return date(2024, 1, value)
+
+
+def daily_rows(start: date, end: date) -> pd.DataFrame:
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    return pd.DataFrame({"gasDay": [f"{item.isoformat()}T00:00:00+03:00" for item in days], "price": range(len(days))})
+
+
+class RecordingLoader:
+    def __init__(self, rows=daily_rows) -> None:
+        self.rows = rows
+        self.calls: list[tuple[date, date]] = []
+
+    def __call__(self, start: date, end: date) -> pd.DataFrame:
+        self.calls.append((start, end))
+        return self.rows(start, end)
+
+
+def test_merge_intervals_joins_overlapping_and_adjacent_ranges():
+    assert merge_intervals([(day(5), day(8)), (day(1), day(4)), (day(10), day(12))]) == [
+        (day(1), day(8)),
+        (day(10), day(12)),
+    ]
+
+
+def test_missing_ranges_finds_gaps_on_both_sides():
+    assert missing_ranges([(day(5), day(10))], day(1), day(15)) == [(day(1), day(4)), (day(11), day(15))]
+    assert missing_ranges([(day(1), day(15))], day(3), day(9)) == []
+
+
+def test_split_ranges_cuts_at_piece_edges():
+    assert split_ranges([(day(1), day(10))], [(day(4), day(6))]) == [
+        (day(1), day(3)),
+        (day(4), day(6)),
+        (day(7), day(10)),
+    ]
+
+
+def test_shifted_window_requests_only_uncovered_days():
+    index = CoverageIndex(ttl_seconds=300)
+    loader = RecordingLoader()
+    index.load("series", day(1), day(10), loader)
+    window = index.load("series", day(5), day(15), loader)
+
+    assert loader.calls == [(day(1), day(10)), (day(11), day(15))]
+    assert window["gasDay"].str[:10].tolist() == [day(value).isoformat() for value in range(5, 16)]
+
+
+def test_window_inside_coverage_makes_no_request():
+    index = CoverageIndex(ttl_seconds=300)
+    loader = RecordingLoader()
+    first = index.load("series", day(1), day(20), loader)
+    window = index.load("series", day(3), day(4), loader)
+
+    assert loader.calls == [(day(1), day(20))]
+    pd.testing.assert_frame_equal(window, first.iloc[2:4].reset_index(drop=True))
+
+
+def test_gaps_on_both_sides_are_fetched_and_stitched_in_day_order():
+    index = CoverageIndex(ttl_seconds=300)
+    loader = RecordingLoader()
+    index.load("series", day(10), day(12), loader)
+    window = index.load("series", day(8), day(14), loader)
+
+    assert sorted(loader.calls[1:]) == [(day(8), day(9)), (day(13), day(14))]
+    assert window["gasDay"].str[:10].tolist() == [day(value).isoformat() for value in range(8, 15)]
+    assert not window["gasDay"].duplicated().any()
+
+
+def test_rows_without_a_day_column_are_served_whole():
+    index = CoverageIndex(ttl_seconds=300)
+    loader = RecordingLoader(lambda start, end: pd.DataFrame({"name": ["a", "b"]}))
+    index.load("series", day(1), day(10), loader)
+    window = index.load("series", day(5), day(15), loader)
+
+    assert loader.calls[-1] == (day(5), day(15))
+    assert window["name"].tolist() == ["a", "b"]
+
+
+def test_expired_coverage_is_requested_again():
+    index = CoverageIndex(ttl_seconds=300)
+    loader = RecordingLoader()
+    index.load("series", day(1), day(10), loader)
+    index.ttl_seconds = 1e-9
+    index.load("series", day(1), day(10), loader)
+
+    assert loader.calls == [(day(1), day(10)), (day(1), day(10))]
+
+
+def _body_days(body: dict) -> tuple[date, date]:
+    return (
+        datetime.fromisoformat(body["startDate"]).date(),
+        datetime.fromisoformat(body["endDate"]).date(),
+    )
+
+
+def test_daily_endpoint_requests_only_the_new_days(fake_epias):
+    def items(body):
+        start, end = _body_days(body)
+        return daily_rows(start, end).to_dict("records")
+
+    transport = fake_epias(items)
+    config = EpiasConfig(base_url="http://epias.test", tgt="tgt")
+    fetch_sgp_daily_reference_price(config, day(1), day(10))
+    frame = fetch_sgp_daily_reference_price(config, day(5), day(15))
+
+    assert [_body_days(body) for body in transport.bodies] == [(day(1), day(10)), (day(11), day(15))]
+    assert len(frame) == 11
+
+
+def test_weekly_endpoint_keeps_rows_keyed_by_week_start(fake_epias):
+    # Weeks start before the requested days, so the rows must not be filtered to them.
+    def items(body):
+        start, _ = _body_days(body)
+        week = start - timedelta(days=start.weekday())
+        return [{"gasDay": f"{week.isoformat()}T00:00:00+03:00", "price": 1000.0}]
+
+    transport = fake_epias(items)
+    config = EpiasConfig(base_url="http://epias.test", tgt="tgt")
+    first = fetch_sgp_weekly_ref_price(config, day(3), day(20))
+    second = fetch_sgp_weekly_ref_price(config, day(10), day(12))
+
+    assert first["gasDay"].tolist() == [day(1)]
+    assert second["gasDay"].tolist() == [day(8)]
+    assert [_body_days(body) for body in transport.bodies] == [(day(3), day(20)), (day(10), day(12))]
+
+
+def test_cassette_recording_sends_full_ranges(fake_epias, tmp_path):
+    def items(body):
+        start, end = _body_days(body)
+        return daily_rows(start, end).to_dict("records")
+
+    transport = fake_epias(items)
+    set_transport(RecordingTransport(get_transport(), cassette_dir=tmp_path))
+    config = EpiasConfig(base_url="http://epias.test", tgt="tgt")
+    fetch_sgp_daily_reference_price(config, day(1), day(10))
+    fetch_sgp_daily_reference_price(config, day(5), day(15))
+
+    assert [_body_days(body) for body in transport.bodies] == [(day(1), day(10)), (day(5), day(15))]
+
+
+def test_uncached_reads_always_request_the_full_range(fake_epias):
+    def items(body):
+        start, end = _body_days(body)
+        return daily_rows(start, end).to_dict("records")
+
+    transport = fake_epias(items)
+    config = EpiasConfig(base_url="http://epias.test", tgt="tgt", use_cache=False)
+    fetch_sgp_daily_reference_price(config, day(1), day(10))
+    fetch_sgp_daily_reference_price(config, day(5), day(15))
+
+    assert [_body_days(body) for body in transport.bodies] == [(day(1), day(10)), (day(5), day(15))]
+    assert not response_cache._entries
@@ -0,0 +1,58 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from epias_metrics import MetricsRegistry, registry, start_metrics_server
+
+
+def test_counters_and_histograms_render_in_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.counter("test_requests_total", "Requests.", ("endpoint", "status"))
+    latency = registry.histogram("test_latency_seconds", "Latency.", ("endpoint",), buckets=(0.1, 1.0))
+    requests.inc(endpoint="/spot", status="200")
+    requests.inc(2, endpoint='/a "quoted"\npath', status="500")
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, endpoint="/spot")
+
+    assert registry.render().splitlines() == [
+        "# HELP test_latency_seconds Latency.",
+        "# TYPE test_latency_seconds histogram",
+        'test_latency_seconds_bucket{endpoint="/spot",le="0.1"} 2',
+        'test_latency_seconds_bucket{endpoint="/spot",le="1"} 3',
+        'test_latency_seconds_bucket{endpoint="/spot",le="+Inf"} 4',
+        'test_latency_seconds_sum{endpoint="/spot"} 3.65',
+        'test_latency_seconds_count{endpoint="/spot"} 4',
+        "# HELP test_requests_total Requests.",
+        "# TYPE test_requests_total counter",
+        'test_requests_total{endpoint="/a \\"quoted\\"\\npath",status="500"} 2',
+        'test_requests_total{endpoint="/spot",status="200"} 1',
+    ]
+
+
+def test_registering_a_name_twice_returns_the_first_metric():
+    registry = MetricsRegistry()
+    first = registry.counter("test_total", "First.")
+    first.inc()
+
+    assert registry.counter("test_total", "Second.") is first
+    assert registry.render().splitlines()[-1] == "test_total 1"
+
+
+def test_textfile_and_http_exports_serve_the_rendered_registry(tmp_path):
+    target = tmp_path / "epias.prom"
+    registry.write_textfile(target)
+    assert "# TYPE epias_cache_requests_total counter" in target.read_text()
+    assert [path.name for path in tmp_path.iterdir()] == ["epias.prom"]
+
+    server = start_metrics_server(0)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        with urllib.request.urlopen(f"{base_url}/metrics") as response:
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            assert "# TYPE epias_request_duration_seconds histogram" in response.read().decode()
+        with pytest.raises(urllib.error.HTTPError):
+            urllib.request.urlopen(f"{base_url}/other")
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from epias_scheduler import BACKFILL, INTERACTIVE, PREFETCH, RequestScheduler, current_priority, request_priority
+
+
+def wait_until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def waiting(scheduler: RequestScheduler) -> int:
+    return sum(queued for _, queued in scheduler.stats().values())
+
+
+def hold(scheduler: RequestScheduler, priority: str, release: threading.Event, entered: list, label: str = "") -> None:
+    def run() -> None:
+        with scheduler.slot(priority):
+            entered.append(label or priority)
+            release.wait(5)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def test_waiting_requests_start_by_class_then_arrival():
+    scheduler = RequestScheduler(max_concurrent=1)
+    blocker, release = threading.Event(), threading.Event()
+    hold(scheduler, BACKFILL, blocker, [])
+    wait_until(lambda: scheduler.stats()[BACKFILL] == (1, 0))
+
+    release.set()
+    entered: list[str] = []
+    queued = [("backfill-1", BACKFILL), ("prefetch", PREFETCH), ("backfill-2", BACKFILL), ("interactive", INTERACTIVE)]
+    for count, (label, priority) in enumerate(queued, start=1):
+        hold(scheduler, priority, release, entered, label)
+        wait_until(lambda: waiting(scheduler) == count)
+    blocker.set()
+
+    wait_until(lambda: len(entered) == 4)
+    assert entered == ["interactive", "prefetch", "backfill-1", "backfill-2"]
+
+
+def test_class_limits_leave_slots_for_interactive_requests():
+    scheduler = RequestScheduler(max_concurrent=3, class_limits={BACKFILL: 2})
+    release = threading.Event()
+    entered: list[str] = []
+    for _ in range(4):
+        hold(scheduler, BACKFILL, release, entered)
+    wait_until(lambda: scheduler.stats()[BACKFILL] == (2, 2))
+
+    hold(scheduler, INTERACTIVE, release, entered)
+    wait_until(lambda: scheduler.stats()[INTERACTIVE] == (1, 0))
+    # The global limit is now reached, so a prefetch waits even though its class has room.
+    hold(scheduler, PREFETCH, release, entered)
+    wait_until(lambda: scheduler.stats()[PREFETCH] == (0, 1))
+
+    release.set()
+    wait_until(lambda: len(entered) == 6)
+    assert all(running == 0 for running, _ in scheduler.stats().values())
+
+
+def test_slots_take_the_priority_of_the_calling_context():
+    scheduler = RequestScheduler(max_concurrent=2)
+    assert current_priority() == INTERACTIVE
+    with request_priority(PREFETCH):
+        with scheduler.slot():
+            assert scheduler.stats()[PREFETCH] == (1, 0)
+    assert current_priority() == INTERACTIVE
+    with pytest.raises(ValueError):
+        with request_priority("urgent"):
+            pass
@@ -0,0 +1,61 @@
+import time
+
+import pandas as pd
+
+from epias_cache import ResponseCache
+from epias_snapshot import CacheSnapshot
+
+FRAME = pd.DataFrame({"gasDay": ["2024-01-01", "2024-01-02"], "price": [1.5, 2.5]})
+
+
+def cache(directory) -> ResponseCache:
+    # No background snapshot thread; the test saves explicitly.
+    return ResponseCache(
+        ttl_seconds=60, name="test-snapshot", snapshot=CacheSnapshot(directory), snapshot_interval_seconds=0
+    )
+
+
+def test_a_new_process_warm_starts_from_the_snapshot(tmp_path):
+    writer = cache(tmp_path)
+    writer.put("key", FRAME)
+    stored_at = writer._entries["key"].stored_at
+    assert writer.save_snapshot() == 1
+    assert writer.save_snapshot() == 0
+
+    reader = cache(tmp_path)
+    frame = reader.get_or_load("key", lambda: pd.DataFrame({"unexpected": [1]}))
+
+    pd.testing.assert_frame_equal(frame, FRAME)
+    # A restored entry keeps its original freshness.
+    assert reader._entries["key"].stored_at == stored_at
+
+
+def test_expired_entries_are_neither_written_nor_loaded(tmp_path):
+    now = time.time()
+    snapshot = CacheSnapshot(tmp_path)
+    snapshot.write([("old", FRAME, now - 120, now - 60), ("new", FRAME, now, now + 60)])
+
+    assert CacheSnapshot(tmp_path).load("old") is None
+    assert CacheSnapshot(tmp_path).load("new") is not None
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+
+
+def test_the_newest_copy_of_a_key_wins_and_replaced_files_are_pruned(tmp_path):
+    now = time.time()
+    older = FRAME.assign(price=[0.0, 0.0])
+    CacheSnapshot(tmp_path).write([("key", FRAME, now, now + 60)])
+    # Another process holding an older copy does not overwrite it.
+    CacheSnapshot(tmp_path).write([("key", older, now - 10, now + 50)])
+    assert CacheSnapshot(tmp_path).load("key")[0]["price"].tolist() == [1.5, 2.5]
+
+    CacheSnapshot(tmp_path).write([("key", older, now + 1, now + 61)])
+    assert CacheSnapshot(tmp_path).load("key")[0]["price"].tolist() == [0.0, 0.0]
+    assert len(list(tmp_path.glob("*.arrow"))) == 1
+
+
+def test_frames_without_an_arrow_type_stay_memory_only(tmp_path):
+    now = time.time()
+    mixed = pd.DataFrame({"note": [1, "a"]})
+
+    assert CacheSnapshot(tmp_path).write([("key", mixed, now, now + 60)]) == 0
+    assert CacheSnapshot(tmp_path).load("key") is None
@@ -0,0 +1,74 @@
+import threading
+import time
+
+import pandas as pd
+
+from epias_cache import ResponseCache
+from epias_metrics import CACHE_REQUESTS
+from epias_sqlite_cache import SqliteCache, decode_frame, encode_frame
+
+FRAME = pd.DataFrame({"gasDay": ["2024-01-01", "2024-01-02"], "price": [1.5, 2.5], "volume": [10, 20]})
+
+
+def test_processes_sharing_the_database_load_each_response_once(tmp_path):
+    first = ResponseCache(ttl_seconds=60, name="test-sqlite", shared=SqliteCache(tmp_path / "cache.db"))
+    second = ResponseCache(ttl_seconds=60, name="test-sqlite", shared=SqliteCache(tmp_path / "cache.db"))
+    calls = []
+    first.get_or_load("key", lambda: calls.append(1) or FRAME)
+    frame = second.get_or_load("key", lambda: calls.append(2) or FRAME)
+
+    assert calls == [1]
+    pd.testing.assert_frame_equal(frame, FRAME)
+    assert CACHE_REQUESTS.value(cache="test-sqlite", result="shared") == 1
+
+
+def test_expired_rows_answer_only_within_the_staleness_budget(tmp_path):
+    cache = SqliteCache(tmp_path / "cache.db", retention_seconds=3600)
+    now = time.time()
+    cache.put("expired", FRAME, now - 120, now - 60)
+
+    assert cache.get("expired") is None
+    assert cache.get("expired", max_stale_seconds=30) is None
+    frame, stored_at, expires_at = cache.get("expired", max_stale_seconds=90)
+    pd.testing.assert_frame_equal(frame, FRAME)
+    assert (stored_at, expires_at) == (now - 120, now - 60)
+
+
+def test_rows_past_the_retention_are_pruned_on_write(tmp_path):
+    cache = SqliteCache(tmp_path / "cache.db", retention_seconds=30)
+    now = time.time()
+    cache.put("old", FRAME, now - 120, now - 60)
+    cache.put("new", FRAME, now, now + 60)
+
+    assert cache.get("old", max_stale_seconds=3600) is None
+    assert cache.get("new") is not None
+
+
+def test_payloads_round_trip_and_unencodable_frames_are_skipped(tmp_path):
+    pd.testing.assert_frame_equal(decode_frame(encode_frame(FRAME)), FRAME)
+    cache = SqliteCache(tmp_path / "cache.db")
+    now = time.time()
+
+    assert cache.put("mixed", pd.DataFrame({"note": [1, "a"]}), now, now + 60) is False
+    assert cache.get("mixed") is None
+
+
+def test_each_thread_uses_its_own_connection(tmp_path):
+    cache = SqliteCache(tmp_path / "cache.db")
+    now = time.time()
+    errors = []
+
+    def write(index: int) -> None:
+        try:
+            assert cache.put(f"key-{index}", FRAME, now, now + 60)
+        except AssertionError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(index,)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == []
+    assert all(cache.get(f"key-{index}") is not None for index in range(8))
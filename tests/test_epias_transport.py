@@ -0,0 +1,49 @@
+import gzip
+import json
+from datetime import date
+
+import pytest
+
+from epias_cache import response_cache
+from epias_client import EpiasClientError, EpiasConfig, fetch_sgp_daily_reference_price, fetch_tgt_token
+from epias_transport import PLACEHOLDER_TICKET, RecordingTransport, ReplayTransport, TransportResponse, set_transport
+
+LIVE_TICKET = "TGT-live-1234-secret"
+CAS_URL = "http://epias.test/cas/v1/tickets"
+DAY = date(2024, 1, 1)
+
+
+class FakeEpias:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def post(self, url, headers, timeout, json_body=None, form=None) -> TransportResponse:
+        self.calls += 1
+        if form is not None:
+            return TransportResponse(status_code=201, content=LIVE_TICKET.encode())
+        items = [{"gasDay": "2024-01-01T00:00:00+03:00", "price": 1000.0}]
+        return TransportResponse(status_code=200, content=json.dumps({"items": items}).encode())
+
+
+def test_recorded_session_replays_without_the_live_ticket(tmp_path):
+    config = EpiasConfig(base_url="http://epias.test", tgt="tgt")
+    set_transport(RecordingTransport(FakeEpias(), cassette_dir=tmp_path))
+    recorded_ticket = fetch_tgt_token("user", "secret-password", cas_url=CAS_URL)
+    recorded = fetch_sgp_daily_reference_price(config, DAY, DAY)
+
+    cassette = b"".join(gzip.open(path).read() for path in tmp_path.glob("*.jsonl.gz")).decode()
+    assert recorded_ticket == LIVE_TICKET
+    assert LIVE_TICKET not in cassette and "secret-password" not in cassette
+
+    response_cache.clear()
+    set_transport(ReplayTransport(cassette_dir=tmp_path))
+    assert fetch_tgt_token("user", "another-password", cas_url=CAS_URL) == PLACEHOLDER_TICKET
+    replayed = fetch_sgp_daily_reference_price(config, DAY, DAY)
+    assert replayed.equals(recorded)
+
+
+def test_replay_raises_for_unrecorded_requests(tmp_path):
+    set_transport(ReplayTransport(cassette_dir=tmp_path))
+
+    with pytest.raises(EpiasClientError, match="No recorded response"):
+        fetch_sgp_daily_reference_price(EpiasConfig(base_url="http://epias.test", tgt="tgt"), DAY, DAY)
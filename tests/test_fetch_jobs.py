@@ -0,0 +1,100 @@
+import threading
+import time
+from dataclasses import replace
+
+from epias_cache import CREDENTIAL_SCOPE, SHARED_SCOPE
+from epias_client import EpiasConfig, request_scope
+from fetch_jobs import JOB_DONE, JOB_RETENTION_SECONDS, JobRunner
+
+
+def blocking_chunks(release: threading.Event, count: int = 2):
+    return [lambda: release.wait(5) for _ in range(count)]
+
+
+def test_cancel_detaches_until_the_last_watcher_leaves():
+    runner = JobRunner(max_workers=2)
+    release = threading.Event()
+    job = runner.submit("key", "job", blocking_chunks(release), combine=list, watcher="a:panel")
+    shared = runner.submit("key", "job", blocking_chunks(release), combine=list, watcher="b:panel")
+
+    assert shared is job
+    assert runner.detach("key", "a:panel") is False
+    assert not job.cancelled
+    assert runner.detach("key", "b:panel") is True
+    assert job.cancelled
+    release.set()
+
+
+def test_a_detached_session_does_not_stop_the_others():
+    runner = JobRunner(max_workers=2)
+    release = threading.Event()
+    done = threading.Event()
+    job = runner.submit("key", "job", blocking_chunks(release), combine=lambda results: done.set(), watcher="a")
+    runner.submit("key", "job", blocking_chunks(release), watcher="b")
+    runner.detach("key", "a")
+    release.set()
+
+    assert done.wait(5)
+    assert job.status == JOB_DONE
+
+
+def test_a_cancelled_job_is_replaced_on_the_next_submit():
+    runner = JobRunner(max_workers=1)
+    release = threading.Event()
+    first = runner.submit("key", "job", blocking_chunks(release), watcher="a")
+    runner.detach("key", "a")
+    second = runner.submit("key", "job", blocking_chunks(release), watcher="a")
+    release.set()
+
+    assert second is not first
+    assert first.cancelled and not second.cancelled
+
+
+def finished_job(runner: JobRunner, *watchers: str):
+    release = threading.Event()
+    for watcher in watchers:
+        job = runner.submit("key", "job", [lambda: release.wait(5) and "rows"], combine=list, watcher=watcher)
+    release.set()
+    deadline = time.monotonic() + 5
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.status == JOB_DONE
+    return job
+
+
+def test_the_runner_drops_a_finished_job_once_every_watcher_collected_it():
+    runner = JobRunner(max_workers=1)
+    job = finished_job(runner, "a", "b")
+
+    assert runner.collect("key", "a") is job
+    assert runner.get("key") is job
+    assert runner.collect("key", "b") is job
+    assert runner.get("key") is None
+    assert job.result == ["rows"]
+
+
+def test_detaching_from_a_finished_job_counts_as_collecting_it():
+    runner = JobRunner(max_workers=1)
+    finished_job(runner, "a", "b")
+    runner.collect("key", "a")
+
+    assert runner.detach("key", "b") is False
+    assert runner.get("key") is None
+
+
+def test_uncollected_jobs_expire_on_read():
+    runner = JobRunner(max_workers=1)
+    job = finished_job(runner, "a")
+    job.finished_at = time.time() - JOB_RETENTION_SECONDS - 1
+
+    assert runner.get("key") is None
+    assert runner.jobs() == []
+
+
+def test_credential_scope_separates_users():
+    shared = [EpiasConfig(base_url="http://epias.test", tgt=tgt) for tgt in ("TGT-a", "TGT-b")]
+    private = [replace(config, cache_scope=CREDENTIAL_SCOPE) for config in shared]
+
+    assert request_scope(shared[0]) == request_scope(shared[1]) == SHARED_SCOPE
+    assert request_scope(private[0]) != request_scope(private[1])
+    assert request_scope(private[0]) == request_scope(replace(private[0], compact=True))
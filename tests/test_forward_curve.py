@@ -0,0 +1,66 @@
+from datetime import date
+
+import pandas as pd
+
+from forward_curve import build_forward_curve
+
+
+def test_each_delivery_month_comes_from_one_contract():
+    # Two codes for July: the later-traded one has no last price, the earlier one no quote fields.
+    summary = pd.DataFrame(
+        {
+            "transactionDate": ["2024-06-10T00:00:00+03:00", "2024-06-12T00:00:00+03:00"],
+            "contractCode": ["GGM-2024-07", "TR-JUL24"],
+            "lastPrice": [10.0, None],
+        }
+    )
+    curve = build_forward_curve(summary, pd.DataFrame())
+
+    assert len(curve) == 1
+    assert curve.loc[0, "contract"] == "TR-JUL24"
+    assert pd.isna(curve.loc[0, "lastPrice"])
+
+
+def test_curve_is_dated_by_the_latest_trade():
+    summary = pd.DataFrame(
+        {
+            "transactionDate": ["2024-06-10T00:00:00+03:00", "2024-06-14T00:00:00+03:00"],
+            "contractCode": ["GGM-2024-07", "GGM-2024-08"],
+            "lastPrice": [10.0, 11.0],
+        }
+    )
+    curve = build_forward_curve(summary, pd.DataFrame(), fallback_date=date(2024, 6, 30))
+
+    assert curve["curveDate"].tolist() == [pd.Timestamp("2024-06-14")] * 2
+
+
+def test_fallback_date_applies_without_transaction_dates():
+    orders = pd.DataFrame({"contractName": ["GGM-2024-07"], "bestBid": [9.0], "bestOffer": [11.0]})
+    curve = build_forward_curve(pd.DataFrame(), orders, fallback_date=date(2024, 6, 30))
+
+    assert curve["curveDate"].tolist() == [pd.Timestamp("2024-06-30")]
+    assert curve["price"].tolist() == [10.0]
+
+
+def test_two_contracts_per_month_never_mix_fields():
+    summary = pd.DataFrame(
+        {
+            "transactionDate": ["2024-06-14T00:00:00+03:00", "2024-06-10T00:00:00+03:00"],
+            "contractCode": ["GGM-2024-07", "TR-JUL24"],
+            "lastPrice": [10.0, 20.0],
+        }
+    )
+    orders = pd.DataFrame(
+        {
+            "transactionDate": ["2024-06-10T00:00:00+03:00", "2024-06-14T00:00:00+03:00"],
+            "contractName": ["GGM-2024-07", "TR-JUL24"],
+            "bestBid": [9.0, 19.0],
+            "bestOffer": [11.0, 21.0],
+        }
+    )
+    curve = build_forward_curve(summary, orders)
+
+    assert len(curve) == 1
+    row = curve.iloc[0]
+    assert (row["contract"], row["lastPrice"], row["bestBid"], row["bestOffer"]) == ("GGM-2024-07", 10.0, 9.0, 11.0)
+    assert row["mid"] == 10.0
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from participants import ParticipantDirectory
+
+PARTICIPANTS = pd.DataFrame(
+    {
+        "organizationName": ["ŞIRKET ENERJİ A.Ş.", "Doğal  Gaz Ltd", "Ege Gaz", "Marmara Enerji"],
+        "sgmParticipation": ["true", "false", "true", "false"],
+    }
+)
+
+
+def directory() -> ParticipantDirectory:
+    participants = ParticipantDirectory()
+    participants.sync(PARTICIPANTS)
+    return participants
+
+
+def test_search_ignores_case_accents_dotless_i_and_spacing():
+    participants = directory()
+
+    assert participants.search("sirket enerji")["organizationName"].tolist() == ["ŞIRKET ENERJİ A.Ş."]
+    assert participants.search("dogal gaz")["organizationName"].tolist() == ["Doğal  Gaz Ltd"]
+    assert participants.search("ENERJI")["organizationName"].tolist() == ["ŞIRKET ENERJİ A.Ş.", "Marmara Enerji"]
+
+
+def test_search_combines_query_and_flags():
+    participants = directory()
+
+    assert participants.search("gaz", sgmParticipation=True)["organizationName"].tolist() == ["Ege Gaz"]
+    assert participants.search("nothing").empty
+    assert len(participants.search()) == len(PARTICIPANTS)
+
+
+def test_frame_is_a_copy():
+    participants = directory()
+    frame = participants.frame
+    frame.loc[0, "organizationName"] = "changed"
+
+    assert participants.frame.loc[0, "organizationName"] == "ŞIRKET ENERJİ A.Ş."
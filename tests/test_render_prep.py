@@ -0,0 +1,19 @@
+import pandas as pd
+
+from render_prep import detect_axes, render_prep
+
+
+def test_axes_skip_boolean_columns():
+    frame = pd.DataFrame({"gasDay": ["2024-01-01"], "active": [True], "price": [1.0]})
+
+    assert detect_axes(frame) == ("gasDay", "price", "price")
+
+
+def test_render_prep_builds_chart_display_and_csv_without_touching_the_frame():
+    frame = pd.DataFrame({"gasDay": ["2024-01-01", "2024-01-02"], "price": [1234.5, 2.0]})
+    chart, display, csv = render_prep(frame)
+
+    assert list(chart.columns) == ["Date", "price"]
+    assert display["price"].tolist() == ["1,234.50", "2.00"]
+    assert csv.decode().splitlines() == ["gasDay,price", "2024-01-01,1234.5", "2024-01-02,2.0"]
+    assert frame["price"].tolist() == [1234.5, 2.0]
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from rolling_analytics import RollingAnalyticsCache, price_spread, rolling_volatility, rolling_zscore
+
+WINDOW = 5
+DAYS = pd.date_range("2024-01-01", periods=40, freq="D")
+
+
+def _frame(values: np.ndarray, days: pd.DatetimeIndex = DAYS) -> pd.DataFrame:
+    return pd.DataFrame({"gasDay": days.strftime("%Y-%m-%dT00:00:00+03:00"), "price": values})
+
+
+def _prices(seed: int = 0, size: int = len(DAYS)) -> np.ndarray:
+    return 100 + np.random.default_rng(seed).normal(size=size).cumsum()
+
+
+def _expected_zscore(values: np.ndarray) -> pd.Series:
+    series = pd.Series(values)
+    rolling = series.rolling(WINDOW)
+    return (series - rolling.mean()) / rolling.std()
+
+
+def _expected_volatility(values: np.ndarray) -> pd.Series:
+    series = pd.Series(values)
+    return np.log(series / series.shift(1)).rolling(WINDOW).std() * np.sqrt(365)
+
+
+def test_library_functions_match_series_rolling():
+    prices = _prices()
+    prices[12] = np.nan
+    other = _prices(1)
+
+    volatility = rolling_volatility(_frame(prices), "price", window=WINDOW)
+    zscore = rolling_zscore(_frame(prices), "price", window=WINDOW)
+    spread = price_spread(_frame(prices), _frame(other), "price", "price", window=WINDOW)
+
+    assert volatility["gasDay"].tolist() == list(DAYS)
+    np.testing.assert_allclose(volatility["volatility"], _expected_volatility(prices), equal_nan=True)
+    np.testing.assert_allclose(zscore["zscore"], _expected_zscore(prices), equal_nan=True)
+    np.testing.assert_allclose(spread["zscore"], _expected_zscore(prices - other), equal_nan=True)
+
+
+@pytest.mark.parametrize("revised", [None, -1, 3, 20], ids=["append", "last-day", "first-days", "mid-history"])
+def test_cache_matches_series_rolling_after_appends_and_revisions(revised):
+    cache = RollingAnalyticsCache()
+    prices = _prices()
+    cache.zscore(_frame(prices[:30], DAYS[:30]), source="SGP", value_column="price", window=WINDOW)
+    cache.volatility(_frame(prices[:30], DAYS[:30]), source="SGP", value_column="price", window=WINDOW)
+
+    if revised is not None:
+        # The provider republishes an already tracked day of the first thirty.
+        prices[revised % 30] += 7.5
+    zscore = cache.zscore(_frame(prices), source="SGP", value_column="price", window=WINDOW)
+    volatility = cache.volatility(_frame(prices), source="SGP", value_column="price", window=WINDOW)
+
+    assert zscore["gasDay"].tolist() == list(DAYS)
+    np.testing.assert_allclose(zscore["zscore"], _expected_zscore(prices), equal_nan=True)
+    np.testing.assert_allclose(volatility["volatility"], _expected_volatility(prices), equal_nan=True)
+
+
+def test_cache_restarts_when_history_is_shorter_or_starts_elsewhere():
+    cache = RollingAnalyticsCache()
+    prices = _prices()
+    cache.zscore(_frame(prices), source="SGP", value_column="price", window=WINDOW)
+
+    shorter = cache.zscore(_frame(prices[:25], DAYS[:25]), source="SGP", value_column="price", window=WINDOW)
+    later = cache.zscore(_frame(prices[10:], DAYS[10:]), source="SGP", value_column="price", window=WINDOW)
+
+    np.testing.assert_allclose(shorter["zscore"], _expected_zscore(prices[:25]), equal_nan=True)
+    np.testing.assert_allclose(later["zscore"], _expected_zscore(prices[10:]), equal_nan=True)
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from local_store import LocalStore
+from rollups import RollupStore, aggregate_partials, daily_partials
+
+
+def prices(days: pd.DatetimeIndex, offset: float = 0.0) -> pd.DataFrame:
+    # Two rows per gas day, like hourly or per-contract listings.
+    values = np.arange(len(days), dtype=float) + offset
+    return pd.DataFrame(
+        {
+            "gasDay": np.repeat(days.strftime("%Y-%m-%dT00:00:00+03:00"), 2),
+            "price": np.repeat(values, 2) + np.tile([0.0, 1.0], len(days)),
+            "volume": 10,
+        }
+    )
+
+
+def test_incremental_updates_match_a_full_aggregation():
+    rollups = RollupStore()
+    first = prices(pd.date_range("2024-01-01", "2024-01-20"))
+    second = prices(pd.date_range("2024-01-15", "2024-02-10"), offset=100.0)
+    rollups.update("SGP Price", first)
+    rollups.update("SGP Price", second)
+
+    # The second fetch overrides the overlapping days.
+    merged = pd.concat([first[first["gasDay"] < "2024-01-15"], second], ignore_index=True)
+    for frequency in ("week", "month"):
+        expected = aggregate_partials(daily_partials(merged), frequency)
+        pd.testing.assert_frame_equal(rollups.rollup("SGP Price", frequency), expected)
+    month = rollups.rollup("SGP Price", "month").set_index(["period", "column"])
+    assert month.loc[(pd.Timestamp("2024-01-01"), "price"), "days"] == 31
+    assert month.loc[(pd.Timestamp("2024-01-01"), "volume"), "count"] == 62
+
+
+def test_only_changed_days_count_as_updates():
+    rollups = RollupStore()
+    frame = prices(pd.date_range("2024-01-01", "2024-01-10"))
+
+    assert rollups.update("SGP Price", frame) == 10
+    assert rollups.update("SGP Price", frame) == 0
+    revised = frame.copy()
+    revised.loc[revised["gasDay"].str.startswith("2024-01-03"), "price"] += 5
+    assert rollups.update("SGP Price", revised) == 1
+    assert rollups.update("SGP Price", pd.DataFrame({"name": ["no day column"]})) == 0
+
+
+def test_partials_persist_and_reload_from_the_local_store(tmp_path):
+    frame = prices(pd.date_range("2024-01-25", "2024-02-05"))
+    RollupStore(LocalStore(tmp_path)).update("SGP Price", frame)
+    reloaded = RollupStore(LocalStore(tmp_path))
+
+    assert reloaded.has("SGP Price") and not reloaded.has("GRP Price")
+    pd.testing.assert_frame_equal(
+        reloaded.rollup("SGP Price", "week"), aggregate_partials(daily_partials(frame), "week"), check_dtype=False
+    )
+    with pytest.raises(ValueError):
+        reloaded.rollup("SGP Price", "year")
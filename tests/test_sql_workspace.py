@@ -0,0 +1,60 @@
+import pandas as pd
+import pyarrow as pa
+
+from sql_workspace import SqlWorkspace
+
+
+def prices(days: range, price: float) -> pd.DataFrame:
+    return pd.DataFrame({"gasDay": [f"2024-01-{value:02d}T00:00:00+03:00" for value in days], "price": price})
+
+
+def held(workspace: SqlWorkspace, name: str) -> pd.DataFrame:
+    data = workspace._tables[name][1]
+    return data.to_pandas() if isinstance(data, pa.Table) else data
+
+
+def test_fetches_of_other_ranges_are_upserted_by_gas_day():
+    workspace = SqlWorkspace()
+    workspace.register("SGP Daily Reference Price", prices(range(1, 11), 1.0))
+    table = workspace.register("SGP Daily Reference Price", prices(range(8, 16), 2.0))
+
+    frame = held(workspace, "sgp_daily_reference_price")
+    assert table.rows == 15
+    assert frame["gasDay"].str[8:10].astype(int).tolist() == list(range(1, 16))
+    assert frame["price"].tolist() == [1.0] * 7 + [2.0] * 8
+
+
+def test_frames_without_a_day_column_are_replaced():
+    workspace = SqlWorkspace()
+    workspace.register("Natural Gas Market Participants", pd.DataFrame({"name": ["a", "b"]}))
+    workspace.register("Natural Gas Market Participants", pd.DataFrame({"name": ["c"]}))
+
+    assert held(workspace, "natural_gas_market_participants")["name"].tolist() == ["c"]
+
+
+def test_upserts_stay_in_arrow_and_keep_gas_days_sorted():
+    workspace = SqlWorkspace()
+    workspace.register("SGP Price", prices(range(10, 16), 1.0))
+    workspace.register("SGP Price", prices(range(1, 4), 2.0))
+
+    data = workspace._tables["sgp_price"][1]
+    assert isinstance(data, pa.Table)
+    assert [int(day[8:10]) for day in data["gasDay"].to_pylist()] == [1, 2, 3, 10, 11, 12, 13, 14, 15]
+
+
+def test_a_column_that_changes_type_falls_back_to_a_pandas_upsert():
+    workspace = SqlWorkspace()
+    workspace.register("SGP Price", prices(range(1, 4), 1.0))
+    table = workspace.register("SGP Price", prices(range(3, 5), 2.0).astype({"price": "string"}))
+
+    assert table.rows == 4
+    assert held(workspace, "sgp_price")["price"].astype(float).tolist() == [1.0, 1.0, 2.0, 2.0]
+
+
+def test_tables_past_the_byte_cap_are_evicted_least_recently_registered_first():
+    one_table = pa.Table.from_pandas(prices(range(1, 11), 1.0), preserve_index=False).nbytes
+    workspace = SqlWorkspace(max_bytes=2 * one_table)
+    for dataset in ("SGP Price", "GRP Price", "SGP Price", "Imbalance"):
+        workspace.register(dataset, prices(range(1, 11), 1.0))
+
+    assert list(workspace._tables) == ["sgp_price", "imbalance"]
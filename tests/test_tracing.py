@@ -0,0 +1,64 @@
+import json
+import time
+
+import tracing
+from tracing import NOOP_SPAN, Tracer
+
+
+def traces(directory) -> list[dict]:
+    return [json.loads(path.read_text()) for path in sorted(directory.glob("*.json"))]
+
+
+def test_a_disabled_tracer_records_nothing(tmp_path):
+    tracer = Tracer(tmp_path, sample_rate=0, slow_seconds=0)
+    with tracer.span("rerun") as span:
+        span.set(rows=1)
+
+    assert span is NOOP_SPAN
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_a_sampled_trace_is_one_chrome_trace_file_with_nested_spans(tmp_path):
+    tracer = Tracer(tmp_path, sample_rate=1.0)
+    with tracer.span("Rerun SGP", dataset="SGP"):
+        with tracer.span("fetch") as fetch:
+            fetch.set(rows=10)
+        chart = tracer.begin("chart")
+        tracer.end(chart)
+
+    (document,) = traces(tmp_path)
+    spans = {event["name"]: event for event in document["traceEvents"] if event["ph"] == "X"}
+    assert set(spans) == {"Rerun SGP", "fetch", "chart"}
+    root_id = spans["Rerun SGP"]["args"]["span_id"]
+    assert spans["fetch"]["args"] == {"rows": 10, "span_id": spans["fetch"]["args"]["span_id"], "parent_id": root_id}
+    assert spans["chart"]["args"]["parent_id"] == root_id
+    assert any(event["ph"] == "M" and event["name"] == "thread_name" for event in document["traceEvents"])
+
+
+def test_tail_sampling_keeps_slow_traces_and_samples_the_rest(tmp_path, monkeypatch):
+    tracer = Tracer(tmp_path, sample_rate=0.5, slow_seconds=0.05)
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.9)
+    with tracer.span("fast"):
+        pass
+    with tracer.span("slow"):
+        time.sleep(0.06)
+    monkeypatch.setattr(tracing.random, "random", lambda: 0.1)
+    with tracer.span("lucky"):
+        pass
+
+    assert [document["traceEvents"][-1]["name"] for document in traces(tmp_path)] == ["slow", "lucky"]
+
+
+def test_errors_are_recorded_and_old_files_pruned(tmp_path):
+    tracer = Tracer(tmp_path, sample_rate=1.0, max_files=2)
+    for name in ("first", "second", "third"):
+        try:
+            with tracer.span(name):
+                raise KeyError(name)
+        except KeyError:
+            pass
+        time.sleep(0.01)
+
+    documents = traces(tmp_path)
+    assert [document["traceEvents"][-1]["name"] for document in documents] == ["second", "third"]
+    assert documents[-1]["traceEvents"][-1]["args"]["error"] == "KeyError"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+
+from epias_client import EpiasConfig, fetch_sgp_transaction_history
+from transaction_analytics import TransactionBarCache, aggregate_transaction_history
+
+CONFIG = EpiasConfig(base_url="http://epias.test", tgt="tgt")
+# Twenty trades between 08:00 and 12:00 on one gas day, sent newest first.
+TRADES = [
+    {
+        "date": f"2024-01-10T{8 + index // 5:02d}:{index % 5 * 10:02d}:00+03:00",
+        "transactionDate": f"2024-01-10T{8 + index // 5:02d}:{index % 5 * 10:02d}:00+03:00",
+        "gasDay": "2024-01-10T00:00:00+03:00",
+        "contractName": "GG20240110",
+        "price": 1000.0 + index,
+        "quantity": 10,
+    }
+    for index in reversed(range(20))
+]
+
+
+def test_hourly_bars_from_fetcher_output_follow_trade_time(fake_epias):
+    fake_epias(lambda body: TRADES)
+    frame = fetch_sgp_transaction_history(CONFIG, date(2024, 1, 10), date(2024, 1, 10))
+    bars = aggregate_transaction_history(frame, granularity="hour")
+
+    assert bars["hour"].tolist() == [8, 9, 10, 11]
+    assert bars["open"].tolist() == [1000.0, 1005.0, 1010.0, 1015.0]
+    assert bars["close"].tolist() == [1004.0, 1009.0, 1014.0, 1019.0]
+    assert bars["trades"].tolist() == [5, 5, 5, 5]
+
+
+def test_daily_bar_open_and_close_follow_trade_time_not_response_order(fake_epias):
+    fake_epias(lambda body: TRADES)
+    frame = fetch_sgp_transaction_history(CONFIG, date(2024, 1, 10), date(2024, 1, 10))
+    bars = aggregate_transaction_history(frame)
+
+    assert len(bars) == 1
+    assert (bars.loc[0, "open"], bars.loc[0, "close"]) == (1000.0, 1019.0)
+
+
+def test_bar_cache_accepts_raw_offset_timestamps():
+    cache = TransactionBarCache()
+    raw = pd.DataFrame(TRADES)
+    first = cache.aggregate(raw, source="SGP", granularity="hour", today=date(2024, 1, 11))
+    second = cache.aggregate(raw, source="SGP", granularity="hour", today=date(2024, 1, 11))
+
+    assert first["gasDay"].tolist() == [pd.Timestamp("2024-01-10")] * 4
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_day_ahead_trades_are_filed_under_their_gas_day():
+    # Trades on 2024-01-10 for delivery on the 11th belong to the 11th's bars.
+    ahead = pd.DataFrame([{**trade, "gasDay": "2024-01-11T00:00:00+03:00"} for trade in TRADES])
+    daily = aggregate_transaction_history(ahead)
+    hourly = TransactionBarCache().aggregate(ahead, source="SGP", granularity="hour", today=date(2024, 1, 12))
+
+    assert daily["gasDay"].tolist() == [pd.Timestamp("2024-01-11")]
+    assert (daily.loc[0, "open"], daily.loc[0, "close"]) == (1000.0, 1019.0)
+    assert hourly["gasDay"].tolist() == [pd.Timestamp("2024-01-11")] * 4
+    assert hourly["hour"].tolist() == [8, 9, 10, 11]
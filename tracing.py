@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+DEFAULT_TRACE_DIR = Path(os.getenv("EPIAS_TRACE_DIR", ".epias_traces"))
+DEFAULT_SAMPLE_RATE = float(os.getenv("EPIAS_TRACE_SAMPLE_RATE", "0"))
+DEFAULT_SLOW_SECONDS = float(os.getenv("EPIAS_TRACE_SLOW_MS", "0")) / 1000
+DEFAULT_MAX_FILES = int(os.getenv("EPIAS_TRACE_MAX_FILES", "200"))
+TRACE_CATEGORY = "epias"
+
+
+class _Trace:
+    def __init__(self, trace_id: str) -> None:
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self.lock = threading.Lock()
+
+
+class Span:
+    def __init__(self, name: str, trace: _Trace, span_id: int, parent: Span | None, attributes: dict[str, Any]):
+        self.name = name
+        self.trace = trace
+        self.span_id = span_id
+        self.parent = parent
+        self.attributes = attributes
+        self.thread_id = threading.get_native_id()
+        self.thread_name = threading.current_thread().name
+        self.start_us = time.time_ns() // 1000
+        self._started = time.perf_counter_ns()
+        self.duration_us: int | None = None
+
+    def set(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def finish(self) -> None:
+        if self.duration_us is None:
+            self.duration_us = (time.perf_counter_ns() - self._started) // 1000
+
+    def event(self) -> dict[str, Any]:
+        args = {
+            key: value if isinstance(value, (int, float, bool)) else str(value)
+            for key, value in self.attributes.items()
+        }
+        args["span_id"] = self.span_id
+        if self.parent is not None:
+            args["parent_id"] = self.parent.span_id
+        return {
+            "name": self.name,
+            "cat": TRACE_CATEGORY,
+            "ph": "X",
+            "ts": self.start_us,
+            "dur": self.duration_us or 0,
+            "pid": os.getpid(),
+            "tid": self.thread_id,
+            "args": args,
+        }
+
+
+class _NoopSpan:
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def finish(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+_current: contextvars.ContextVar[Span | None] = contextvars.ContextVar("epias_span", default=None)
+
+
+class Tracer:
+    # Spans are recorded for every trace while tracing is on; whether a trace is written is decided
+    # when its root span ends, so slow traces are kept even at a low sample rate. Each kept trace is
+    # one Chrome trace-event JSON file, which chrome://tracing, Perfetto and speedscope open.
+    def __init__(
+        self,
+        directory: Path | str = DEFAULT_TRACE_DIR,
+        sample_rate: float = DEFAULT_SAMPLE_RATE,
+        slow_seconds: float = DEFAULT_SLOW_SECONDS,
+        max_files: int = DEFAULT_MAX_FILES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.max_files = max_files
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.slow_seconds > 0
+
+    def begin(self, name: str, root: bool = False, **attributes: Any) -> Span | _NoopSpan:
+        # For spans that cannot wrap a block; end() restores the parent as the current span.
+        if not self.enabled:
+            return NOOP_SPAN
+        parent = None if root else _current.get()
+        if parent is not None and parent.trace.spans[0].duration_us is not None:
+            # The parent's trace was already written; start a new one.
+            parent = None
+        trace = parent.trace if parent is not None else _Trace(f"{os.getpid()}-{next(self._ids)}")
+        span = Span(name, trace, next(self._ids), parent, attributes)
+        with trace.lock:
+            trace.spans.append(span)
+        _current.set(span)
+        return span
+
+    def end(self, span: Span | _NoopSpan) -> None:
+        if not isinstance(span, Span) or span.duration_us is not None:
+            return
+        span.finish()
+        if _current.get() is span:
+            _current.set(span.parent)
+        if span.parent is None:
+            self._complete(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        span = self.begin(name, **attributes)
+        try:
+            yield span
+        except BaseException as exc:
+            span.set(error=type(exc).__name__)
+            raise
+        finally:
+            self.end(span)
+
+    def _complete(self, root: Span) -> None:
+        keep = random.random() < self.sample_rate or root.duration_us / 1e6 >= self.slow_seconds > 0
+        if not keep:
+            return
+        with root.trace.lock:
+            # Children still open belong to work that outlived the request; they are left out.
+            spans = [span for span in root.trace.spans if span.duration_us is not None]
+        threads = {span.thread_id: span.thread_name for span in spans}
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": name}}
+            for tid, name in threads.items()
+        ]
+        events.extend(span.event() for span in spans)
+        document = {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"trace_id": root.trace.trace_id}}
+        slug = "".join(ch if ch.isalnum() else "_" for ch in root.name.lower()).strip("_") or "trace"
+        path = self.directory / f"{root.start_us // 1000}-{slug}-{root.trace.trace_id}.json"
+        with self._write_lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(document))
+            files = sorted(self.directory.glob("*.json"), key=lambda item: item.stat().st_mtime)
+            for stale in files[: max(0, len(files) - self.max_files)]:
+                stale.unlink(missing_ok=True)
+
+
+tracer = Tracer()
@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from epias_client import EpiasClientError
+from epias_coverage import DAY_COLUMNS
+
+BAR_COLUMNS = [
+    "gasDay",
+    "hour",
+    "contract",
+    "open",
+    "high",
+    "low",
+    "close",
+    "vwap",
+    "volume",
+    "notional",
+    "trades",
+]
+GRANULARITIES = {"day", "hour"}
+OFFSET_SUFFIX = r"(?:[+-]\d{2}:\d{2}|Z)?"
+
+
+def _find_column(columns: Iterable[str], *candidates: str, contains: tuple[str, ...] = ()) -> str | None:
+    columns = list(columns)
+    for candidate in candidates:
+        if candidate in columns:
+            return candidate
+    for column in columns:
+        lowered = column.lower()
+        if contains and all(token in lowered for token in contains):
+            return column
+    return None
+
+
+def _local(timestamps: pd.Series) -> pd.Series:
+    # EPIAS timestamps carry +03:00; bars and the completed-day cutoff use Turkish wall-clock time.
+    if isinstance(timestamps.dtype, pd.DatetimeTZDtype):
+        return timestamps.dt.tz_localize(None)
+    return timestamps
+
+
+def _parse_unique_times(uniques: pd.Index) -> pd.Series:
+    if len(uniques) and pd.api.types.infer_dtype(uniques, skipna=False) == "string":
+        # Offset-aware parsing is several times slower than a fixed format, and _local keeps the
+        # wall-clock time anyway, so EPIAS's "2024-06-01T09:15:00+03:00" is read up to the seconds.
+        text = pd.Series(uniques, dtype=object)
+        if text.str.slice(19).drop_duplicates().str.fullmatch(OFFSET_SUFFIX).all():
+            try:
+                return pd.Series(pd.to_datetime(text.str.slice(0, 19), format="%Y-%m-%dT%H:%M:%S"))
+            except ValueError:
+                pass
+    return _local(pd.Series(pd.to_datetime(uniques, format="ISO8601", errors="coerce")))
+
+
+def _factorized_datetime(series: pd.Series) -> pd.Series:
+    # Trade timestamps repeat heavily, so convert the unique values only and broadcast back.
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return _local(series)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    converted = _parse_unique_times(uniques).to_numpy()
+    values = np.full(len(codes), np.datetime64("NaT"), dtype=converted.dtype if len(converted) else "datetime64[ns]")
+    valid = codes >= 0
+    values[valid] = converted[codes[valid]]
+    return pd.Series(values, index=series.index)
+
+
+def _hour_of(frame: pd.DataFrame, hour_column: str | None, timestamps: pd.Series) -> pd.Series:
+    if hour_column is None:
+        return timestamps.dt.hour
+    codes, uniques = pd.factorize(frame[hour_column], use_na_sentinel=True)
+    parsed = pd.to_numeric(pd.Series(uniques), errors="coerce")
+    if parsed.isna().any():
+        # Hours such as "09:00" or "09-10" keep their leading number.
+        parsed = pd.to_numeric(pd.Series(uniques).astype(str).str.extract(r"^(\d{1,2})")[0], errors="coerce")
+    values = np.full(len(codes), np.nan)
+    valid = codes >= 0
+    values[valid] = parsed.to_numpy(dtype=float)[codes[valid]]
+    return pd.Series(values, index=frame.index)
+
+
+@dataclass(frozen=True)
+class _BarColumns:
+    time: str
+    day: str | None
+    contract: str | None
+    price: str
+    quantity: str
+    hour: str | None
+
+
+def _bar_columns(
+    frame: pd.DataFrame,
+    granularity: str,
+    time_column: str | None = None,
+    contract_column: str | None = None,
+    price_column: str | None = None,
+    quantity_column: str | None = None,
+    hour_column: str | None = None,
+) -> _BarColumns:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {sorted(GRANULARITIES)}, got {granularity!r}")
+    columns = list(frame.columns)
+    # The trade timestamp comes first; the day columns are the fallback for frames without one.
+    time_column = time_column or _find_column(columns, "transactionDate", *DAY_COLUMNS, contains=("date",))
+    # Day-ahead trades deliver on a later gas day than they trade, so bars are filed by the gas day when known.
+    day_column = _find_column(columns, "gasDay", "day")
+    contract_column = contract_column or _find_column(
+        columns, "contractName", "contract", "contractCode", contains=("contract",)
+    )
+    price_column = price_column or _find_column(
+        columns, "price", "matchingPrice", "matchPrice", contains=("price",)
+    )
+    quantity_column = quantity_column or _find_column(
+        columns, "quantity", "matchingQuantity", "matchQuantity", contains=("quantity",)
+    )
+    if granularity == "hour":
+        hour_column = hour_column or _find_column(columns, "hour", contains=("hour",))
+    if not (time_column and price_column and quantity_column):
+        raise EpiasClientError(
+            "Transaction history does not include recognizable date, price and quantity fields."
+        )
+    return _BarColumns(time_column, day_column, contract_column, price_column, quantity_column, hour_column)
+
+
+def _parse_times(frame: pd.DataFrame, columns: _BarColumns) -> tuple[pd.Series, pd.Series]:
+    # Trade timestamps order the trades and give the hour; the gas day, when present, is the bucket.
+    timestamps = _factorized_datetime(frame[columns.time])
+    if columns.day is None or columns.day == columns.time:
+        return timestamps, timestamps.dt.normalize()
+    return timestamps, _factorized_datetime(frame[columns.day]).dt.normalize()
+
+
+def aggregate_transaction_history(
+    frame: pd.DataFrame,
+    granularity: str = "day",
+    time_column: str | None = None,
+    contract_column: str | None = None,
+    price_column: str | None = None,
+    quantity_column: str | None = None,
+    hour_column: str | None = None,
+) -> pd.DataFrame:
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of {sorted(GRANULARITIES)}, got {granularity!r}")
+    if frame.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    columns = _bar_columns(
+        frame, granularity, time_column, contract_column, price_column, quantity_column, hour_column
+    )
+    return _aggregate(frame, columns, granularity, *_parse_times(frame, columns))
+
+
+def _aggregate(
+    frame: pd.DataFrame,
+    columns: _BarColumns,
+    granularity: str,
+    timestamps: pd.Series,
+    days: pd.Series,
+) -> pd.DataFrame:
+    if frame.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+    work = pd.DataFrame(
+        {
+            "gasDay": days,
+            "contract": frame[columns.contract] if columns.contract else "ALL",
+            "price": pd.to_numeric(frame[columns.price], errors="coerce"),
+            "volume": pd.to_numeric(frame[columns.quantity], errors="coerce"),
+        },
+        index=frame.index,
+    )
+    keys = ["gasDay", "hour", "contract"] if granularity == "hour" else ["gasDay", "contract"]
+    if granularity == "hour":
+        work["hour"] = _hour_of(frame, columns.hour, timestamps)
+    work = work.dropna(subset=["gasDay", "price", "volume"])
+    if work.empty:
+        return pd.DataFrame(columns=BAR_COLUMNS)
+
+    # Open/close follow trade time when it is known and response order otherwise.
+    if (timestamps != timestamps.dt.normalize()).any():
+        work["_ts"] = timestamps
+        work = work.sort_values("_ts", kind="stable")
+    work["notional"] = work["price"] * work["volume"]
+
+    bars = work.groupby(keys, sort=True, observed=True).agg(
+        open=("price", "first"),
+        high=("price", "max"),
+        low=("price", "min"),
+        close=("price", "last"),
+        volume=("volume", "sum"),
+        notional=("notional", "sum"),
+        trades=("price", "size"),
+    )
+    bars["vwap"] = bars["notional"] / bars["volume"].where(bars["volume"] != 0)
+    bars = bars.reset_index()
+    if "hour" in bars.columns:
+        bars["hour"] = bars["hour"].astype("Int64")
+    else:
+        bars["hour"] = pd.NA
+    return bars[BAR_COLUMNS]
+
+
+class TransactionBarCache:
+    def __init__(self) -> None:
+        self._bars: dict[tuple[str, str, pd.Timestamp], pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def aggregate(
+        self,
+        frame: pd.DataFrame,
+        source: str,
+        granularity: str = "day",
+        today: date | None = None,
+        **columns: str | None,
+    ) -> pd.DataFrame:
+        if frame.empty:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        cutoff = pd.Timestamp(today or date.today())
+        resolved = _bar_columns(frame, granularity, **columns)
+        # Parsed once here and shared with the aggregation of the days not yet cached.
+        timestamps, days = _parse_times(frame, resolved)
+        with self._lock:
+            cached_days = [
+                day
+                for day in days.dropna().unique()
+                if day < cutoff and (source, granularity, day) in self._bars
+            ]
+            cached = [self._bars[(source, granularity, day)] for day in cached_days]
+
+        if cached_days:
+            pending = ~days.isin(cached_days)
+            fresh = _aggregate(frame[pending], resolved, granularity, timestamps[pending], days[pending])
+        else:
+            fresh = _aggregate(frame, resolved, granularity, timestamps, days)
+        with self._lock:
+            # Only completed gas days are final; the current day keeps trading.
+            for day, day_bars in fresh[fresh["gasDay"] < cutoff].groupby("gasDay", sort=False):
+                self._bars[(source, granularity, day)] = day_bars.reset_index(drop=True)
+
+        parts = [part for part in (*cached, fresh) if not part.empty]
+        if not parts:
+            return pd.DataFrame(columns=BAR_COLUMNS)
+        keys = ["gasDay", "hour", "contract"] if granularity == "hour" else ["gasDay", "contract"]
+        return pd.concat(parts, ignore_index=True).sort_values(keys, kind="stable").reset_index(drop=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bars.clear()